@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.core.signals import got_request_exception
+from django.db.backends.signals import connection_created
+
+
+class ProjectConfig(AppConfig):
+    name = "UA_13XX_bravo"
+
+    def ready(self):
+        from .metrics import install_query_metrics
+        from .tracing import install_query_tracing, record_request_exception
+
+        connection_created.connect(install_query_metrics, dispatch_uid="query_metrics")
+        connection_created.connect(install_query_tracing, dispatch_uid="query_tracing")
+        got_request_exception.connect(record_request_exception, dispatch_uid="request_exception_tracing")
@@ -2,6 +2,8 @@
 ASGI config for UA_13XX_bravo project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests are served by Django's ASGI handler (async views run natively)
+and WebSocket connections are routed through Channels.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -11,15 +13,16 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-from channels.routing import ProtocolTypeRouter, URLRouter
-from django.core.asgi import get_asgi_application
-import communications.routing
-from communications.middleware.jwt_auth import JWTAuthMiddleware
-
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "UA_13XX_bravo.settings")
 
+# Set up Django before importing anything that touches models
 django_asgi_app = get_asgi_application()
 
+# pylint: disable=wrong-import-position
+from channels.routing import ProtocolTypeRouter, URLRouter
+import communications.routing
+from communications.middleware.jwt_auth import JWTAuthMiddleware
+
 application = ProtocolTypeRouter(
     {
         "http": django_asgi_app,
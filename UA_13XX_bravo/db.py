@@ -0,0 +1,19 @@
+from django.db import connections
+
+
+def get_pool_stats() -> dict:
+    """
+    Return psycopg pool statistics for every pooled database alias.
+
+    Pools are per process, so the numbers describe the current worker only.
+
+    Returns:
+        dict: ``{alias: stats}`` with keys such as ``pool_size``,
+        ``pool_available``, ``requests_waiting`` and ``connections_num``.
+    """
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is not None:
+            stats[alias] = pool.get_stats()
+    return stats
@@ -0,0 +1,49 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_read_from_replica = ContextVar("read_from_replica", default=False)
+
+
+def set_replica_reads(enabled: bool) -> None:
+    """Route reads in the current context to a replica (True) or the primary."""
+    _read_from_replica.set(enabled)
+
+
+@contextmanager
+def replica_reads(enabled: bool = True):
+    """Temporarily route reads in the current context, e.g. in management commands."""
+    token = _read_from_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Send reads to a replica only when the current request opted in.
+
+    Replica reads are enabled per view by ``ReplicaRoutingMiddleware``; all
+    other reads and every write go to ``default``, and migrations run on the
+    primary only.
+    """
+
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and _read_from_replica.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,171 @@
+"""
+Bulk CSV/NDJSON exports of companies, projects, subscriptions and follows.
+
+Rows are read with Postgres ``COPY ... TO STDOUT`` for CSV, or from a
+server-side cursor (``.iterator()``) for NDJSON and when COPY is disabled,
+and are yielded in blocks of roughly ``EXPORT_BLOCK_BYTES``, so memory use
+does not depend on the size of the table.
+
+Incremental exports use a watermark column (``updated_at``, or
+``created_at`` for the append-only follows): an export covers
+``since < watermark <= until`` and returns ``until``, which is the
+``since`` of the next run. ``until`` lags the clock by
+``EXPORT_SETTLE_SECONDS`` so rows of transactions still in flight are not
+skipped. Deleted rows are not reported.
+"""
+import csv
+import io
+from datetime import timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.db.models import CharField, DateTimeField, F, Func
+from django.utils import timezone
+
+from .fastjson import dumps
+
+EXPORT_BLOCK_BYTES = 1 << 16
+FORMATS = ("csv", "ndjson")
+
+
+class IsoTimestamp(Func):
+    """A timestamp as ISO 8601 text, like ``datetime.isoformat()``, computed by Postgres."""
+    template = "to_json(%(expressions)s) #>> '{}'"
+    output_field = CharField()
+
+
+class ExportDataset:
+    def __init__(self, model, columns, watermark):
+        self.model_label = model
+        self.columns = columns
+        self.watermark = watermark
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def queryset(self, since=None, until=None):
+        """Rows in the watermark window, as ``values_list`` in ``columns`` order."""
+        queryset = self.model._default_manager.order_by()
+        if since is not None:
+            queryset = queryset.filter(**{f"{self.watermark}__gt": since})
+        if until is not None:
+            queryset = queryset.filter(**{f"{self.watermark}__lte": until})
+
+        # Let Postgres format timestamps, so COPY and cursor output agree
+        timestamps = {name: IsoTimestamp(F(name[1:])) for name in self.selected() if name.startswith("_")}
+        return queryset.annotate(**timestamps).values_list(*self.selected())
+
+    def selected(self):
+        """Names of the selected values, in ``columns`` order."""
+        return [
+            f"_{column}" if isinstance(self.model._meta.get_field(column), DateTimeField) else column
+            for column in self.columns
+        ]
+
+
+DATASETS = {
+    "companies": ExportDataset(
+        "companies.CompanyProfile",
+        [
+            "id", "company_name", "type", "industry", "description", "website", "startup_logo",
+            "required_funding", "company_size", "phone_number", "created_at", "updated_at",
+        ],
+        watermark="updated_at",
+    ),
+    "projects": ExportDataset(
+        "projects.Project",
+        [
+            "id", "company_id", "name", "status", "information", "required_funding", "raised_amount",
+            "funded_percent", "subscriber_count", "allocated_share", "created_at", "updated_at",
+        ],
+        watermark="updated_at",
+    ),
+    "subscriptions": ExportDataset(
+        "investments.Subscription",
+        ["id", "creator_id", "project_id", "investment_share", "created_at", "updated_at"],
+        watermark="updated_at",
+    ),
+    "follows": ExportDataset(
+        "companies.CompanyFollowers",
+        ["id", "investor_id", "startup_id", "created_at"],
+        watermark="created_at",
+    ),
+}
+
+
+def export_until():
+    return timezone.now() - timedelta(seconds=settings.EXPORT_SETTLE_SECONDS)
+
+
+def _text(value):
+    return str(value) if isinstance(value, Decimal) else value
+
+
+def _csv_line(values):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue().encode()
+
+
+def iter_copy_csv(queryset, dataset):
+    """CSV through ``COPY (query) TO STDOUT``, header included."""
+    connection = connections[queryset.db]
+    sql, params = queryset.query.get_compiler(connection=connection).as_sql()
+    # The ORM selects model columns before annotations; restore the column order
+    selected = ", ".join(connection.ops.quote_name(name) for name in dataset.selected())
+    statement = f"COPY (SELECT {selected} FROM ({sql}) AS export) TO STDOUT WITH (FORMAT csv)"
+    yield _csv_line(dataset.columns)
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(statement, params) as copy:
+            block = bytearray()
+            for data in copy:
+                block += data
+                if len(block) >= EXPORT_BLOCK_BYTES:
+                    yield bytes(block)
+                    block.clear()
+            if block:
+                yield bytes(block)
+
+
+def iter_cursor(queryset, columns, file_format, chunk_size):
+    """CSV or NDJSON from a server-side cursor, one block per ``chunk_size`` rows."""
+    rows = queryset.iterator(chunk_size=chunk_size)
+    if file_format == "csv":
+        yield _csv_line(columns)
+    while chunk := list(islice(rows, chunk_size)):
+        if file_format == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(chunk)
+            yield buffer.getvalue().encode()
+        else:
+            yield b"".join(
+                dumps(dict(zip(columns, map(_text, row)))) + b"\n" for row in chunk
+            )
+
+
+def export(name, file_format, since=None, until=None, use_copy=True, chunk_size=5000):
+    """
+    Export one dataset.
+
+    Returns:
+        tuple: ``(blocks, until)``, an iterator of bytes and the watermark
+        to pass as ``since`` next time.
+
+    Raises:
+        KeyError: Unknown dataset.
+        ValueError: Unknown format.
+    """
+    dataset = DATASETS[name]
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown export format {file_format!r}, expected one of: {', '.join(FORMATS)}.")
+    until = until or export_until()
+    queryset = dataset.queryset(since, until)
+    queryset = queryset.using(queryset.db)
+
+    if file_format == "csv" and use_copy and connections[queryset.db].vendor == "postgresql":
+        return iter_copy_csv(queryset, dataset), until
+    return iter_cursor(queryset, dataset.columns, file_format, chunk_size), until
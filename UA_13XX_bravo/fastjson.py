@@ -0,0 +1,81 @@
+"""
+JSON encoding with orjson when it is installed, stdlib ``json`` otherwise.
+
+``dumps``/``loads`` produce the same documents as DRF's JSONRenderer:
+datetimes, dates and times are passed through to DRF's encoder so their
+format does not change (ISO 8601, ``Z`` for UTC), Decimal becomes a number,
+UUID a string. FastJSONRenderer and FastJSONParser are
+drop-in replacements for DRF's JSON renderer and parser and are enabled in
+``REST_FRAMEWORK``; the websocket consumers use the same codec.
+"""
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to stdlib json
+    orjson = None
+
+_encoder = encoders.JSONEncoder()
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj) -> bytes:
+    """Compact UTF-8 JSON."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_encoder.default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; let the stdlib have a go
+            pass
+    return json.dumps(obj, cls=encoders.JSONEncoder, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def dumps_text(obj) -> str:
+    return dumps(obj).decode()
+
+
+def loads(data):
+    """Parse ``str`` or ``bytes``; raises json.JSONDecodeError on bad input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer on top of ``dumps``.
+
+    Indented output (``Accept: application/json; indent=4``, the browsable
+    API) and the non-default ``UNICODE_JSON``/``COMPACT_JSON`` settings keep
+    using DRF's implementation.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as DRF, so the output stays a strict JavaScript subset
+        return dumps(data).replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
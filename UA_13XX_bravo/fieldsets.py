@@ -0,0 +1,193 @@
+"""
+Sparse fieldsets (``?fields=a,b``) and lean list serialization.
+
+List endpoints that opt in with SparseFieldsetMixin read only the
+requested columns with ``.values()`` and turn the rows into dicts through
+a LeanSerializer: a precompiled list of column readers that produces the
+same output as the ModelSerializer for those fields, without building
+DRF field objects per row. Detail endpoints honour ``?fields=`` too, by
+restricting the queryset with ``.only()`` and dropping serializer fields.
+"""
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601
+from rest_framework import fields as drf_fields
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+FIELDS_PARAM = "fields"
+
+_datetime_field = drf_fields.DateTimeField()
+
+
+def as_string(value):
+    return None if value is None else str(value)
+
+
+def as_decimal(value):
+    """Same representation as DRF's DecimalField for values already at the column's scale."""
+    return None if value is None else f"{value:f}"
+
+
+def as_datetime(value):
+    """Same representation as DRF's DateTimeField (ISO 8601, ``Z`` for UTC)."""
+    return None if value is None else _datetime_field.to_representation(value)
+
+
+def _prepare_datetime():
+    # Resolve the current timezone once per response instead of once per value
+    if api_settings.DATETIME_FORMAT != ISO_8601 or not settings.USE_TZ:
+        return as_datetime
+    current = timezone.get_current_timezone()
+
+    def convert(value):
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            return _datetime_field.to_representation(value)
+        text = value.astimezone(current).isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+    return convert
+
+
+as_datetime.prepare = _prepare_datetime
+
+
+class LeanField:
+    """
+    One output key built from one or more ``.values()`` columns.
+
+    Args:
+        sources: Column lookups passed to ``.values()``; defaults to the
+            output name.
+        convert: Called with the column values, in ``sources`` order.
+            Defaults to returning the single value unchanged. A converter
+            with a ``prepare`` attribute is replaced by ``prepare()`` once
+            per ``serialize`` call.
+        model_fields: Concrete fields to load for detail requests via
+            ``.only()``; defaults to the first part of each source.
+    """
+
+    def __init__(self, *sources, convert=None, model_fields=None):
+        self.sources = sources
+        self.convert = convert
+        self.model_fields = model_fields
+
+    def bind(self, name):
+        if not self.sources:
+            self.sources = (name,)
+        if self.model_fields is None:
+            self.model_fields = tuple(source.split("__")[0] for source in self.sources)
+        return self
+
+
+class LeanSerializerMeta(type):
+    def __new__(mcs, name, bases, attrs):
+        declared = {}
+        for base in reversed(bases):
+            declared.update(getattr(base, "declared_fields", {}))
+        declared.update(
+            (key, value.bind(key)) for key, value in list(attrs.items()) if isinstance(value, LeanField)
+        )
+        attrs["declared_fields"] = declared
+        return super().__new__(mcs, name, bases, attrs)
+
+
+class LeanSerializer(metaclass=LeanSerializerMeta):
+    """
+    Serialize ``.values()`` rows for read-only list responses.
+
+    Subclasses declare LeanField attributes in output order. Instances are
+    cheap; ``serialize`` does one dict build per row.
+    """
+
+    def __init__(self, fields=None):
+        names = fields or list(self.declared_fields)
+        self.fields = {name: self.declared_fields[name] for name in names}
+        self.columns = list(dict.fromkeys(source for field in self.fields.values() for source in field.sources))
+
+    def serialize(self, rows):
+        return list(self.iter_serialize(rows))
+
+    def iter_serialize(self, rows):
+        """Lazily serialize ``rows``, e.g. straight from ``.iterator()``."""
+        readers = [
+            (name, field.sources, getattr(field.convert, "prepare", lambda: field.convert)())
+            for name, field in self.fields.items()
+        ]
+        for row in rows:
+            item = {}
+            for name, sources, convert in readers:
+                if convert is None:
+                    item[name] = row[sources[0]]
+                else:
+                    item[name] = convert(*[row[source] for source in sources])
+            yield item
+
+    def model_fields(self):
+        return [name for field in self.fields.values() for name in field.model_fields]
+
+
+def parse_fields(request, allowed):
+    """
+    Read ``?fields=`` as an ordered list, or None when absent.
+
+    Raises:
+        ValidationError: When a requested field is not in ``allowed``.
+    """
+    raw = request.query_params.get(FIELDS_PARAM) if request is not None else None
+    if not raw:
+        return None
+    requested = list(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise ValidationError(
+            {FIELDS_PARAM: f"Unknown field(s): {', '.join(unknown)}. Choose from: {', '.join(allowed)}."}
+        )
+    return requested
+
+
+class SparseFieldsetMixin:
+    """
+    Viewset mixin: lean ``list`` and ``?fields=`` support for lists and details.
+
+    Set ``lean_serializer_class`` to a LeanSerializer whose fields mirror the
+    regular serializer's output.
+    """
+    lean_serializer_class = None
+
+    def get_requested_fields(self):
+        if not hasattr(self, "_requested_fields"):
+            self._requested_fields = parse_fields(
+                self.request, list(self.lean_serializer_class.declared_fields)
+            )
+        return self._requested_fields
+
+    def list(self, request, *args, **kwargs):
+        lean = self.lean_serializer_class(self.get_requested_fields())
+        queryset = self.filter_queryset(self.get_queryset()).values(*lean.columns)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(lean.serialize(page))
+        return Response(lean.serialize(queryset))
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        requested = self.get_requested_fields() if self.action == "retrieve" else None
+        if requested:
+            lean = self.lean_serializer_class(requested)
+            # Related objects that are still needed load lazily; it is one row
+            queryset = queryset.select_related(None).only("pk", *lean.model_fields())
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = self.get_requested_fields() if self.action == "retrieve" else None
+        if requested:
+            for name in list(serializer.fields):
+                if name not in requested:
+                    serializer.fields.pop(name)
+        return serializer
@@ -0,0 +1,224 @@
+"""
+Shared plumbing for the bulk import commands, endpoints and functions.
+
+``read_rows`` streams dicts from CSV or NDJSON files, BulkImportCommand
+feeds them to an import function in batches and reports per-row errors,
+BulkImportSerializer/``import_response`` do the same for batch endpoints,
+and ``copy_insert`` writes validated rows with Postgres ``COPY FROM``.
+``existing_values`` and ``reserve_ids`` keep the per-batch lookups to one
+query each; ``parallel_map`` spreads batches over worker processes.
+"""
+import csv
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connections, router
+from django.utils.module_loading import import_string
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+from .fastjson import loads
+from .tracing import inject, run_in_trace
+
+
+def read_rows(path):
+    """Yield rows of a .csv (header line required) or .ndjson/.jsonl file as dicts."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    elif path.suffix.lower() in (".ndjson", ".jsonl"):
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+    else:
+        raise CommandError("Unsupported file type, expected .csv, .ndjson or .jsonl")
+
+
+def existing_values(model, field, values):
+    """
+    The subset of ``values`` already stored in ``model.field``.
+
+    One ``= ANY(array)`` query: a single parameter, however large the
+    batch, instead of an ``IN`` list with one placeholder per value.
+    """
+    connection = connections[router.db_for_read(model)]
+    quote = connection.ops.quote_name
+    column = quote(model._meta.get_field(field).column)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT {column} FROM {quote(model._meta.db_table)} WHERE {column} = ANY(%s)", [list(values)]
+        )
+        return {value for value, in cursor.fetchall()}
+
+
+def ids_by(model, field, values):
+    """Map the values of ``values`` stored in ``model.field`` to their primary keys, in one query."""
+    connection = connections[router.db_for_read(model)]
+    quote = connection.ops.quote_name
+    column = quote(model._meta.get_field(field).column)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {column}, {quote(model._meta.pk.column)} FROM {quote(model._meta.db_table)} "
+            f"WHERE {column} = ANY(%s)",
+            [list(values)],
+        )
+        return dict(cursor.fetchall())
+
+
+def reserve_ids(model, count):
+    """Draw ``count`` primary keys from the table's sequence in one query."""
+    connection = connections[router.db_for_write(model)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+            [model._meta.db_table, model._meta.pk.column, count],
+        )
+        return [pk for pk, in cursor.fetchall()]
+
+
+def copy_insert(model, columns, rows):
+    """
+    Insert ``rows`` (tuples in ``columns`` order) with ``COPY ... FROM STDIN``.
+
+    No model ``save()`` or signals run, and database defaults are not
+    applied: every column without a nullable default must be in ``columns``.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    names = ", ".join(quote(model._meta.get_field(column).column) for column in columns)
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(f"COPY {table} ({names}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+class BulkImportSerializer(serializers.Serializer):
+    """
+    Input for bulk import endpoints. Row contents are validated by the
+    import function so that each row gets its own result instead of failing
+    the whole request.
+    """
+    rows = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=settings.BULK_IMPORT_MAX_ROWS,
+    )
+    dry_run = serializers.BooleanField(default=False)
+
+
+def import_response(results):
+    failed = sum(1 for result in results if result["status"] == "invalid")
+    created = sum(1 for result in results if result["status"] == "created")
+    return Response(
+        {"created": created, "failed": failed, "results": results},
+        status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+    )
+
+
+def run_import_batch(function, rows, kwargs, attempts=3):
+    """
+    Call the import function at dotted path ``function`` on one batch.
+
+    Batches imported in parallel may race on a unique column (a name the
+    other batch inserted after this one checked it); the batch then fails
+    as a whole and is retried, which reports the conflicting rows as
+    duplicates.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return import_string(function)(rows, **kwargs)
+        except IntegrityError:
+            if attempt == attempts:
+                raise
+
+
+def _init_worker():
+    django.setup()
+
+
+def parallel_map(function, argument_lists, workers=1):
+    """
+    Yield ``function(*arguments)`` for each of ``argument_lists``, in order.
+
+    With more than one worker the calls run in that many spawned processes,
+    each with its own database connections, and at most two calls per
+    worker are queued at a time, so a long input is never held in memory.
+    Arguments and results must be picklable and ``function`` importable.
+    The calls continue the caller's trace (UA_13XX_bravo.tracing).
+    """
+    if workers == 1:
+        for arguments in argument_lists:
+            yield function(*arguments)
+        return
+
+    with ProcessPoolExecutor(
+        workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker,
+    ) as executor:
+        pending = deque()
+        carrier = inject()
+        for arguments in argument_lists:
+            pending.append(executor.submit(run_in_trace, carrier, function, *arguments))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class BulkImportCommand(BaseCommand):
+    """
+    Base for ``import_*`` commands: reads a CSV/NDJSON file and passes it in
+    batches to ``import_function`` (a dotted path), which returns one result
+    dict per row in the shape of ``bulk_create_subscriptions``. With
+    ``--workers`` batches run in that many processes.
+    """
+    label = "rows"
+    import_function = None
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to a .csv or .ndjson/.jsonl file")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--workers", type=int, default=1, help="Import batches in this many processes")
+        parser.add_argument("--dry-run", action="store_true", help="Validate rows without saving them")
+
+    def import_kwargs(self, options):
+        return {"dry_run": options["dry_run"]}
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        if options["workers"] < 1:
+            raise CommandError("--workers must be positive")
+
+        rows = read_rows(path)
+        batches = iter(lambda: list(islice(rows, options["batch_size"])), [])
+        kwargs = self.import_kwargs(options)
+        results = parallel_map(
+            run_import_batch, ((self.import_function, batch, kwargs) for batch in batches), options["workers"]
+        )
+        self.report(results, options)
+
+    def report(self, batch_results, options):
+        created = failed = offset = 0
+        for results in batch_results:
+            for result in results:
+                if result["status"] == "invalid":
+                    failed += 1
+                    self.stderr.write(f"Row {offset + result['row'] + 1}: {result['errors']}")
+                else:
+                    created += 1
+            offset += len(results)
+
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {created} {self.label}, {failed} rows failed."))
@@ -0,0 +1,76 @@
+"""
+Import-time profile of a process start.
+
+``profile_startup`` runs a fresh interpreter with ``python -X importtime``
+that sets up Django and imports what a server worker imports before its
+first request (the app, and through the URLconf every view), then parses
+the report. ``by_package`` folds it per top-level package, which for the
+project's own modules is the Django app: the ``profile_imports`` command
+prints that table and the startup test keeps it within budget.
+"""
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+STARTUP_CODE = """
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+import {application}
+"""
+
+
+class ImportRecord:
+    __slots__ = ("module", "self_us", "cumulative_us", "depth")
+
+    def __init__(self, module, self_us, cumulative_us, depth):
+        self.module = module
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+
+    @property
+    def package(self):
+        return self.module.partition(".")[0]
+
+
+def parse_importtime(text):
+    """Records of a ``-X importtime`` report (stderr), in report order."""
+    records = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def by_package(records):
+    """``{package: (self µs, modules)}``, most expensive first."""
+    totals = {}
+    for record in records:
+        self_us, modules = totals.get(record.package, (0, 0))
+        totals[record.package] = (self_us + record.self_us, modules + 1)
+    return dict(sorted(totals.items(), key=lambda item: item[1][0], reverse=True))
+
+
+def profile_startup(application="UA_13XX_bravo.asgi"):
+    """Import ``application`` in a new interpreter; returns its ImportRecords."""
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "UA_13XX_bravo.settings")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_CODE.format(application=application)],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        raise RuntimeError(f"Importing {application} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
@@ -0,0 +1,205 @@
+"""
+Queued, structured logging.
+
+``configure_logging`` is Django's LOGGING_CONFIG: it applies ``LOGGING``
+with dictConfig and then moves the root logger's handlers behind a
+QueueHandler. The calling thread only stamps the record with the request
+id, decides whether to sample it and puts it on a bounded queue; a
+QueueListener thread formats it and does the file and console I/O,
+rotation included. When the queue is full, DEBUG and INFO records are
+dropped rather than blocking a request, and counted in the
+``log_records_dropped_total`` metric; warnings and errors are written by
+the logging thread itself so they are never lost.
+
+JSONFormatter writes one JSON object per line with the timestamp, level,
+logger, message, request id, location, exception and any ``extra=``
+fields. RequestIdMiddleware (UA_13XX_bravo.middleware) sets the request
+id from ``X-Request-ID`` or generates one.
+"""
+import atexit
+import logging
+import logging.config
+import os
+import random
+import zlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+
+from django.conf import settings
+
+from .fastjson import dumps_text
+from .metrics import LOG_RECORDS_DROPPED
+
+request_id = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else came from ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+_JSON_TYPES = (str, int, float, bool, type(None), list, dict)
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Keep ``rate`` of the DEBUG records, all records of higher levels.
+
+    Records with a request id are sampled per request, so a sampled
+    request keeps all of its debug lines.
+    """
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = rate
+        self._threshold = int(rate * 10000)
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        rid = getattr(record, "request_id", None)
+        if rid:
+            return zlib.crc32(rid.encode()) % 10000 < self._threshold
+        return random.random() < self.rate
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value if isinstance(value, _JSON_TYPES) else str(value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        try:
+            return dumps_text(entry)
+        except TypeError:  # e.g. a dict of objects in extra=
+            return dumps_text({key: str(value) for key, value in entry.items()})
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks on a full queue.
+
+    DEBUG and INFO records are dropped and counted in ``dropped`` (and
+    LOG_RECORDS_DROPPED); records of higher levels go straight to the
+    ``fallback`` handlers on the logging thread.
+    """
+
+    def __init__(self, queue, fallback=()):
+        super().__init__(queue)
+        self.fallback = list(fallback)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            if record.levelno >= logging.WARNING and self.fallback:
+                for handler in self.fallback:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            else:
+                self.dropped += 1
+                LOG_RECORDS_DROPPED.inc()
+
+    def prepare(self, record):
+        # Resolve what can't cross threads (message arguments, the traceback);
+        # the listener's handlers do the formatting
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(vars(record))
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class DrainingQueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room rather than fail when stopped with a full queue
+        self.queue.put(self._sentinel)
+
+
+class LogPipeline:
+    """The root QueueHandler and the listener thread that feeds the real handlers."""
+
+    def __init__(self, handlers, queue_size, debug_sample_rate):
+        self.handlers = handlers
+        self.queue_size = queue_size
+        self.queue_handler = BoundedQueueHandler(Queue(queue_size), fallback=handlers)
+        self.queue_handler.addFilter(RequestIdFilter())
+        self.queue_handler.addFilter(DebugSamplingFilter(debug_sample_rate))
+        self.listener = None
+
+    def start(self):
+        self.listener = DrainingQueueListener(self.queue_handler.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        """Hand the queued records to the handlers and stop the listener thread."""
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+
+    def restart_after_fork(self):
+        # Threads don't survive fork; workers get their own queue and listener
+        self.queue_handler.queue = Queue(self.queue_size)
+        self.start()
+
+
+_pipeline = None
+
+
+def configure_logging(config):
+    """LOGGING_CONFIG callable; see the module docstring."""
+    global _pipeline
+    logging.config.dictConfig(config)
+    if not settings.LOG_QUEUE_ENABLED:
+        return
+    if _pipeline is not None:
+        _pipeline.stop()
+
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    for handler in handlers:
+        root.removeHandler(handler)
+    _pipeline = LogPipeline(handlers, settings.LOG_QUEUE_SIZE, settings.LOG_DEBUG_SAMPLE_RATE)
+    root.addHandler(_pipeline.queue_handler)
+    _pipeline.start()
+
+
+def get_pipeline():
+    return _pipeline
+
+
+def _stop_pipeline():
+    # Runs before logging.shutdown (atexit is last in, first out), which flushes and closes the handlers
+    if _pipeline is not None:
+        _pipeline.stop()
+
+
+def _restart_pipeline():
+    if _pipeline is not None:
+        _pipeline.restart_after_fork()
+
+
+atexit.register(_stop_pipeline)
+os.register_at_fork(after_in_child=_restart_pipeline)
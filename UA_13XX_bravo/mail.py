@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .metrics import EMAIL_OUTBOX, EMAILS
+from .tracing import CLIENT, start_span
+
+
+class MeteredEmailBackend(BaseEmailBackend):
+    """
+    Send through EMAIL_DELIVERY_BACKEND, counting the emails in flight
+    and tracing each send.
+
+    Emails are sent synchronously by the code that creates them, so the
+    outbox depth is the number of emails waiting on the mail server
+    across all workers.
+    """
+
+    def __init__(self, fail_silently=False, **kwargs):
+        super().__init__(fail_silently=fail_silently)
+        self.backend = get_connection(settings.EMAIL_DELIVERY_BACKEND, fail_silently=fail_silently, **kwargs)
+
+    def open(self):
+        return self.backend.open()
+
+    def close(self):
+        return self.backend.close()
+
+    def send_messages(self, email_messages):
+        email_messages = list(email_messages)
+        EMAIL_OUTBOX.inc(len(email_messages))
+        attributes = {"email.backend": settings.EMAIL_DELIVERY_BACKEND, "email.count": len(email_messages)}
+        try:
+            with start_span("email.send", CLIENT, attributes):
+                sent = self.backend.send_messages(email_messages) or 0
+        except Exception:
+            EMAILS.labels(result="failed").inc(len(email_messages))
+            raise
+        finally:
+            EMAIL_OUTBOX.dec(len(email_messages))
+        EMAILS.labels(result="sent").inc(sent)
+        if sent < len(email_messages):  # fail_silently swallowed an error
+            EMAILS.labels(result="failed").inc(len(email_messages) - sent)
+        return sent
@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from UA_13XX_bravo.exports import DATASETS, FORMATS, export
+
+
+class Command(BaseCommand):
+    help = (
+        "Export companies, projects, subscriptions or follows as CSV or NDJSON. "
+        "With --watermark-file, each run only exports rows changed since the previous one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(DATASETS))
+        parser.add_argument("--format", choices=FORMATS, default="csv")
+        parser.add_argument("--output", default="-", help="File to write, '-' for stdout")
+        parser.add_argument("--since", help="Only rows changed after this ISO 8601 timestamp")
+        parser.add_argument(
+            "--watermark-file",
+            help="Read --since from this file when it exists and store the new watermark in it afterwards",
+        )
+        parser.add_argument("--no-copy", action="store_true", help="Read through a cursor instead of COPY")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        since = options["since"]
+        watermark_file = Path(options["watermark_file"]) if options["watermark_file"] else None
+        if since is None and watermark_file and watermark_file.exists():
+            since = watermark_file.read_text().strip() or None
+        if since is not None:
+            parsed = parse_datetime(since)
+            if parsed is None:
+                raise CommandError(f"Invalid timestamp: {since}")
+            since = parsed
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive")
+
+        blocks, until = export(
+            options["dataset"],
+            options["format"],
+            since=since,
+            use_copy=not options["no_copy"],
+            chunk_size=options["chunk_size"],
+        )
+        size = 0
+        output = sys.stdout.buffer if options["output"] == "-" else open(options["output"], "wb")
+        try:
+            for block in blocks:
+                output.write(block)
+                size += len(block)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+
+        if watermark_file:
+            watermark_file.write_text(until.isoformat())
+        # stdout may be the export itself
+        self.stderr.write(f"Exported {options['dataset']} ({size} bytes), watermark {until.isoformat()}.")
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from UA_13XX_bravo.startup import advisory_lock, applied_digest, fixture_paths, record_digest, state_digest
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply migrations and load the startup fixtures (STARTUP_FIXTURES), "
+        "unless neither changed since the last run against this database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--force", action="store_true", help="Migrate and load fixtures regardless of the digest")
+        parser.add_argument(
+            "--check", action="store_true", help="Only report; exit with status 1 if the database needs preparing"
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        digest = state_digest()
+        if not options["force"] and applied_digest(using) == digest:
+            self.stdout.write("Database is up to date, skipping migrations and fixtures.")
+            return
+        if options["check"]:
+            raise CommandError("Database needs migrations or fixtures.", returncode=1)
+
+        with advisory_lock(using=using):
+            # Another container may have finished while this one waited
+            if not options["force"] and applied_digest(using) == digest:
+                self.stdout.write("Database was prepared by another process.")
+                return
+            verbosity = options["verbosity"]
+            call_command("migrate", database=using, interactive=False, verbosity=verbosity)
+            call_command("loaddata", *fixture_paths(), database=using, verbosity=verbosity)
+            record_digest(digest, using)
+        self.stdout.write(self.style.SUCCESS(f"Database prepared ({len(settings.STARTUP_FIXTURES)} fixtures)."))
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from UA_13XX_bravo.importtime import by_package, profile_startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile the imports of a server start (python -X importtime) and report "
+        "their cost per package; the project's own apps are marked with *."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--application", default="UA_13XX_bravo.asgi", help="Module a server worker imports")
+        parser.add_argument("--top", type=int, default=25, help="Packages to list")
+        parser.add_argument("--modules", type=int, default=0, help="Also list the N slowest modules, with children")
+        parser.add_argument("--budget-ms", type=float, help="Fail when the total import time exceeds this")
+
+    def handle(self, *args, **options):
+        try:
+            records = profile_startup(options["application"])
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        base_dir = Path(settings.BASE_DIR).resolve()
+        local = {
+            config.name.partition(".")[0] for config in apps.get_app_configs()
+            if Path(config.path).resolve().is_relative_to(base_dir)
+        }
+        total_ms = sum(record.self_us for record in records) / 1000
+        self.stdout.write(f"Imported {len(records)} modules in {total_ms:.1f} ms.")
+        self.stdout.write(f"  {'package':<40} {'ms':>8} {'share':>6} {'modules':>8}")
+        for package, (self_us, modules) in list(by_package(records).items())[:options["top"]]:
+            name = f"{package} *" if package in local else package
+            share = self_us / 1000 / total_ms if total_ms else 0
+            self.stdout.write(f"  {name:<40} {self_us / 1000:>8.1f} {share:>6.1%} {modules:>8}")
+
+        if options["modules"]:
+            self.stdout.write(f"\n  {'module (with its imports)':<60} {'ms':>8}")
+            slowest = sorted(records, key=lambda record: record.cumulative_us, reverse=True)
+            for record in slowest[:options["modules"]]:
+                self.stdout.write(f"  {record.module:<60} {record.cumulative_us / 1000:>8.1f}")
+
+        if options["budget_ms"] is not None and total_ms > options["budget_ms"]:
+            raise CommandError(f"Imports took {total_ms:.1f} ms, over the budget of {options['budget_ms']:.0f} ms.")
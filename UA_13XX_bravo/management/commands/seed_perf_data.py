@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from notifications.models import Type
+from UA_13XX_bravo.imports import parallel_map
+from UA_13XX_bravo.seeding import DATASETS, PASSWORD, SeedPlan, chunks, seed_chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with deterministic users, companies, memberships, follows, projects, "
+        "subscriptions and notifications for performance tests. Interrupted runs resume where "
+        "they stopped when run again with the same options."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=1, help="Different seeds produce separate datasets")
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--companies", type=int, default=500, help="At most --users; 60%% are startups")
+        parser.add_argument("--follows", type=int, default=5, help="Startups followed per investor company")
+        parser.add_argument("--projects", type=int, default=2, help="Projects per startup")
+        parser.add_argument("--subscriptions", type=int, default=3, help="Subscriptions per project")
+        parser.add_argument("--notifications", type=int, default=5, help="Notifications per user")
+        parser.add_argument("--only", nargs="+", choices=DATASETS, help="Seed only these datasets")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per transaction")
+        parser.add_argument("--workers", type=int, default=1, help="Write chunks in this many processes")
+
+    def handle(self, *args, **options):
+        scale = ["users", "companies", "follows", "projects", "subscriptions", "notifications"]
+        for name in scale:
+            if options[name] < 0:
+                raise CommandError(f"--{name} cannot be negative")
+        for name in ("chunk_size", "workers"):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be positive")
+        if options["companies"] > options["users"]:
+            raise CommandError("Every company needs an owner: --companies cannot exceed --users")
+
+        plan = SeedPlan(options["seed"], **{name: options[name] for name in scale})
+        datasets = [name for name in DATASETS if name in (options["only"] or DATASETS)]
+        if plan.notifications and "notifications" in datasets and not Type.objects.exists():
+            raise CommandError("No notification types: load notifications/fixtures/type_fixture.json first")
+
+        for dataset in datasets:
+            written = skipped = 0
+            ranges = chunks(plan, dataset, options["chunk_size"])
+            for rows, done in parallel_map(
+                seed_chunk, ((plan, dataset, start, stop) for start, stop in ranges), options["workers"]
+            ):
+                written += rows
+                skipped += done
+            units, _ = plan.units(dataset)
+            self.stdout.write(f"{dataset}: {written} rows written, {skipped} of {units} units already there.")
+
+        self.stdout.write(self.style.SUCCESS(f"Seed {plan.seed} done; users log in with password {PASSWORD!r}."))
@@ -0,0 +1,400 @@
+"""
+Prometheus metrics, shared by all the worker processes of a server.
+
+The metrics are declared here, so whichever worker serves a scrape can
+render all of them, and updated where things happen:
+MetricsMiddleware times every view, ``record_query`` (installed on each
+database connection, see UA_13XX_bravo.apps) times every query,
+ChatConsumer counts messages and its groups' sizes,
+notify_followers_on_update records fan-out sizes, MeteredEmailBackend
+(UA_13XX_bravo.mail) the emails waiting on the mail server and the log
+queue (UA_13XX_bravo.log) the records it had to drop.
+
+With METRICS_DIR set, each process keeps its values in its own
+memory-mapped file there, ``{counter,gauge}_{pid}.db``: an update is a
+dict lookup and a struct write into the mapping, no system call.
+``render`` (the /metrics view) reads the files of every process and sums
+them, so one scrape reports the whole server. Gauge files of exited
+workers are removed (``mark_process_dead``, gunicorn's child_exit hook);
+counters are kept so totals never go backwards. Without METRICS_DIR the
+values stay in memory and a scrape reports the serving process only.
+"""
+import bisect
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+_HEADER = struct.Struct("<I4x")  # bytes used, padded to keep values 8-byte aligned
+_KEY_LENGTH = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+_INITIAL_SIZE = 64 * 1024
+
+REGISTRY = []
+
+
+def _entries(buffer, used):
+    """``(key, value, value offset)`` of the entries in a values file's first ``used`` bytes."""
+    offset = _HEADER.size
+    while offset < used:
+        length = _KEY_LENGTH.unpack_from(buffer, offset)[0]
+        key = bytes(buffer[offset + _KEY_LENGTH.size:offset + _KEY_LENGTH.size + length]).decode()
+        offset += _padded(length)
+        yield key, _VALUE.unpack_from(buffer, offset)[0], offset
+        offset += _VALUE.size
+
+
+def _padded(key_length):
+    return (_KEY_LENGTH.size + key_length + 7) // 8 * 8
+
+
+class MmapValues:
+    """
+    Values by key in a memory-mapped file written by this process only.
+
+    An entry is the key's length, the key and the value, a double; the
+    header holds the bytes in use and is updated after an entry is
+    complete, so other processes can read the file at any time.
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._file = open(path, "a+b")
+        if os.fstat(self._file.fileno()).st_size < _INITIAL_SIZE:
+            self._file.truncate(_INITIAL_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._used = _HEADER.unpack_from(self._map)[0] or _HEADER.size
+        self._positions = {key: position for key, _, position in _entries(self._map, self._used)}
+
+    def add(self, key, amount):
+        with self._lock:
+            position = self._positions.get(key) or self._append(key)
+            _VALUE.pack_into(self._map, position, _VALUE.unpack_from(self._map, position)[0] + amount)
+
+    def set(self, key, value):
+        with self._lock:
+            _VALUE.pack_into(self._map, self._positions.get(key) or self._append(key), value)
+
+    def items(self):
+        with self._lock:
+            return [(key, value) for key, value, _ in _entries(self._map, self._used)]
+
+    def _append(self, key):
+        encoded = key.encode()
+        position = self._used + _padded(len(encoded))
+        end = position + _VALUE.size
+        if end > len(self._map):
+            size = len(self._map)
+            while size < end:
+                size *= 2
+            self._map.close()
+            self._file.truncate(size)
+            self._map = mmap.mmap(self._file.fileno(), size)
+        _KEY_LENGTH.pack_into(self._map, self._used, len(encoded))
+        self._map[self._used + _KEY_LENGTH.size:self._used + _KEY_LENGTH.size + len(encoded)] = encoded
+        _VALUE.pack_into(self._map, position, 0.0)
+        self._used = end
+        _HEADER.pack_into(self._map, 0, end)
+        self._positions[key] = position
+        return position
+
+
+class MemoryValues:
+    """Values by key in this process's memory, when METRICS_DIR is not set."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def add(self, key, amount):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set(self, key, value):
+        with self._lock:
+            self._values[key] = value
+
+    def items(self):
+        with self._lock:
+            return list(self._values.items())
+
+
+def read_values(path):
+    """``[(key, value)]`` of another process's values file."""
+    data = Path(path).read_bytes()
+    if len(data) < _HEADER.size:
+        return []
+    return [(key, value) for key, value, _ in _entries(data, _HEADER.unpack_from(data)[0] or _HEADER.size)]
+
+
+_stores = {}
+_stores_pid = None
+_stores_lock = threading.Lock()
+
+
+def _values(kind):
+    """This process's MmapValues/MemoryValues for ``kind`` ("counter" or "gauge")."""
+    global _stores, _stores_pid
+    pid = os.getpid()
+    if _stores_pid != pid:  # first use, or a worker forked from a process that had values
+        with _stores_lock:
+            if _stores_pid != pid:
+                _stores, _stores_pid = {}, pid
+    store = _stores.get(kind)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(kind)
+            if store is None:
+                directory = settings.METRICS_DIR
+                store = MmapValues(Path(directory) / f"{kind}_{pid}.db") if directory else MemoryValues()
+                _stores[kind] = store
+    return store
+
+
+def _key(name, labels):
+    return json.dumps([name, labels], separators=(",", ":"))
+
+
+class Metric:
+    type = None
+    child_class = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        REGISTRY.append(self)
+
+    def labels(self, **labels):
+        values = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self.child_class(self, list(zip(self.labelnames, values)))
+        return child
+
+    def render(self, samples):
+        rows = samples.get(self.name) or ([([], 0.0)] if not self.labelnames else [])
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}" for labels, value in sorted(rows)]
+
+
+class _CounterChild:
+    def __init__(self, metric, labels):
+        self.key = _key(metric.name, labels)
+
+    def inc(self, amount=1):
+        _values("counter").add(self.key, amount)
+
+
+class _GaugeChild:
+    def __init__(self, metric, labels):
+        self.key = _key(metric.name, labels)
+
+    def inc(self, amount=1):
+        _values("gauge").add(self.key, amount)
+
+    def dec(self, amount=1):
+        _values("gauge").add(self.key, -amount)
+
+    def set(self, value):
+        _values("gauge").set(self.key, value)
+
+
+class _HistogramChild:
+    def __init__(self, metric, labels):
+        self.bounds = metric.buckets
+        self.bucket_keys = [
+            _key(f"{metric.name}_bucket", [*labels, ["le", _format_value(bound)]]) for bound in metric.buckets
+        ]
+        self.sum_key = _key(f"{metric.name}_sum", labels)
+        self.count_key = _key(f"{metric.name}_count", labels)
+
+    def observe(self, value):
+        values = _values("counter")
+        # Buckets are stored per bucket and made cumulative when rendered
+        values.add(self.bucket_keys[bisect.bisect_left(self.bounds, value)], 1)
+        values.add(self.sum_key, value)
+        values.add(self.count_key, 1)
+
+    def time(self):
+        return _Timer(self)
+
+
+class _Timer:
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.child.observe(time.perf_counter() - self.started)
+
+
+class Counter(Metric):
+    type = "counter"
+    child_class = _CounterChild
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    """A gauge, summed over the live processes."""
+
+    type = "gauge"
+    child_class = _GaugeChild
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def dec(self, amount=1):
+        self.labels().dec(amount)
+
+    def set(self, value):
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    type = "histogram"
+    child_class = _HistogramChild
+
+    def __init__(self, name, documentation, labelnames=(), buckets=()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*sorted(buckets), math.inf)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def render(self, samples):
+        counts = {}
+        for labels, value in samples.get(f"{self.name}_bucket", ()):
+            *base, (_, bound) = labels
+            counts.setdefault(tuple(base), {})[bound] = value
+        sums = dict(samples.get(f"{self.name}_sum", ()))
+        totals = dict(samples.get(f"{self.name}_count", ()))
+        lines = []
+        for base in sorted(counts):
+            cumulative = 0.0
+            for bound in self.buckets:
+                cumulative += counts[base].get(_format_value(bound), 0.0)
+                labels = _format_labels([*base, ("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(base)} {_format_value(sums.get(base, 0.0))}")
+            lines.append(f"{self.name}_count{_format_labels(base)} {_format_value(totals.get(base, 0.0))}")
+        return lines
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def collect():
+    """``{sample name: [(labels, value)]}``, summed over every process."""
+    if settings.METRICS_DIR:
+        sources = [read_values(path) for path in Path(settings.METRICS_DIR).glob("*.db")]
+    else:
+        sources = [store.items() for store in list(_stores.values())]
+    totals = {}
+    for items in sources:
+        for key, value in items:
+            totals[key] = totals.get(key, 0.0) + value
+    samples = {}
+    for key, value in totals.items():
+        name, labels = json.loads(key)
+        samples.setdefault(name, []).append((tuple(map(tuple, labels)), value))
+    return samples
+
+
+def render():
+    """Every registered metric in the Prometheus text format."""
+    samples = collect()
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(metric.render(samples))
+    return "\n".join(lines) + "\n"
+
+
+def clear_directory(directory):
+    """Remove the values files of a previous run; gunicorn's on_starting hook."""
+    if directory:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        for path in Path(directory).glob("*.db"):
+            path.unlink(missing_ok=True)
+
+
+def mark_process_dead(pid, directory):
+    """Drop the gauges of an exited worker; gunicorn's child_exit hook."""
+    if directory:
+        (Path(directory) / f"gauge_{pid}.db").unlink(missing_ok=True)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper timing every query."""
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        DB_QUERY_DURATION.labels(alias=context["connection"].alias).observe(time.perf_counter() - started)
+
+
+def install_query_metrics(sender, connection, **kwargs):
+    """connection_created receiver; a pooled connection is "created" again on every checkout."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to the response, by view, method and status.",
+    ("view", "method", "status"),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Database query time by connection alias; its _count is the number of queries.",
+    ("alias",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+CHAT_CONNECTIONS = Gauge("chat_connections", "WebSocket connections joined to a chat room group.")
+CHAT_MESSAGES = Counter("chat_messages_total", "Chat messages received and sent to their room group.")
+CHAT_GROUP_SIZE = Histogram(
+    "chat_group_size",
+    "Members of the room group a chat message is sent to (in-memory channel layer only).",
+    buckets=(1, 2, 3, 5, 10, 25, 50, 100),
+)
+NOTIFICATION_FANOUT = Histogram(
+    "notification_fanout_size",
+    "Users notified per event, by notification type.",
+    ("type",),
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+EMAIL_OUTBOX = Gauge("email_outbox_depth", "Emails handed to the mail backend and not yet sent.")
+EMAILS = Counter("emails_total", "Emails by result (sent or failed).", ("result",))
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total", "DEBUG and INFO log records dropped because the log queue was full."
+)
@@ -0,0 +1,234 @@
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+from .db_router import set_replica_reads
+from .log import request_id
+from .metrics import REQUEST_DURATION
+from .tracing import SERVER, current_span, extract, start_span
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only without it
+    brotli = None
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+HTTP_METHODS = {"GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"}
+PRIMARY_PIN_COOKIE = "db_primary_pin"
+REQUEST_ID_HEADER = "X-Request-ID"
+# Ids accepted from a proxy or client; anything else is replaced
+VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+
+class RequestIdMiddleware:
+    """
+    Tag the request's log records with a request id.
+
+    Takes the id from an ``X-Request-ID`` header set by the proxy or client
+    when it looks sane, generates one otherwise, and echoes it back in the
+    response so a client report can be matched to the logs.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        incoming = request.headers.get(REQUEST_ID_HEADER, "")
+        rid = incoming if VALID_REQUEST_ID.fullmatch(incoming) else uuid.uuid4().hex
+        request.request_id = rid
+        token = request_id.set(rid)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id.reset(token)
+        response.headers[REQUEST_ID_HEADER] = rid
+        return response
+
+
+class TracingMiddleware:
+    """
+    Open the server span of every request (see UA_13XX_bravo.tracing).
+
+    A ``traceparent`` header continues the caller's trace. The span is
+    named after the method and route once the URL is resolved.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        attributes = {"http.request.method": request.method, "url.path": request.path}
+        if request_id.get():
+            attributes["http.request.id"] = request_id.get()
+        with start_span(request.method, SERVER, attributes, parent=extract(request.headers)) as span:
+            response = self.get_response(request)
+            span.set_attribute("http.response.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.set_status("ERROR")
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        span = current_span()
+        if span is not None:
+            route = "/" + request.resolver_match.route
+            span.name = f"{request.method} {route}"
+            span.set_attribute("http.route", route)
+            view = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None) or view_func
+            span.set_attribute("code.function", view.__qualname__)
+        return None
+
+
+class MetricsMiddleware:
+    """
+    Time every request by view (see UA_13XX_bravo.metrics).
+
+    The view label is the view class or function name, so a viewset's
+    actions share it and the method label tells them apart; requests
+    that match no URL are labelled "unresolved". Streamed responses are
+    timed to their first byte.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        request.metrics_view = "unresolved"
+        response = self.get_response(request)
+        method = request.method if request.method in HTTP_METHODS else "other"
+        REQUEST_DURATION.labels(view=request.metrics_view, method=method, status=response.status_code).observe(
+            time.perf_counter() - started
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None) or view_func
+        request.metrics_view = view.__name__
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serve opted-in read endpoints from a replica with read-your-writes.
+
+    A view opts in by listing the actions (viewset action names, or lowercase
+    HTTP methods for plain API views) that may read from a replica in
+    ``replica_read_actions``. A successful write sets a short-lived cookie that
+    pins the client's reads to the primary for ``REPLICA_STICKY_SECONDS``, so
+    users always see their own changes despite replication lag.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        set_replica_reads(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            # Streamed responses pin their database before this point
+            set_replica_reads(False)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in SAFE_METHODS or PRIMARY_PIN_COOKIE in request.COOKIES:
+            return None
+
+        view_class = getattr(view_func, "cls", None)
+        actions = getattr(view_func, "actions", None)
+        action = actions.get(request.method.lower()) if actions else request.method.lower()
+
+        if action in getattr(view_class, "replica_read_actions", ()):
+            set_replica_reads(True)
+        return None
+
+
+def preferred_encoding(accept_encoding: str):
+    """
+    Pick "br" or "gzip" from an Accept-Encoding header, honouring q-values;
+    brotli wins ties and is only offered when the brotli package is installed.
+    """
+    available = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_q = None, 0.0
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if coding not in available:
+            continue
+        q = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                continue
+        if q <= 0:
+            continue
+        if q > best_q or (q == best_q and coding == "br"):
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware with brotli negotiation.
+
+    Streamed responses are compressed as they are produced, with a flush per
+    chunk, so large lists keep their low time-to-first-byte.
+    """
+
+    def process_response(self, request, response):
+        encoding = preferred_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding != "br":
+            return super().process_response(request, response)
+
+        if not response.streaming and len(response.content) < 200:
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if response.streaming:
+            response.streaming_content = self.brotli_stream(response)
+            del response.headers["Content-Length"]
+        else:
+            compressed = brotli.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
+
+    @staticmethod
+    def brotli_stream(response):
+        original = response.streaming_content
+        compressor = brotli.Compressor()
+        if response.is_async:
+            async def compress():
+                async for chunk in original:
+                    yield compressor.process(chunk) + compressor.flush()
+                yield compressor.finish()
+        else:
+            def compress():
+                for chunk in original:
+                    yield compressor.process(chunk) + compressor.flush()
+                yield compressor.finish()
+        return compress()
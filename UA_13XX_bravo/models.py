@@ -0,0 +1,8 @@
+from django.db import models
+
+
+class DeploymentState(models.Model):
+    """Digest of the code-defined database state (migrations, fixtures) last applied."""
+    name = models.CharField(max_length=50, primary_key=True)
+    digest = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,351 @@
+"""
+Deterministic, resumable bulk data for performance environments.
+
+``seed_perf_data`` fills users, companies with their owners' memberships,
+follows, projects, subscriptions with the investors' portfolio rollups,
+and notifications. Every value is a hash of ``(seed, dataset, row index)``,
+so the same seed and scale produce the same rows whatever the chunk size
+or number of workers, and rows of different seeds never collide (their
+names and emails carry the seed).
+
+Each dataset is written in chunks of consecutive units (a user, an
+investor's follows, a project's subscriptions...), one transaction per
+chunk, with ``COPY FROM``. Units already in the database are skipped, found
+with one query per chunk, which makes an interrupted run resumable by
+running it again, with any chunk size.
+Datasets are written in dependency order; the chunks of one dataset are
+independent and can be spread over worker processes. Rows are inserted
+directly, so no signals run: maintained fields (``funded_percent``,
+``subscriber_count``, ``allocated_share``, portfolio rollups) are written
+explicitly.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from functools import lru_cache
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from companies.models import CompanyFollowers, CompanyProfile, CompanyType, UserToCompany
+from investments.models import PortfolioExposure, Subscription, refresh_portfolios
+from notifications.models import Notification, Type
+from projects.models import Project, ProjectStatus, funded_percent
+from .imports import copy_insert, existing_values, ids_by, reserve_ids
+
+User = get_user_model()
+
+# Seeded users can log in with this password
+PASSWORD = "perf-password"
+
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+SPREAD_SECONDS = 365 * 24 * 3600
+_MASK = (1 << 64) - 1
+
+FIRST_NAMES = ["Olena", "Taras", "Iryna", "Andrii", "Sofiia", "Dmytro", "Marta", "Bohdan", "Nadiia", "Oleh"]
+LAST_NAMES = ["Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko", "Melnyk", "Boyko", "Moroz"]
+INDUSTRIES = ["fintech", "healthcare", "edtech", "agritech", "energy", "logistics", "gaming", "security"]
+# Most projects are open for investment
+PROJECT_STATUSES = [ProjectStatus.ACTIVE] * 3 + [ProjectStatus.COMPLETED]
+
+# Of every ten companies, six are startups and four investors
+STARTUPS_PER_TEN = 6
+INVESTOR_TYPES = [CompanyType.ENTERPRISE] * 3 + [CompanyType.NONPROFIT]
+
+DATASETS = ("users", "companies", "follows", "projects", "subscriptions", "portfolios", "notifications")
+_SALTS = {name: salt for salt, name in enumerate(DATASETS, start=1)}
+
+
+def _rand(seed, dataset, index, draw=0):
+    """A 64-bit hash of its arguments (splitmix64), the source of every seeded value."""
+    z = (
+        seed * 0x9E3779B97F4A7C15 + _SALTS[dataset] * 0xD1B54A32D192ED03
+        + index * 0xBF58476D1CE4E5B9 + draw * 0x94D049BB133111EB
+    ) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+
+def _sample(seed, dataset, index, k, population):
+    """``k`` distinct numbers below ``population``, in draw order."""
+    k = min(k, population)
+    chosen = {}
+    draw = 0
+    while len(chosen) < k:
+        chosen.setdefault(_rand(seed, dataset, index, draw) % population, None)
+        draw += 1
+    return list(chosen)
+
+
+def _timestamp(seed, dataset, index):
+    return EPOCH + timedelta(seconds=_rand(seed, dataset, index, -1) % SPREAD_SECONDS)
+
+
+@lru_cache(maxsize=1)
+def _password_hash():
+    return make_password(PASSWORD)
+
+
+class SeedPlan:
+    """
+    The scale of a seeded dataset.
+
+    ``users`` and ``companies`` are totals; ``follows`` is per investor
+    company, ``projects`` per startup, ``subscriptions`` per project and
+    ``notifications`` per user. Company ``i`` is owned by user ``i``.
+    """
+
+    def __init__(self, seed=1, users=1000, companies=500, follows=5, projects=2, subscriptions=3, notifications=5):
+        self.seed = seed
+        self.users = users
+        self.companies = companies
+        self.follows = follows
+        self.projects = projects
+        self.subscriptions = subscriptions
+        self.notifications = notifications
+
+    @property
+    def startups(self):
+        tens, rest = divmod(self.companies, 10)
+        return tens * STARTUPS_PER_TEN + min(rest, STARTUPS_PER_TEN)
+
+    @property
+    def investors(self):
+        return self.companies - self.startups
+
+    def units(self, dataset):
+        """Number of chunkable units of a dataset, and rows per unit."""
+        return {
+            "users": (self.users, 1),
+            "companies": (self.companies, 2),
+            "follows": (self.investors if self.startups else 0, self.follows),
+            "projects": (self.startups * self.projects, 1),
+            "subscriptions": (self.startups * self.projects if self.users else 0, self.subscriptions),
+            "portfolios": (self.users if self.subscriptions else 0, 1),
+            "notifications": (self.users, self.notifications),
+        }[dataset]
+
+    def user_id(self, index):
+        return uuid.UUID(int=_rand(self.seed, "users", index) << 64 | index, version=4)
+
+    def email(self, index):
+        return f"seed{self.seed}-user{index}@perf.example.com"
+
+    def company_name(self, index):
+        return f"Seed {self.seed} company {index}"
+
+    def startup_index(self, ordinal):
+        tens, rest = divmod(ordinal, STARTUPS_PER_TEN)
+        return tens * 10 + rest
+
+    def investor_index(self, ordinal):
+        tens, rest = divmod(ordinal, 10 - STARTUPS_PER_TEN)
+        return tens * 10 + STARTUPS_PER_TEN + rest
+
+    def project_name(self, ordinal):
+        return f"Seed {self.seed} project {ordinal}"
+
+    def project_subscriptions(self, ordinal):
+        """``[(user index, share)]`` of a project; shares add up to at most 100%."""
+        users = _sample(self.seed, "subscriptions", ordinal, self.subscriptions, self.users)
+        cents = 10000 // max(len(users), 1)
+        return [
+            (user, Decimal(1 + _rand(self.seed, "subscriptions", ordinal, -2 - n) % cents) / 100)
+            for n, user in enumerate(users)
+        ]
+
+
+def _company_ids(plan, indices):
+    names = {plan.company_name(index): index for index in indices}
+    ids = ids_by(CompanyProfile, "company_name", names)
+    return {index: ids[name] for name, index in names.items()}
+
+
+def _project_ids(plan, ordinals):
+    names = {plan.project_name(ordinal): ordinal for ordinal in ordinals}
+    ids = ids_by(Project, "name", names)
+    return {ordinal: ids[name] for name, ordinal in names.items()}
+
+
+def _seed_users(plan, indices):
+    emails = {plan.email(i): i for i in indices}
+    done = existing_values(User, "email", emails)
+    indices = [i for email, i in emails.items() if email not in done]
+    seed = plan.seed
+    password = _password_hash()
+    copy_insert(
+        User,
+        ["id", "password", "is_superuser", "email", "is_staff", "is_active", "first_name", "last_name", "phone"],
+        (
+            [
+                plan.user_id(i), password, False, plan.email(i), False, True,
+                FIRST_NAMES[_rand(seed, "users", i, 1) % len(FIRST_NAMES)],
+                LAST_NAMES[_rand(seed, "users", i, 2) % len(LAST_NAMES)],
+                "",
+            ]
+            for i in indices
+        ),
+    )
+    return len(indices), len(done)
+
+
+def _seed_companies(plan, indices):
+    names = {plan.company_name(i): i for i in indices}
+    done = existing_values(CompanyProfile, "company_name", names)
+    indices = [i for name, i in names.items() if name not in done]
+    seed = plan.seed
+    rows = []
+    for i, pk in zip(indices, reserve_ids(CompanyProfile, len(indices))):
+        created = _timestamp(seed, "companies", i)
+        if i % 10 < STARTUPS_PER_TEN:
+            company_type = CompanyType.STARTUP
+        else:
+            company_type = INVESTOR_TYPES[i % 10 - STARTUPS_PER_TEN]
+        rows.append([
+            pk, plan.company_name(i), f"{plan.company_name(i)} builds things.",
+            f"https://company-{i}.seed{seed}.example.com", "",
+            INDUSTRIES[_rand(seed, "companies", i, 1) % len(INDUSTRIES)],
+            Decimal(_rand(seed, "companies", i, 2) % 100_000_000) / 100,
+            1 + _rand(seed, "companies", i, 3) % 500,
+            company_type, created, created,
+        ])
+    copy_insert(
+        CompanyProfile,
+        [
+            "id", "company_name", "description", "website", "startup_logo", "industry",
+            "required_funding", "company_size", "type", "created_at", "updated_at",
+        ],
+        rows,
+    )
+    copy_insert(
+        UserToCompany,
+        ["user_id", "company_id", "created_at", "updated_at"],
+        ([plan.user_id(i), row[0], row[-1], row[-1]] for i, row in zip(indices, rows)),
+    )
+    return 2 * len(rows), len(done)
+
+
+def _seed_follows(plan, ordinals):
+    seed = plan.seed
+    follows = {
+        plan.investor_index(ordinal): [
+            plan.startup_index(startup)
+            for startup in _sample(seed, "follows", ordinal, plan.follows, plan.startups)
+        ]
+        for ordinal in ordinals
+    }
+    ids = _company_ids(plan, {*follows, *(index for startups in follows.values() for index in startups)})
+    done = existing_values(CompanyFollowers, "investor", [ids[investor] for investor in follows])
+    rows = [
+        [ids[investor], ids[startup], _timestamp(seed, "follows", investor * plan.follows + n)]
+        for investor, startups in follows.items() if ids[investor] not in done
+        for n, startup in enumerate(startups)
+    ]
+    copy_insert(CompanyFollowers, ["investor_id", "startup_id", "created_at"], rows)
+    return len(rows), len(done)
+
+
+def _seed_projects(plan, ordinals):
+    names = {plan.project_name(ordinal): ordinal for ordinal in ordinals}
+    done = existing_values(Project, "name", names)
+    startups = {
+        ordinal: plan.startup_index(ordinal // plan.projects) for name, ordinal in names.items() if name not in done
+    }
+    ids = _company_ids(plan, set(startups.values()))
+    seed = plan.seed
+    rows = []
+    for ordinal, company in startups.items():
+        required = Decimal(100_000 + _rand(seed, "projects", ordinal, 1) % 100_000_000) / 100
+        raised = (required * (_rand(seed, "projects", ordinal, 2) % 101) / 100).quantize(Decimal("0.01"))
+        subscriptions = plan.project_subscriptions(ordinal) if plan.users else []
+        created = _timestamp(seed, "projects", ordinal)
+        rows.append([
+            plan.project_name(ordinal),
+            PROJECT_STATUSES[_rand(seed, "projects", ordinal, 3) % len(PROJECT_STATUSES)],
+            f"{plan.project_name(ordinal)} is looking for investors.",
+            ids[company], required, raised, funded_percent(raised, required),
+            len(subscriptions), sum((share for _, share in subscriptions), Decimal("0.00")), created, created,
+        ])
+    copy_insert(
+        Project,
+        [
+            "name", "status", "information", "company_id", "required_funding", "raised_amount",
+            "funded_percent", "subscriber_count", "allocated_share", "created_at", "updated_at",
+        ],
+        rows,
+    )
+    return len(rows), len(done)
+
+
+def _seed_subscriptions(plan, ordinals):
+    ids = _project_ids(plan, ordinals)
+    done = existing_values(Subscription, "project", ids.values())
+    rows = [
+        [plan.user_id(user), ids[ordinal], share, created, created]
+        for ordinal in ordinals if ids[ordinal] not in done
+        for created in [_timestamp(plan.seed, "subscriptions", ordinal)]
+        for user, share in plan.project_subscriptions(ordinal)
+    ]
+    copy_insert(Subscription, ["creator_id", "project_id", "investment_share", "created_at", "updated_at"], rows)
+    return len(rows), len(done)
+
+
+def _seed_portfolios(plan, indices):
+    # Rebuilt on every run; an investor's subscriptions span many chunks
+    investor_ids = [plan.user_id(i) for i in indices]
+    refresh_portfolios(investor_ids)
+    return PortfolioExposure.objects.filter(investor_id__in=investor_ids).count(), 0
+
+
+def _seed_notifications(plan, indices):
+    user_ids = {plan.user_id(i): i for i in indices}
+    done = existing_values(Notification, "user", user_ids)
+    seed = plan.seed
+    types = list(Type.objects.order_by("pk").values_list("pk", "name"))
+    rows = []
+    for user_id, i in user_ids.items():
+        if user_id in done:
+            continue
+        for n in range(plan.notifications):
+            unit = i * plan.notifications + n
+            type_id, name = types[_rand(seed, "notifications", unit, 1) % len(types)]
+            created = _timestamp(seed, "notifications", unit)
+            rows.append([
+                user_id, type_id, f"{name.replace('_', ' ').capitalize()} #{unit}",
+                _rand(seed, "notifications", unit, 2) % 3 == 0, created, created,
+            ])
+    copy_insert(Notification, ["user_id", "type_id", "content", "read", "created_at", "updated_at"], rows)
+    return len(rows), len(done)
+
+
+_WRITERS = {
+    "users": _seed_users,
+    "companies": _seed_companies,
+    "follows": _seed_follows,
+    "projects": _seed_projects,
+    "subscriptions": _seed_subscriptions,
+    "portfolios": _seed_portfolios,
+    "notifications": _seed_notifications,
+}
+
+
+def seed_chunk(plan, dataset, start, stop):
+    """
+    Write the missing units ``start`` to ``stop`` of a dataset in one transaction.
+
+    Returns:
+        tuple: ``(rows written, units already there)``.
+    """
+    with transaction.atomic():
+        return _WRITERS[dataset](plan, range(start, stop))
+
+
+def chunks(plan, dataset, chunk_size):
+    """``(start, stop)`` unit ranges of about ``chunk_size`` rows each."""
+    units, rows_per_unit = plan.units(dataset)
+    if not rows_per_unit:
+        return []
+    step = max(1, chunk_size // rows_per_unit)
+    return [(start, min(start + step, units)) for start in range(0, units, step)]
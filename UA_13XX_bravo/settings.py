@@ -14,6 +14,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 # from logging.handlers import RotatingFileHandler
 from pathlib import Path
 import os
+import sys
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -43,6 +44,7 @@ SIMPLE_JWT = {
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.CustomTokenRefreshSerializer",
 }
 
 PASSWORD_HASHERS = [
@@ -78,7 +80,9 @@ CSRF_TRUSTED_ORIGINS = os.getenv("DJANGO_CSRF_TRUSTED_ORIGINS", "").split(",")
 
 FRONTEND_URL = os.getenv("FRONTEND_URL")
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# Counts the emails in flight for /metrics and sends through EMAIL_DELIVERY_BACKEND
+EMAIL_BACKEND = "UA_13XX_bravo.mail.MeteredEmailBackend"
+EMAIL_DELIVERY_BACKEND = os.getenv("EMAIL_DELIVERY_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
 EMAIL_HOST = os.getenv("EMAIL_HOST")
 email_port_str = os.getenv("EMAIL_PORT")
 if email_port_str is not None:
@@ -93,8 +97,13 @@ DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL")
 
 # Application definition
 
+# Daphne only turns runserver into an ASGI dev server, but importing it
+# installs the Twisted reactor (~0.3s and tens of MB per process); gunicorn,
+# workers and other commands start without it
+RUNSERVER = sys.argv[1:2] == ["runserver"]
+
 INSTALLED_APPS = [
-    "daphne",  # for ASGI server
+    *(["daphne"] if RUNSERVER else []),  # for ASGI runserver
     "channels",  # for runworker and other channels commands
     "django.contrib.admin",
     "django.contrib.auth",
@@ -109,6 +118,7 @@ INSTALLED_APPS = [
     "communications",
     "investments",
     "rest_framework",
+    "django_filters",
     "companies",
     "drf_spectacular",
     "drf_spectacular_sidecar",
@@ -147,6 +157,15 @@ SOCIALACCOUNT_PROVIDERS = {
     }
 }
 
+GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
+GOOGLE_JWKS_URL = os.getenv("GOOGLE_JWKS_URL", "https://www.googleapis.com/oauth2/v3/certs")
+GOOGLE_USERINFO_URL = os.getenv("GOOGLE_USERINFO_URL", "https://www.googleapis.com/oauth2/v2/userinfo")
+GOOGLE_HTTP_TIMEOUT = float(os.getenv("GOOGLE_HTTP_TIMEOUT", "5"))
+# Used when Google's response carries no Cache-Control max-age
+GOOGLE_JWKS_CACHE_SECONDS = int(os.getenv("GOOGLE_JWKS_CACHE_SECONDS", "3600"))
+# Minimum interval between refetches triggered by an unknown key id
+GOOGLE_JWKS_MIN_REFRESH_SECONDS = int(os.getenv("GOOGLE_JWKS_MIN_REFRESH_SECONDS", "60"))
+
 LOGIN_REDIRECT_URL = '/'
 
 ASGI_APPLICATION = "UA_13XX_bravo.asgi.application"
@@ -156,17 +175,32 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
+    # orjson-backed when installed, stdlib json otherwise
+    "DEFAULT_RENDERER_CLASSES": (
+        "UA_13XX_bravo.fastjson.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "UA_13XX_bravo.fastjson.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 SITE_ID = 1
 
 
 MIDDLEWARE = [
+    "UA_13XX_bravo.middleware.RequestIdMiddleware",
+    "UA_13XX_bravo.middleware.MetricsMiddleware",
+    "UA_13XX_bravo.middleware.TracingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "UA_13XX_bravo.middleware.CompressionMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "UA_13XX_bravo.middleware.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
@@ -207,7 +241,83 @@ DATABASES = {
         "PORT": os.getenv("DB_PORT", "5432"),
     }
 }
-DATABASES["default"]["CONN_MAX_AGE"] = 600
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Pooled connections (psycopg 3). Each worker process keeps at most
+# DB_POOL_MAX_SIZE connections, shared by all of its threads and async tasks,
+# instead of one persistent connection per thread.
+DB_POOL_ENABLED = os.getenv("DB_POOL_ENABLED", "True") == "True"
+if DB_POOL_ENABLED:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # required by Django when pooling
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            # Seconds a request waits for a free connection before failing
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            # Recycle idle connections and close ones held too long
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+        },
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "600"))
+
+# Optional read replica for list/search endpoints, see UA_13XX_bravo.db_router
+DB_REPLICA_HOST = os.getenv("DB_REPLICA_HOST")
+if DB_REPLICA_HOST:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": DB_REPLICA_HOST,
+        "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["UA_13XX_bravo.db_router.ReplicaRouter"]
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+# Seconds a client's reads stay on the primary after it writes (replication lag budget)
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+# Maximum rows accepted by the subscription batch endpoint in one request
+SUBSCRIPTION_BATCH_MAX_ROWS = int(os.getenv("SUBSCRIPTION_BATCH_MAX_ROWS", "5000"))
+# Maximum rows accepted by the company and project import endpoints in one request
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", "5000"))
+
+# Startup recommendations (companies.recommendations): recommendations kept
+# per investor, and similar startups kept per startup
+RECOMMENDATIONS_TOP_K = int(os.getenv("RECOMMENDATIONS_TOP_K", "20"))
+RECOMMENDATIONS_NEIGHBOURS = int(os.getenv("RECOMMENDATIONS_NEIGHBOURS", "50"))
+
+# Profile views are buffered per process and written at most this often,
+# or sooner once this many distinct (user, company) pairs are pending
+VIEW_HISTORY_FLUSH_SECONDS = float(os.getenv("VIEW_HISTORY_FLUSH_SECONDS", "5"))
+VIEW_HISTORY_MAX_PENDING = int(os.getenv("VIEW_HISTORY_MAX_PENDING", "1000"))
+# Raw view events younger than this are left for the next aggregation run,
+# so rows still being inserted are never skipped by the watermark
+PROFILE_VIEW_SETTLE_SECONDS = int(os.getenv("PROFILE_VIEW_SETTLE_SECONDS", "60"))
+
+# Rows fetched from the server-side cursor and encoded per chunk by streamed
+# list responses (UA_13XX_bravo.streaming)
+STREAMING_LIST_CHUNK_SIZE = int(os.getenv("STREAMING_LIST_CHUNK_SIZE", "2000"))
+# Incremental exports (UA_13XX_bravo.exports) stop this far behind the clock,
+# so rows of transactions still in flight land in the next export
+EXPORT_SETTLE_SECONDS = int(os.getenv("EXPORT_SETTLE_SECONDS", "5"))
+# Loaded by the prepare_database command (entrypoint.sh) after migrating;
+# paths are relative to BASE_DIR
+STARTUP_FIXTURES = ["notifications/fixtures/type_fixture.json"]
+# Directory of the per-process metrics files (UA_13XX_bravo.metrics) that /metrics
+# sums over all gunicorn workers; unset, a scrape reports the serving process only
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+# /metrics requires "Authorization: Bearer <METRICS_TOKEN>"; unset, it is
+# only served under DEBUG
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+# Span exporter (UA_13XX_bravo.tracing): "file" appends JSON lines to TRACING_FILE,
+# "memory" keeps them for tests; unset, tracing is off
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "")
+TRACING_FILE = os.getenv("TRACING_FILE", os.path.join(LOG_DIR, "traces.jsonl"))
+# Share of traces recorded, decided where a trace starts
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "ua-13xx-bravo")
 
 
 # Password validation
@@ -254,14 +364,26 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Custom settings
 
-# Отримуємо рівень логування з .env (за замовчуванням - DEBUG)
-LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
+# Отримуємо рівень логування з .env (за замовчуванням - DEBUG у розробці, INFO інакше)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG" if DEBUG else "INFO")
 DB_LOG_LEVEL = os.getenv("DB_LOG_LEVEL", "INFO")
 
 # Максимальний розмір логу (5MB) перед ротацією
 MAX_LOG_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 BACKUP_COUNT = 5  # Кількість резервних лог-файлів
 
+# "json" writes one JSON object per record (with the request id); "text" the plain format
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Handlers run on a listener thread behind a bounded queue (UA_13XX_bravo.log);
+# DEBUG and INFO records beyond LOG_QUEUE_SIZE are dropped instead of blocking
+# requests (log_records_dropped_total), warnings and errors are written directly
+LOG_QUEUE_ENABLED = os.getenv("LOG_QUEUE_ENABLED", "True") == "True"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Share of DEBUG records kept, sampled per request; other levels are always kept
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+
+LOGGING_CONFIG = "UA_13XX_bravo.log.configure_logging"
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -274,12 +396,15 @@ LOGGING = {
             "format": "{levelname} {message}",
             "style": "{",
         },
+        "json": {
+            "()": "UA_13XX_bravo.log.JSONFormatter",
+        },
     },
     "handlers": {
         "console": {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
-            "formatter": "simple",
+            "formatter": "json" if LOG_FORMAT == "json" else "simple",
         },
         "file": {
             "level": "WARNING",
@@ -287,7 +412,7 @@ LOGGING = {
             "filename": os.path.join(LOG_DIR, "app.log"),
             "maxBytes": MAX_LOG_FILE_SIZE,
             "backupCount": BACKUP_COUNT,
-            "formatter": "verbose",
+            "formatter": "json" if LOG_FORMAT == "json" else "verbose",
         },
         "error_file": {
             "level": "ERROR",
@@ -295,7 +420,7 @@ LOGGING = {
             "filename": os.path.join(LOG_DIR, "error.log"),
             "maxBytes": MAX_LOG_FILE_SIZE,
             "backupCount": BACKUP_COUNT,
-            "formatter": "verbose",
+            "formatter": "json" if LOG_FORMAT == "json" else "verbose",
         },
         "critical_file": {
             "level": "CRITICAL",
@@ -303,7 +428,7 @@ LOGGING = {
             "filename": os.path.join(LOG_DIR, "critical.log"),
             "maxBytes": MAX_LOG_FILE_SIZE,
             "backupCount": BACKUP_COUNT,
-            "formatter": "verbose",
+            "formatter": "json" if LOG_FORMAT == "json" else "verbose",
         },
     },
     "root": {  # Головний логер, який застосовується до всіх додатків
@@ -0,0 +1,102 @@
+"""
+Container start without redundant work.
+
+``prepare_database`` runs ``migrate`` and ``loaddata`` only when the
+migrations or fixtures shipped with the code differ from what was last
+applied to the database: their digest is compared with the one stored in
+DeploymentState, a single primary-key lookup. Concurrent starts (several
+replicas of a rolling deploy) serialize on a Postgres advisory lock, so
+only one of them migrates.
+
+``warm_up`` runs in the gunicorn master when the app is preloaded: it
+imports the URLconf, and through it every view, closes any database
+connection opened while loading, and freezes the garbage collector so the
+forked workers share the imported modules' memory instead of copying it
+the first time the collector walks them.
+"""
+import gc
+import hashlib
+import importlib.util
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.migrations.loader import MigrationLoader
+
+from .models import DeploymentState
+
+STATE_NAME = "startup"
+# pg_advisory_lock key; any constant no other code locks on
+LOCK_KEY = 0x5354_4152_5455_50
+
+
+def _migration_files():
+    for app_config in apps.get_app_configs():
+        module_name, _ = MigrationLoader.migrations_module(app_config.label)
+        spec = importlib.util.find_spec(module_name) if module_name else None
+        if spec is None or not spec.submodule_search_locations:
+            continue
+        for location in spec.submodule_search_locations:
+            for path in sorted(Path(location).glob("*.py")):
+                yield f"{app_config.label}/{path.name}", path
+
+
+def fixture_paths():
+    return [Path(settings.BASE_DIR) / fixture for fixture in settings.STARTUP_FIXTURES]
+
+
+def state_digest():
+    """SHA-256 of every installed app's migration files and of the startup fixtures."""
+    digest = hashlib.sha256()
+    files = [*_migration_files(), *((str(path), path) for path in fixture_paths())]
+    for name, path in files:
+        digest.update(name.encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def applied_digest(using="default"):
+    """The digest stored by the last successful prepare, or None (also before the first migrate)."""
+    try:
+        return (
+            DeploymentState.objects.using(using).filter(name=STATE_NAME).values_list("digest", flat=True).first()
+        )
+    except DatabaseError:
+        return None
+
+
+def record_digest(digest, using="default"):
+    DeploymentState.objects.using(using).update_or_create(name=STATE_NAME, defaults={"digest": digest})
+
+
+class advisory_lock:
+    """Session-level Postgres advisory lock, held for the ``with`` block."""
+
+    def __init__(self, key=LOCK_KEY, using="default"):
+        self.key = key
+        self.connection = connections[using]
+
+    def __enter__(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(%s)", [self.key])
+        return self
+
+    def __exit__(self, *exc_info):
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [self.key])
+
+
+def warm_up():
+    """Prepare a preloaded app for forking workers (see the module docstring)."""
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns  # imports every urls module and view
+    # Workers must not share sockets with the master or each other
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+        connection.close_pool()
+    gc.collect()
+    gc.freeze()
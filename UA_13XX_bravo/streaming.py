@@ -0,0 +1,86 @@
+"""
+Streamed JSON list responses for large unpaginated endpoints.
+
+StreamingListMixin replaces a viewset's ``list`` with a response that
+reads rows from a server-side cursor (``.iterator(chunk_size=...)``) and
+encodes them one chunk at a time, so memory use does not grow with the
+result and the first bytes go out before the last row is read. The body
+is the same JSON array the regular list returns. Compression is left to
+CompressionMiddleware, which compresses streamed bodies chunk by chunk.
+
+Under ASGI Django would drain a sync body into a list before sending
+it, so ``streaming_body`` hands ASGI requests an async iterator that
+fetches one piece at a time in the request's sync thread (the one that
+holds its database connection and server-side cursor).
+"""
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+from .fastjson import FastJSONRenderer
+from .fieldsets import SparseFieldsetMixin
+
+
+def encode_json_array(items, chunk_size):
+    """Yield ``items`` as one JSON array, ``chunk_size`` items per piece."""
+    renderer = FastJSONRenderer()
+    items = iter(items)
+    yield b"["
+    separator = b""
+    while chunk := list(islice(items, chunk_size)):
+        # Render the chunk as an array and drop its brackets
+        yield separator + renderer.render(chunk)[1:-1]
+        separator = b","
+    yield b"]"
+
+
+async def iterate_in_thread(iterator):
+    """Async iterator over a sync ``iterator``, one thread-sensitive hop per item."""
+    get_next = sync_to_async(next)
+    done = object()
+    try:
+        while (item := await get_next(iterator, done)) is not done:
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:  # e.g. the client went away: release the cursor
+            await sync_to_async(close)()
+
+
+def streaming_body(request, blocks):
+    """``blocks`` (a sync iterator) as a streamed body suited to the server ``request`` came from."""
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        return iterate_in_thread(iter(blocks))
+    return blocks
+
+
+class StreamingJSONListResponse(StreamingHttpResponse):
+    def __init__(self, items, chunk_size=None, request=None, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        chunk_size = chunk_size or settings.STREAMING_LIST_CHUNK_SIZE
+        super().__init__(streaming_body(request, encode_json_array(items, chunk_size)), **kwargs)
+
+
+class StreamingListMixin(SparseFieldsetMixin):
+    """
+    Viewset mixin: stream ``list`` through the lean serializer.
+
+    Only JSON responses without pagination are streamed; other renderers
+    (e.g. the browsable API) get the regular list.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None or request.accepted_renderer.format != "json":
+            return super().list(request, *args, **kwargs)
+
+        lean = self.lean_serializer_class(self.get_requested_fields())
+        queryset = self.filter_queryset(self.get_queryset())
+        # Resolve the database now: the rows are read after the view returned,
+        # outside the request's routing context
+        queryset = queryset.using(queryset.db).values(*lean.columns)
+        chunk_size = settings.STREAMING_LIST_CHUNK_SIZE
+        rows = queryset.iterator(chunk_size=chunk_size)
+        return StreamingJSONListResponse(lean.iter_serialize(rows), chunk_size, request=request)
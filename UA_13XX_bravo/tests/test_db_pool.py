@@ -0,0 +1,30 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from users.models import User
+
+
+@pytest.mark.django_db
+def test_default_database_is_pooled():
+    assert connection.pool is not None
+    assert connection.settings_dict["CONN_MAX_AGE"] == 0
+    assert connection.settings_dict["CONN_HEALTH_CHECKS"]
+
+
+@pytest.mark.django_db
+def test_pool_stats_visible_to_staff_only(settings):
+    client = APIClient()
+    user = User.objects.create_user(email="user@example.com", password="StrongPass123!")
+    client.force_authenticate(user=user)
+    assert client.get(reverse("db-pool-stats")).status_code == 403
+
+    admin = User.objects.create_superuser(email="admin@example.com", password="StrongPass123!")
+    client.force_authenticate(user=admin)
+    response = client.get(reverse("db-pool-stats"))
+
+    assert response.status_code == 200
+    stats = response.data["default"]
+    assert stats["pool_max"] == settings.DATABASES["default"]["OPTIONS"]["pool"]["max_size"]
+    assert stats["pool_size"] <= stats["pool_max"]
@@ -0,0 +1,177 @@
+import csv
+import io
+import json
+import warnings
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from UA_13XX_bravo import views
+from UA_13XX_bravo.exports import export
+from companies.models import CompanyFollowers, CompanyProfile, CompanyType
+from investments.models import Subscription
+from projects.models import Project, ProjectStatus
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def no_settle(settings):
+    settings.EXPORT_SETTLE_SECONDS = 0
+
+
+@pytest.fixture
+def projects(db):
+    company = CompanyProfile.objects.create(
+        company_name="Acme", description='Says "hi",\nthen leaves', type=CompanyType.STARTUP
+    )
+    return [
+        Project.objects.create(
+            name=f"P{i}", status=ProjectStatus.ACTIVE, information="", company=company,
+            required_funding=Decimal("1000"), raised_amount=Decimal("12.5") * i,
+        )
+        for i in range(3)
+    ]
+
+
+def read(name, file_format, **kwargs):
+    blocks, until = export(name, file_format, **kwargs)
+    data = b"".join(blocks).decode()
+    if file_format == "csv":
+        return list(csv.DictReader(io.StringIO(data))), until
+    return [json.loads(line) for line in data.splitlines()], until
+
+
+def by_id(rows):
+    return sorted(rows, key=lambda row: int(row["id"]))
+
+
+def test_copy_and_cursor_exports_agree(projects):
+    copied, _ = read("projects", "csv")
+    cursor, _ = read("projects", "csv", use_copy=False)
+    ndjson, _ = read("projects", "ndjson", chunk_size=2)
+
+    assert by_id(copied) == by_id(cursor)
+    assert [{key: str(value) for key, value in row.items()} for row in by_id(ndjson)] == by_id(copied)
+    first = by_id(ndjson)[0]
+    assert first["raised_amount"] == "0.00"
+    assert datetime.fromisoformat(first["created_at"]) == projects[0].created_at  # Postgres drops trailing zeros
+
+
+def test_csv_quotes_text(projects):
+    rows, _ = read("companies", "csv")
+
+    assert rows[0]["description"] == 'Says "hi",\nthen leaves'
+
+
+def test_incremental_export(projects):
+    rows, until = read("projects", "ndjson")
+    assert len(rows) == 3
+
+    projects[1].information = "changed"
+    projects[1].save()
+    rows, _ = read("projects", "ndjson", since=until)
+
+    assert [row["id"] for row in rows] == [projects[1].id]
+
+
+def test_incremental_export_includes_changed_subscription_totals(projects):
+    _, until = read("projects", "ndjson")
+    investor = User.objects.create_user(email="investor@example.com", password="pass")
+
+    Subscription.objects.create(creator=investor, project=projects[2], investment_share=Decimal("10.00"))
+    rows, until = read("projects", "ndjson", since=until)
+    assert [(row["id"], row["subscriber_count"], row["allocated_share"]) for row in rows] == [
+        (projects[2].id, 1, "10.00"),
+    ]
+
+    Subscription.objects.filter(project=projects[2]).delete()
+    rows, _ = read("projects", "ndjson", since=until)
+    assert [(row["id"], row["subscriber_count"]) for row in rows] == [(projects[2].id, 0)]
+
+
+def test_follows_export(projects):
+    investor = CompanyProfile.objects.create(company_name="Fund", description="", type=CompanyType.ENTERPRISE)
+    CompanyFollowers.objects.create(investor=investor, startup=projects[0].company)
+
+    rows, _ = read("follows", "csv")
+
+    assert rows == [{
+        "id": rows[0]["id"], "investor_id": str(investor.id), "startup_id": str(projects[0].company_id),
+        "created_at": rows[0]["created_at"],
+    }]
+
+
+def test_command_with_watermark_file(projects, tmp_path):
+    output, watermark = tmp_path / "projects.csv", tmp_path / "projects.watermark"
+
+    call_command("export_data", "projects", "--output", output, "--watermark-file", watermark)
+    assert len(output.read_text().splitlines()) == 4
+    assert watermark.read_text()
+
+    call_command("export_data", "projects", "--output", output, "--watermark-file", watermark)
+    assert output.read_text().splitlines() == [
+        "id,company_id,name,status,information,required_funding,raised_amount,"
+        "funded_percent,subscriber_count,allocated_share,created_at,updated_at"
+    ]
+
+
+def test_export_endpoint(projects):
+    client = APIClient()
+    url = reverse("data-export", args=["projects", "ndjson"])
+
+    client.force_authenticate(User.objects.create_user(email="analyst@example.com", password="pass"))
+    assert client.get(url).status_code == 403
+
+    client.force_authenticate(User.objects.create_superuser(email="admin@example.com", password="pass"))
+    response = client.get(url, HTTP_ACCEPT="application/x-ndjson")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert len(b"".join(response.streaming_content).splitlines()) == 3
+
+    response = client.get(url, {"since": response["X-Export-Watermark"]})
+    assert b"".join(response.streaming_content) == b""
+
+    assert client.get(url, {"since": "yesterday"}).status_code == 400
+    assert client.get(reverse("data-export", args=["users", "csv"])).status_code == 404
+
+
+def test_export_endpoint_streams_under_asgi(projects, monkeypatch):
+    produced = []
+
+    def counting_export(*args, **kwargs):
+        blocks, until = export(*args, **kwargs)
+
+        def counted():
+            for block in blocks:
+                produced.append(block)
+                yield block
+
+        return counted(), until
+
+    monkeypatch.setattr(views, "export", counting_export)
+    admin = User.objects.create_superuser(email="admin@example.com", password="pass")
+    headers = {"Authorization": f"Bearer {AccessToken.for_user(admin)}"}
+
+    async def get():
+        response = await AsyncClient().get(reverse("data-export", args=["projects", "csv"]), headers=headers)
+        pieces = aiter(response.streaming_content)
+        header = await anext(pieces)
+        # The rows are only read once the header went out
+        assert produced == [header]
+        return response, header + b"".join([piece async for piece in pieces])
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings("error", message="StreamingHttpResponse must consume synchronous iterators")
+        response, body = async_to_sync(get)()
+
+    assert response.is_async
+    assert len(body.splitlines()) == 4
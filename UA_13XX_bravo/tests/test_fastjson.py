@@ -0,0 +1,69 @@
+import io
+import json
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from UA_13XX_bravo import fastjson
+from UA_13XX_bravo.fastjson import FastJSONParser, FastJSONRenderer
+
+PAYLOAD = {
+    "results": ReturnList(
+        [OrderedDict(id=1, name="Київ   line", funding=Decimal("12.50"))], serializer=None
+    ),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "at": datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    "day": date(2025, 3, 1),
+    "time": time(8, 15),
+    "took": timedelta(seconds=90),
+    "label": gettext_lazy("Company"),
+    "big": 2 ** 70,
+    "empty": None,
+    1: "non-string key",
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(fastjson, "orjson", None)
+    elif fastjson.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_renderer_matches_drf(backend):
+    assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+
+def test_renderer_indent_and_empty_body(backend):
+    renderer = FastJSONRenderer()
+
+    assert renderer.render(None) == b""
+    indented = renderer.render({"a": 1}, "application/json; indent=2")
+    assert indented == JSONRenderer().render({"a": 1}, "application/json; indent=2")
+
+
+def test_parser_matches_drf(backend):
+    body = json.dumps({"name": "Київ", "rows": [1, 2.5, None, True]}).encode()
+
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(b'{"name": '))
+
+
+def test_codec_round_trip(backend):
+    text = fastjson.dumps_text({"message": "hi", "sender": "a@example.com"})
+
+    assert text == '{"message":"hi","sender":"a@example.com"}'
+    assert fastjson.loads(text) == {"message": "hi", "sender": "a@example.com"}
+    with pytest.raises(json.JSONDecodeError):
+        fastjson.loads("not json")
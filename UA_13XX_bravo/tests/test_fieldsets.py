@@ -0,0 +1,113 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from companies.models import CompanyProfile, CompanyType
+from companies.serializers import CompanyProfileListSerializer, CompanyProfileSerializer
+from notifications.models import Entity, Notification, Type
+from notifications.serializers import NotificationListSerializer, NotificationSerializer
+from projects.models import Project, ProjectStatus
+from projects.serializers import ProjectLeanListSerializer, ProjectListSerializer
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(email="lean@example.com", password="pass")
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def companies(db):
+    return [
+        CompanyProfile.objects.create(
+            company_name="Acme", description="Rockets", type=CompanyType.STARTUP,
+            industry="Space", company_size=12, required_funding=Decimal("1500000.50"),
+            phone_number="+380501234567", website="https://acme.example",
+        ),
+        CompanyProfile.objects.create(company_name="Bare", description="", type=CompanyType.ENTERPRISE),
+    ]
+
+
+def lean(serializer_class, queryset):
+    serializer = serializer_class()
+    return serializer.serialize(queryset.values(*serializer.columns))
+
+
+def test_lean_serializers_match_model_serializers(user, companies):
+    Project.objects.create(
+        name="Orbit", status=ProjectStatus.ACTIVE, information="", company=companies[0],
+        required_funding=Decimal("1000"), raised_amount=Decimal("250.5"),
+    )
+    push = Type.objects.create(name="Push")
+    Notification.objects.create(user=user, type=push, content="Hi", entity=Entity.objects.create(name="Acme"))
+    Notification.objects.create(user=user, type=push, content="Bye")
+
+    for model_serializer, lean_serializer, queryset in [
+        (CompanyProfileSerializer, CompanyProfileListSerializer, CompanyProfile.objects.order_by("id")),
+        (ProjectListSerializer, ProjectLeanListSerializer, Project.objects.order_by("id")),
+        (NotificationSerializer, NotificationListSerializer, Notification.objects.order_by("id")),
+    ]:
+        expected = [dict(item) for item in model_serializer(queryset, many=True).data]
+        assert lean(lean_serializer, queryset) == expected
+        assert list(lean_serializer.declared_fields) == list(expected[0])
+
+
+def test_list_fields_limit_keys_and_columns(client, companies):
+    url = reverse("companyprofile-list")
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {"fields": "id,company_name"})
+
+    assert response.status_code == 200
+    assert response.data["count"] == 2
+    assert response.data["results"] == [
+        {"id": companies[0].id, "company_name": "Acme"},
+        {"id": companies[1].id, "company_name": "Bare"},
+    ]
+    page_query = queries.captured_queries[-1]["sql"]
+    assert "description" not in page_query
+    assert "company_name" in page_query
+
+
+def test_list_without_fields_returns_everything(client, companies):
+    response = client.get(reverse("companyprofile-list"), {"ordering": "company_name"})
+
+    assert response.status_code == 200
+    assert response.data["results"][0] == dict(CompanyProfileSerializer(companies[0]).data)
+
+
+def test_unknown_field_is_rejected(client, companies):
+    response = client.get(reverse("companyprofile-list"), {"fields": "id,secret"})
+
+    assert response.status_code == 400
+    assert "secret" in str(response.data["fields"])
+
+
+def test_retrieve_honours_fields(client, user):
+    notification = Notification.objects.create(
+        user=user, type=Type.objects.create(name="Email"), content="Hi",
+        entity=Entity.objects.create(name="Acme"),
+    )
+    url = reverse("notification-detail", args=[notification.id])
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {"fields": "id,content"})
+
+    assert response.status_code == 200
+    assert response.data == {"id": notification.id, "content": "Hi"}
+    assert "read" not in queries.captured_queries[-1]["sql"]
+
+    response = client.get(url, {"fields": "entity,type"})
+    assert response.data == {"entity": {"id": notification.entity_id, "name": "Acme"}, "type": "Email"}
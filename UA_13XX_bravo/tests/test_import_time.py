@@ -0,0 +1,44 @@
+import pytest
+
+from UA_13XX_bravo.importtime import by_package, parse_importtime, profile_startup
+
+# Only needed by rarely used views or by runserver; see users.views, users.utils
+# and the RUNSERVER setting
+LAZY_MODULES = {"argon2", "httpx", "users.google", "daphne.server", "twisted.internet"}
+# Generous: a worker imports in about 0.6s on a laptop
+BUDGET_MS = 2000
+
+REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     zipimport
+import time:       300 |        420 |   users.utils
+import time:        80 |        500 | users
+import time:      1000 |       1000 | django.urls
+"""
+
+
+@pytest.fixture(scope="module")
+def startup_imports():
+    return profile_startup()
+
+
+def test_rarely_used_dependencies_are_imported_lazily(startup_imports):
+    imported = {record.module for record in startup_imports}
+
+    assert "users.views" in imported
+    assert not imported & LAZY_MODULES
+
+
+def test_startup_imports_stay_within_budget(startup_imports):
+    total_ms = sum(record.self_us for record in startup_imports) / 1000
+
+    assert total_ms < BUDGET_MS
+
+
+def test_report_is_folded_per_package():
+    records = parse_importtime(REPORT)
+
+    assert [(record.module, record.depth) for record in records] == [
+        ("zipimport", 2), ("users.utils", 1), ("users", 0), ("django.urls", 0),
+    ]
+    assert by_package(records) == {"django": (1000, 1), "users": (380, 2), "zipimport": (120, 1)}
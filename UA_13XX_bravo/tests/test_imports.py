@@ -0,0 +1,103 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from companies.models import CompanyProfile, CompanyType
+from projects.models import Project
+from projects.utils import bulk_create_projects
+from UA_13XX_bravo.imports import run_import_batch
+
+User = get_user_model()
+
+
+@pytest.fixture
+def company(db):
+    return CompanyProfile.objects.create(company_name="Acme", description="", type=CompanyType.STARTUP)
+
+
+def project(company, name, **extra):
+    return {
+        "company": company.id, "name": name, "status": "active", "information": "Info",
+        "required_funding": "1000", **extra,
+    }
+
+
+def test_projects_are_created_with_maintained_fields(company, django_assert_max_num_queries):
+    with django_assert_max_num_queries(7):
+        results = bulk_create_projects([project(company, "Orbit", raised_amount="250"), project(company, "Moon")])
+
+    assert [result["status"] for result in results] == ["created", "created"]
+    orbit = Project.objects.get(pk=results[0]["id"])
+    assert orbit.funded_percent == Decimal("25.00")
+    assert orbit.subscriber_count == 0
+    assert Project.objects.get(pk=results[1]["id"]).raised_amount == Decimal("0.00")
+
+
+def test_invalid_projects_are_reported(company):
+    Project.objects.create(name="Taken", status="active", information="", company=company, required_funding=1)
+
+    results = bulk_create_projects([
+        project(company, "Taken"),
+        project(company, "Over", raised_amount="1001"),
+        {**project(company, "Lost"), "company": 999999},
+        {"name": "Bad", "status": "paused", "required_funding": "-1"},
+        project(company, "Fine"),
+    ])
+
+    assert [result["status"] for result in results] == ["invalid"] * 4 + ["created"]
+    assert results[0]["errors"] == {"name": "project with this name already exists."}
+    assert results[1]["errors"] == {"raised_amount": "Raised amount cannot be greater than required funding."}
+    assert results[2]["errors"] == {"company": "Company not found."}
+    assert set(results[3]["errors"]) == {"status", "information", "company", "required_funding"}
+
+
+def test_import_projects_command(company, tmp_path, capsys):
+    path = tmp_path / "projects.csv"
+    path.write_text(
+        "company,name,status,information,required_funding,raised_amount\n"
+        f"{company.id},A,active,Info,100,\n"
+        f"{company.id},B,completed,Info,100,100\n"
+        f"{company.id},A,active,Info,100,\n"
+    )
+
+    call_command("import_projects", path, "--batch-size", 2)
+
+    assert set(Project.objects.values_list("name", flat=True)) == {"A", "B"}
+    assert "Imported 2 projects, 1 rows failed." in capsys.readouterr().out
+
+
+def test_import_projects_endpoint(company):
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(email="admin@example.com", password="pass", is_staff=True))
+
+    response = client.post(
+        reverse("projects:projects-bulk-import"),
+        {"rows": [project(company, "Orbit")], "dry_run": True},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert response.data["results"] == [{"row": 0, "status": "valid"}]
+    assert not Project.objects.exists()
+
+
+attempts = []
+
+
+def conflicting_import(rows, dry_run):
+    attempts.append(rows)
+    if len(attempts) == 1:
+        raise IntegrityError("duplicate key value violates unique constraint")
+    return [{"row": 0, "status": "invalid", "errors": {"name": "project with this name already exists."}}]
+
+
+def test_batch_that_lost_a_race_is_retried():
+    results = run_import_batch(f"{__name__}.conflicting_import", [{"name": "A"}], {"dry_run": False})
+
+    assert len(attempts) == 2
+    assert results[0]["status"] == "invalid"
@@ -0,0 +1,138 @@
+import json
+import logging
+import sys
+from queue import Queue
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from UA_13XX_bravo import metrics
+from UA_13XX_bravo.log import (
+    BoundedQueueHandler,
+    DebugSamplingFilter,
+    JSONFormatter,
+    LogPipeline,
+    get_pipeline,
+    request_id,
+)
+from UA_13XX_bravo.middleware import RequestIdMiddleware
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord("app", level, __file__, 10, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_writes_message_request_id_and_extras():
+    record = make_record(request_id="abc", company_id=7, amount=object())
+
+    entry = json.loads(JSONFormatter().format(record))
+
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app"
+    assert entry["request_id"] == "abc"
+    assert entry["company_id"] == 7
+    assert entry["amount"].startswith("<object")
+
+
+def test_json_formatter_includes_exception():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("app", logging.ERROR, __file__, 10, "failed", (), sys.exc_info())
+
+    entry = json.loads(JSONFormatter().format(record))
+
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_middleware_sets_request_id_and_header():
+    seen = {}
+
+    def view(request):
+        seen["id"] = request_id.get()
+        return HttpResponse()
+
+    middleware = RequestIdMiddleware(view)
+    response = middleware(RequestFactory().get("/", HTTP_X_REQUEST_ID="edge-42"))
+    generated = middleware(RequestFactory().get("/", HTTP_X_REQUEST_ID="bad id\n"))
+
+    assert seen["id"] == generated["X-Request-ID"] != "bad id\n"
+    assert response["X-Request-ID"] == "edge-42"
+    assert request_id.get() is None
+
+
+def test_debug_records_are_sampled_per_request():
+    sampling = DebugSamplingFilter(0.5)
+    kept = {
+        rid: sampling.filter(make_record(logging.DEBUG, request_id=rid))
+        for rid in (f"request-{i}" for i in range(400))
+    }
+
+    assert 120 < sum(kept.values()) < 280
+    # Every record of a request gets the same decision
+    assert all(sampling.filter(make_record(logging.DEBUG, request_id=rid)) == keep for rid, keep in kept.items())
+    assert all(sampling.filter(make_record(logging.WARNING, request_id=rid)) for rid in kept)
+
+
+def test_pipeline_delivers_prepared_records_on_listener_thread():
+    target = ListHandler()
+    pipeline = LogPipeline([target], queue_size=100, debug_sample_rate=1.0)
+    pipeline.start()
+    token = request_id.set("req-1")
+    try:
+        pipeline.queue_handler.handle(make_record(args=({"not": "copied"},)))
+    finally:
+        request_id.reset(token)
+        pipeline.stop()
+
+    [record] = target.records
+    assert record.getMessage() == "hello {'not': 'copied'}"
+    assert record.args is None
+    assert record.request_id == "req-1"
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = BoundedQueueHandler(Queue(2))
+
+    for _ in range(5):
+        handler.handle(make_record())
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_full_queue_keeps_warnings(settings, monkeypatch):
+    settings.METRICS_DIR = ""
+    monkeypatch.setattr(metrics, "_stores", {})
+    monkeypatch.setattr(metrics, "_stores_pid", None)
+    target = ListHandler()
+    handler = BoundedQueueHandler(Queue(1), fallback=[target])
+
+    for level in (logging.INFO, logging.INFO, logging.DEBUG, logging.ERROR, logging.CRITICAL):
+        handler.handle(make_record(level))
+
+    assert [record.levelno for record in target.records] == [logging.ERROR, logging.CRITICAL]
+    assert handler.dropped == 2
+    assert metrics.collect()["log_records_dropped_total"] == [((), 2.0)]
+
+
+@pytest.mark.skipif(get_pipeline() is None, reason="LOG_QUEUE_ENABLED is off")
+def test_root_logger_writes_through_the_queue():
+    root = logging.getLogger()
+    pipeline = get_pipeline()
+
+    assert pipeline.queue_handler in root.handlers
+    assert not set(pipeline.handlers) & set(root.handlers)
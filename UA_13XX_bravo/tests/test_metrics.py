@@ -0,0 +1,120 @@
+import multiprocessing
+
+import pytest
+from django.core import mail
+from django.core.mail import get_connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from UA_13XX_bravo import metrics
+from UA_13XX_bravo.metrics import Counter, Gauge, Histogram, collect, mark_process_dead, render
+from UA_13XX_bravo.middleware import MetricsMiddleware
+from companies.views import ListFollowedStartupsView
+
+
+@pytest.fixture(autouse=True)
+def metrics_dir(settings, tmp_path, monkeypatch):
+    settings.METRICS_DIR = str(tmp_path)
+    monkeypatch.setattr(metrics, "_stores", {})
+    monkeypatch.setattr(metrics, "_stores_pid", None)
+    monkeypatch.setattr(metrics, "REGISTRY", [])
+    return tmp_path
+
+
+def work_in_child(counter, gauge):
+    counter.inc(2)
+    gauge.inc()
+
+
+def test_values_are_summed_over_processes(metrics_dir):
+    counter = Counter("jobs_total", "Jobs.")
+    gauge = Gauge("busy", "Busy workers.")
+    counter.inc()
+    gauge.inc()
+
+    child = multiprocessing.get_context("fork").Process(target=work_in_child, args=(counter, gauge))
+    child.start()
+    child.join()
+
+    assert "jobs_total 3.0" in render()
+    assert "busy 2.0" in render()
+    mark_process_dead(child.pid, str(metrics_dir))
+    assert "jobs_total 3.0\n" in render()
+    assert "busy 1.0\n" in render()
+
+
+def test_values_file_grows_and_is_reread(metrics_dir):
+    counter = Counter("requests_total", "Requests.", ("path",))
+    for i in range(3000):
+        counter.labels(path=f"/item/{i}/").inc(i)
+
+    metrics._stores_pid = None  # as a restarted process with the same pid
+    counter.labels(path="/item/2999/").inc()
+
+    samples = dict(collect()["requests_total"])
+    assert len(samples) == 3000
+    assert samples[(("path", "/item/2999/"),)] == 3000
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency.", ("view",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.5, 5):
+        histogram.labels(view='Say "hi"').observe(value)
+
+    assert render().splitlines()[2:] == [
+        'latency_seconds_bucket{view="Say \\"hi\\"",le="0.1"} 1.0',
+        'latency_seconds_bucket{view="Say \\"hi\\"",le="1.0"} 3.0',
+        'latency_seconds_bucket{view="Say \\"hi\\"",le="+Inf"} 4.0',
+        'latency_seconds_sum{view="Say \\"hi\\""} 6.05',
+        'latency_seconds_count{view="Say \\"hi\\""} 4.0',
+    ]
+
+
+def test_middleware_times_requests_by_view(monkeypatch):
+    monkeypatch.setattr(metrics, "REGISTRY", [metrics.REQUEST_DURATION])
+    view = ListFollowedStartupsView.as_view()
+
+    def get_response(request):
+        middleware.process_view(request, view, (), {})
+        return HttpResponse(status=204)
+
+    middleware = MetricsMiddleware(get_response)
+    middleware(RequestFactory().get("/"))
+    MetricsMiddleware(lambda request: HttpResponse(status=404))(RequestFactory().generic("BREW", "/"))
+
+    output = render()
+    assert 'http_request_duration_seconds_count{view="ListFollowedStartupsView",method="GET",status="204"} 1.0' in output
+    assert 'http_request_duration_seconds_count{view="unresolved",method="other",status="404"} 1.0' in output
+
+
+def test_endpoint_reports_queries_and_requires_token(client, settings, django_user_model, monkeypatch):
+    monkeypatch.setattr(metrics, "REGISTRY", [metrics.DB_QUERY_DURATION])
+    settings.METRICS_TOKEN = "secret"
+    django_user_model.objects.count()
+
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert 'db_query_duration_seconds_count{alias="default"}' in response.content.decode()
+
+
+def test_endpoint_is_closed_without_token(client, settings):
+    settings.METRICS_TOKEN = ""
+
+    assert client.get("/metrics").status_code == 403
+    settings.DEBUG = True
+    assert client.get("/metrics").status_code == 200
+
+
+def test_email_backend_counts_outbox(settings):
+    settings.EMAIL_DELIVERY_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    connection = get_connection("UA_13XX_bravo.mail.MeteredEmailBackend")
+
+    mail.EmailMessage("Hi", "Body", "from@example.com", ["to@example.com"], connection=connection).send()
+
+    samples = collect()
+    assert len(mail.outbox) == 1
+    assert samples["email_outbox_depth"] == [((), 0.0)]
+    assert samples["emails_total"] == [((("result", "sent"),), 1.0)]
@@ -0,0 +1,84 @@
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from UA_13XX_bravo.db_router import ReplicaRouter, replica_reads
+from UA_13XX_bravo.middleware import PRIMARY_PIN_COOKIE, ReplicaRoutingMiddleware
+from companies.views import ListFollowedStartupsView
+from projects.models import Project
+from projects.views import ProjectViewSet
+
+
+@pytest.fixture(autouse=True)
+def replica(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.REPLICA_STICKY_SECONDS = 5
+
+
+def route(request, view, status=200):
+    """Run the middleware around ``view`` and return (alias used for reads, response)."""
+    seen = {}
+
+    def get_response(request):
+        middleware.process_view(request, view, (), {})
+        seen["db"] = Project.objects.all().db
+        return HttpResponse(status=status)
+
+    middleware = ReplicaRoutingMiddleware(get_response)
+    response = middleware(request)
+    return seen["db"], response
+
+
+def test_router_reads_from_replica_only_when_enabled():
+    router = ReplicaRouter()
+
+    assert Project.objects.all().db == "default"
+    with replica_reads():
+        assert Project.objects.all().db == "replica"
+        assert router.db_for_write(Project) == "default"
+    assert Project.objects.all().db == "default"
+
+    assert router.allow_migrate("replica", "projects") is False
+    assert router.allow_migrate("default", "projects") is None
+
+
+def test_router_without_replicas_uses_default(settings):
+    settings.DATABASE_REPLICAS = []
+    with replica_reads():
+        assert Project.objects.all().db == "default"
+
+
+@pytest.mark.parametrize(
+    "view, method, expected",
+    [
+        (ProjectViewSet.as_view({"get": "list"}), "get", "replica"),
+        (ProjectViewSet.as_view({"get": "retrieve"}), "get", "default"),
+        (ListFollowedStartupsView.as_view(), "get", "replica"),
+        (ProjectViewSet.as_view({"post": "create"}), "post", "default"),
+    ],
+)
+def test_middleware_routes_opted_in_actions(view, method, expected):
+    request = getattr(RequestFactory(), method)("/")
+
+    db, _ = route(request, view)
+
+    assert db == expected
+
+
+def test_write_pins_following_reads_to_primary():
+    factory = RequestFactory()
+
+    _, response = route(factory.post("/"), ProjectViewSet.as_view({"post": "create"}), status=201)
+    cookie = response.cookies[PRIMARY_PIN_COOKIE]
+    assert cookie["max-age"] == 5
+
+    request = factory.get("/")
+    request.COOKIES[PRIMARY_PIN_COOKIE] = cookie.value
+    db, _ = route(request, ProjectViewSet.as_view({"get": "list"}))
+    assert db == "default"
+
+
+def test_failed_write_does_not_pin():
+    _, response = route(RequestFactory().post("/"), ProjectViewSet.as_view({"post": "create"}), status=400)
+
+    assert PRIMARY_PIN_COOKIE not in response.cookies
@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count, Sum
+
+from companies.models import CompanyFollowers, CompanyProfile, UserToCompany
+from investments.models import PortfolioExposure, Subscription
+from notifications.models import Notification, Type
+from projects.models import Project
+from UA_13XX_bravo.seeding import SeedPlan, chunks, seed_chunk
+from users.models import User
+
+SCALE = ["--users", "40", "--companies", "25", "--follows", "3", "--projects", "2", "--subscriptions", "2",
+         "--notifications", "2"]
+
+
+@pytest.fixture
+def types(db):
+    Type.objects.bulk_create([Type(name="new_follower"), Type(name="new_post")])
+
+
+def follows():
+    return set(CompanyFollowers.objects.values_list("investor__company_name", "startup__company_name"))
+
+
+def test_seeds_every_dataset(types, capsys):
+    call_command("seed_perf_data", *SCALE, "--chunk-size", "10")
+
+    assert User.objects.count() == 40
+    assert CompanyProfile.objects.count() == UserToCompany.objects.count() == 25
+    # 17 startups with 2 projects each, followed 3 times by each of the 8 investors
+    assert CompanyProfile.objects.filter(type="startup").count() == 17
+    assert CompanyFollowers.objects.count() == 24
+    assert Project.objects.count() == 34
+    assert Subscription.objects.count() == 68
+    assert Notification.objects.count() == 80
+    assert "Seed 1 done" in capsys.readouterr().out
+
+    # Maintained aggregates agree with the seeded subscriptions
+    for project in Project.objects.annotate(count=Count("subscriptions"), share=Sum("subscriptions__investment_share")):
+        assert project.subscriber_count == project.count
+        assert project.allocated_share == project.share <= Decimal("100")
+    assert PortfolioExposure.objects.aggregate(total=Sum("project_count"))["total"] == 68
+
+
+def test_rerun_resumes_with_the_same_rows(types, capsys):
+    call_command("seed_perf_data", *SCALE, "--chunk-size", "10")
+    seeded = follows()
+    CompanyFollowers.objects.filter(investor__company_name__in=["Seed 1 company 16", "Seed 1 company 17"]).delete()
+    capsys.readouterr()
+
+    call_command("seed_perf_data", *SCALE, "--chunk-size", "6")
+
+    assert follows() == seeded
+    out = capsys.readouterr().out
+    assert "users: 0 rows written, 40 of 40 units already there." in out
+    assert "follows: 6 rows written, 6 of 8 units already there." in out
+    assert User.objects.count() == 40
+
+
+def test_values_do_not_depend_on_chunking(db):
+    plan = SeedPlan(seed=3, users=20, companies=10, notifications=0)
+    seed_chunk(plan, "users", 5, 12)
+    for start, stop in chunks(plan, "users", 7):
+        seed_chunk(plan, "users", start, stop)
+
+    assert set(User.objects.values_list("id", "email")) == {(plan.user_id(i), plan.email(i)) for i in range(20)}
+    assert chunks(plan, "follows", 12) == [(0, 2), (2, 4)]
+
+
+def test_companies_need_owners(db):
+    with pytest.raises(CommandError, match="cannot exceed --users"):
+        call_command("seed_perf_data", "--users", "1", "--companies", "2")
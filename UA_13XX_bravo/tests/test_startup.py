@@ -0,0 +1,49 @@
+import gc
+import sys
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from UA_13XX_bravo.models import DeploymentState
+from UA_13XX_bravo.startup import state_digest, warm_up
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    called = []
+    monkeypatch.setattr(
+        "UA_13XX_bravo.management.commands.prepare_database.call_command",
+        lambda name, *args, **kwargs: called.append(name),
+    )
+    return called
+
+
+def test_prepares_once_per_digest(db, commands, capsys):
+    call_command("prepare_database")
+    call_command("prepare_database")
+
+    assert commands == ["migrate", "loaddata"]
+    assert DeploymentState.objects.get(name="startup").digest == state_digest()
+    assert "skipping migrations and fixtures" in capsys.readouterr().out
+
+
+def test_changed_fixture_prepares_again(db, commands, settings, tmp_path):
+    call_command("prepare_database")
+    fixture = tmp_path / "types.json"
+    fixture.write_text("[]")
+    settings.STARTUP_FIXTURES = [*settings.STARTUP_FIXTURES, str(fixture)]
+
+    with pytest.raises(CommandError, match="needs migrations or fixtures"):
+        call_command("prepare_database", "--check")
+    call_command("prepare_database")
+
+    assert commands == ["migrate", "loaddata"] * 2
+
+
+def test_warm_up_imports_views_and_freezes_gc():
+    try:
+        warm_up()
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+    assert "companies.views" in sys.modules
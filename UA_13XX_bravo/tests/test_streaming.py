@@ -0,0 +1,162 @@
+import gzip
+import json
+import warnings
+from decimal import Decimal
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from UA_13XX_bravo import middleware, streaming
+from UA_13XX_bravo.middleware import preferred_encoding
+from UA_13XX_bravo.streaming import encode_json_array
+from companies.models import CompanyProfile, CompanyType, UserToCompany
+from companies.serializers import UserToCompanySerializer
+from projects.models import Project, ProjectStatus
+from projects.serializers import ProjectListSerializer
+
+User = get_user_model()
+URL = reverse("projects:projects-list")
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(settings):
+    settings.STREAMING_LIST_CHUNK_SIZE = 2
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(email="stream@example.com", password="pass")
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def projects(db):
+    company = CompanyProfile.objects.create(company_name="Acme", description="", type=CompanyType.STARTUP)
+    return [
+        Project.objects.create(
+            name=f"P{i}", status=ProjectStatus.ACTIVE, information="", company=company,
+            required_funding=Decimal("1000"), raised_amount=Decimal(i),
+        )
+        for i in range(5)
+    ]
+
+
+def body(response):
+    return b"".join(response.streaming_content)
+
+
+def asgi_get(url, user, read_body):
+    """
+    GET ``url`` through the ASGI handler and call ``read_body(response,
+    pieces)``, with the streamed body as an async iterator, as a server
+    would read it; returns its result.
+    """
+    headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+    async def get():
+        response = await AsyncClient().get(url, headers=headers)
+        return await read_body(response, aiter(response.streaming_content))
+
+    # One event loop for the whole exchange: closing it finalizes the body
+    return async_to_sync(get)()
+
+
+@pytest.mark.parametrize("items", [[], [{"a": 1}], [{"a": i} for i in range(5)]])
+def test_encode_json_array(items):
+    assert json.loads(b"".join(encode_json_array(items, 2))) == items
+
+
+def test_list_is_streamed_with_regular_output(client, projects):
+    response = client.get(URL)
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/json"
+    expected = ProjectListSerializer(Project.objects.all(), many=True).data
+    assert sorted(json.loads(body(response)), key=lambda row: row["id"]) == json.loads(JSONRenderer().render(expected))
+
+
+def test_streamed_list_honours_fields(client, projects):
+    response = client.get(URL, {"fields": "id,name"})
+
+    assert sorted(json.loads(body(response)), key=lambda row: row["id"]) == [
+        {"id": project.id, "name": project.name} for project in projects
+    ]
+
+
+def test_browsable_api_is_not_streamed(client, projects):
+    response = client.get(URL, HTTP_ACCEPT="text/html")
+
+    assert response.status_code == 200
+    assert not response.streaming
+
+
+def test_user_to_company_list(client, user, projects):
+    UserToCompany.objects.create(user=user, company=projects[0].company)
+
+    response = client.get(reverse("user-to-company-list"))
+
+    expected = UserToCompanySerializer(UserToCompany.objects.all(), many=True).data
+    assert json.loads(body(response)) == json.loads(JSONRenderer().render(expected))
+
+
+def test_gzip_streaming(client, projects):
+    response = client.get(URL, HTTP_ACCEPT_ENCODING="gzip")
+
+    assert response["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response["Vary"]
+    assert len(json.loads(gzip.decompress(body(response)))) == len(projects)
+
+
+def test_brotli_streaming(client, projects):
+    brotli = pytest.importorskip("brotli")
+
+    response = client.get(URL, HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+
+    assert response["Content-Encoding"] == "br"
+    assert len(json.loads(brotli.decompress(body(response)))) == len(projects)
+
+
+def test_preferred_encoding(monkeypatch):
+    if middleware.brotli is not None:
+        assert preferred_encoding("gzip, br") == "br"
+        assert preferred_encoding("br;q=0.5, gzip") == "gzip"
+        assert preferred_encoding("br;q=0, gzip;q=0") is None
+    monkeypatch.setattr(middleware, "brotli", None)
+    assert preferred_encoding("gzip, br") == "gzip"
+    assert preferred_encoding("identity") is None
+
+
+def test_asgi_list_streams_chunk_by_chunk(user, projects, monkeypatch):
+    produced = []
+
+    def counting(items, chunk_size):
+        for piece in encode_json_array(items, chunk_size):
+            produced.append(piece)
+            yield piece
+
+    monkeypatch.setattr(streaming, "encode_json_array", counting)
+    async def read_body(response, pieces):
+        first = [await anext(pieces), await anext(pieces)]
+        # Only what was sent has been read from the cursor and encoded
+        assert len(produced) == 2
+        return response, first + [piece async for piece in pieces]
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings("error", message="StreamingHttpResponse must consume synchronous iterators")
+        response, pieces = asgi_get(URL, user, read_body)
+
+    assert response.is_async
+    assert len(json.loads(b"".join(pieces))) == len(projects)
@@ -0,0 +1,136 @@
+import json
+
+import pytest
+from django.core import mail
+from django.core.mail import get_connection
+from rest_framework.test import APIClient
+
+from UA_13XX_bravo.tracing import (
+    CLIENT,
+    NOOP_SPAN,
+    SERVER,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    extract,
+    inject,
+    run_in_trace,
+    set_exporter,
+    start_span,
+    traced,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    previous = set_exporter(exporter)
+    yield exporter
+    set_exporter(previous)
+
+
+@traced()
+def outer():
+    with start_span("inner"):
+        pass
+    return inject()
+
+
+def test_spans_nest_and_propagate(exporter):
+    carrier = outer()
+
+    inner, span = exporter.get_finished_spans()
+    assert span.name == "outer" and span.parent_id is None
+    assert inner.parent_id == span.span_id and inner.trace_id == span.trace_id
+    assert carrier == {"traceparent": f"00-{span.trace_id}-{span.span_id}-01"}
+
+    run_in_trace(carrier, outer)  # as in a parallel_map worker process
+    worker_span = exporter.get_finished_spans()[-1]
+    assert worker_span.name.endswith(".outer")
+    assert (worker_span.trace_id, worker_span.parent_id) == (span.trace_id, span.span_id)
+
+
+def test_request_continues_incoming_trace_with_query_spans(exporter, django_user_model):
+    client = APIClient()
+    client.force_authenticate(django_user_model.objects.create_user(email="tracer@example.com", password="x"))
+    exporter.clear()
+
+    client.get("/company/investor/saved-startups", HTTP_TRACEPARENT=f"00-{TRACE_ID}-{PARENT_ID}-01")
+
+    spans = exporter.get_finished_spans()
+    server = spans[-1]
+    assert server.kind == SERVER
+    assert server.name == "GET /company/investor/saved-startups"
+    assert (server.trace_id, server.parent_id) == (TRACE_ID, PARENT_ID)
+    assert "http.response.status_code" in server.attributes
+    queries = [span for span in spans if span.kind == CLIENT]
+    assert queries and all(span.parent_id == server.span_id for span in queries)
+    assert queries[0].attributes["db.statement"].startswith("SELECT")
+
+
+def test_exceptions_mark_the_span(exporter):
+    with pytest.raises(ValueError):
+        with start_span("failing"):
+            raise ValueError("boom")
+
+    [span] = exporter.get_finished_spans()
+    assert span.status == ("ERROR", "ValueError: boom")
+    assert span.events[0][2]["exception.type"] == "ValueError"
+
+
+def test_email_sends_are_traced(exporter, settings):
+    settings.EMAIL_DELIVERY_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    connection = get_connection("UA_13XX_bravo.mail.MeteredEmailBackend")
+
+    with start_span("notify"):
+        mail.EmailMessage("Hi", "Body", "from@example.com", ["to@example.com"], connection=connection).send()
+
+    send, notify = exporter.get_finished_spans()
+    assert (send.name, send.kind, send.parent_id) == ("email.send", CLIENT, notify.span_id)
+    assert send.attributes["email.count"] == 1
+
+
+def test_unsampled_traces_propagate_without_exporting(exporter, settings):
+    settings.TRACING_SAMPLE_RATE = 0
+
+    with start_span("root"):
+        carrier = inject()
+
+    assert carrier["traceparent"].endswith("-00")
+    assert extract(carrier).sampled is False
+    assert exporter.get_finished_spans() == []
+
+
+def test_invalid_traceparent_starts_a_new_trace():
+    assert extract({"traceparent": f"00-{'0' * 32}-{PARENT_ID}-01"}) is None
+    assert extract({"traceparent": "garbage"}) is None
+    assert extract({}) is None
+
+
+def test_tracing_off_uses_noop_span():
+    previous = set_exporter(None)
+    try:
+        assert start_span("anything") is NOOP_SPAN
+        assert inject() == {}
+    finally:
+        set_exporter(previous)
+
+
+def test_file_exporter_writes_otel_json_lines(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    previous = set_exporter(FileSpanExporter(path))
+    try:
+        with start_span("job", attributes={"rows": 3}):
+            pass
+    finally:
+        set_exporter(previous)
+
+    [line] = path.read_text().splitlines()
+    span = json.loads(line)
+    assert span["name"] == "job"
+    assert span["kind"] == "SpanKind.INTERNAL"
+    assert span["context"]["trace_id"].startswith("0x") and len(span["context"]["trace_id"]) == 34
+    assert span["attributes"] == {"rows": 3}
+    assert span["start_time"].endswith("Z")
@@ -0,0 +1,313 @@
+"""
+Request tracing in the OpenTelemetry span model.
+
+Spans are opened with ``start_span`` (or the ``traced`` decorator) and
+nest through a context variable, which asgiref carries across
+``sync_to_async`` hops. TracingMiddleware opens the server span of each
+request, ``trace_query`` (installed on every database connection, see
+UA_13XX_bravo.apps) adds one per query, and signal receivers, email
+sends (UA_13XX_bravo.mail) and ChatConsumer events add their own.
+
+Trace context crosses process boundaries as a W3C ``traceparent``:
+incoming HTTP and WebSocket requests continue the caller's trace,
+``inject``/``extract`` carry it in channel layer messages, and
+``parallel_map`` (UA_13XX_bravo.imports) hands it to its worker
+processes through ``run_in_trace``.
+
+Finished spans go to the exporter named by TRACING_EXPORTER: "file"
+appends them as JSON lines to TRACING_FILE, in the shape of the
+OpenTelemetry SDK's ``Span.to_json``, "memory" keeps them in an
+InMemorySpanExporter for tests. Without an exporter ``start_span``
+returns a shared no-op span, so the hooks cost a function call.
+TRACING_SAMPLE_RATE samples traces at their root; the rest of a trace
+follows that decision, in other processes too.
+"""
+import functools
+import inspect
+import random
+import re
+import sys
+import threading
+import time
+import traceback
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+from .fastjson import dumps_text
+
+SERVER = "SpanKind.SERVER"
+CLIENT = "SpanKind.CLIENT"
+INTERNAL = "SpanKind.INTERNAL"
+PRODUCER = "SpanKind.PRODUCER"
+CONSUMER = "SpanKind.CONSUMER"
+
+TRACEPARENT = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+
+_current_span = ContextVar("current_span", default=None)
+
+
+class SpanContext:
+    """A span's identity, as propagated to other processes."""
+
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id, span_id, sampled):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+
+class Span:
+    __slots__ = (
+        "name", "kind", "trace_id", "span_id", "parent_id", "sampled", "attributes", "events",
+        "status", "start_ns", "end_ns", "_token",
+    )
+
+    def __init__(self, name, kind, parent, attributes):
+        self.name = name
+        self.kind = kind
+        if parent is None:
+            self.trace_id = f"{random.getrandbits(128):032x}"
+            self.parent_id = None
+            self.sampled = random.random() < settings.TRACING_SAMPLE_RATE
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+            self.sampled = parent.sampled
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.attributes = dict(attributes or ())
+        self.events = []
+        self.status = ("UNSET", None)
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_status(self, code, description=None):
+        self.status = (code, description)
+
+    def record_exception(self, exc):
+        self.status = ("ERROR", f"{type(exc).__name__}: {exc}")
+        self.events.append(("exception", time.time_ns(), {
+            "exception.type": type(exc).__qualname__,
+            "exception.message": str(exc),
+            "exception.stacktrace": "".join(traceback.format_exception(exc)),
+        }))
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.record_exception(exc)
+        self.end_ns = time.time_ns()
+        if self.sampled:
+            exporter = get_exporter()
+            if exporter is not None:
+                exporter.export(self)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "context": {"trace_id": f"0x{self.trace_id}", "span_id": f"0x{self.span_id}", "trace_state": "[]"},
+            "kind": self.kind,
+            "parent_id": f"0x{self.parent_id}" if self.parent_id else None,
+            "start_time": _timestamp(self.start_ns),
+            "end_time": _timestamp(self.end_ns),
+            "status": {"status_code": self.status[0], **({"description": self.status[1]} if self.status[1] else {})},
+            "attributes": self.attributes,
+            "events": [
+                {"name": name, "timestamp": _timestamp(at), "attributes": attributes}
+                for name, at, attributes in self.events
+            ],
+            "links": [],
+            "resource": {"attributes": {"service.name": settings.TRACING_SERVICE_NAME}, "schema_url": ""},
+        }
+
+
+class _NoopSpan:
+    """What ``start_span`` returns while tracing is off."""
+
+    sampled = False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_status(self, code, description=None):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _timestamp(ns):
+    return datetime.fromtimestamp(ns / 1e9, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class InMemorySpanExporter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans = []
+
+    def export(self, span):
+        with self._lock:
+            self._spans.append(span)
+
+    def get_finished_spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+class FileSpanExporter:
+    """
+    Append spans as JSON lines to ``path``.
+
+    The file is opened in append mode on first use in each process and
+    every span is a single write, so the workers of a server can share it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def export(self, span):
+        line = dumps_text(span.to_dict()) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+            self._file.write(line)
+
+
+_UNSET = object()
+_exporter = _UNSET
+
+
+def get_exporter():
+    """The exporter configured by TRACING_EXPORTER, or None when tracing is off."""
+    global _exporter
+    if _exporter is _UNSET:
+        if settings.TRACING_EXPORTER == "file":
+            _exporter = FileSpanExporter(settings.TRACING_FILE)
+        elif settings.TRACING_EXPORTER == "memory":
+            _exporter = InMemorySpanExporter()
+        else:
+            _exporter = None
+    return _exporter
+
+
+def set_exporter(exporter):
+    """Replace the exporter (None turns tracing off); returns the previous one."""
+    global _exporter
+    previous, _exporter = get_exporter(), exporter
+    return previous
+
+
+def current_span():
+    return _current_span.get()
+
+
+def start_span(name, kind=INTERNAL, attributes=None, parent=None):
+    """
+    A span to use as a context manager, the child of ``parent`` (a
+    SpanContext, e.g. from ``extract``) or else of the current span.
+    """
+    if get_exporter() is None:
+        return NOOP_SPAN
+    return Span(name, kind, parent or _current_span.get(), attributes)
+
+
+def traced(name=None, kind=INTERNAL):
+    """Decorator running each call of a function or coroutine function in a span."""
+
+    def decorator(function):
+        span_name = name or function.__qualname__
+        attributes = {"code.namespace": function.__module__, "code.function": function.__qualname__}
+
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                with start_span(span_name, kind, attributes):
+                    return await function(*args, **kwargs)
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with start_span(span_name, kind, attributes):
+                    return function(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def inject(carrier=None):
+    """Add the current span's ``traceparent`` to ``carrier`` (a new dict by default) and return it."""
+    carrier = {} if carrier is None else carrier
+    span = _current_span.get()
+    if span is not None:
+        carrier["traceparent"] = f"00-{span.trace_id}-{span.span_id}-{'01' if span.sampled else '00'}"
+    return carrier
+
+
+def extract(carrier):
+    """The SpanContext of a ``traceparent`` in ``carrier`` (a mapping), or None."""
+    match = TRACEPARENT.fullmatch(carrier.get("traceparent") or "")
+    if match is None or match[1] == "0" * 32 or match[2] == "0" * 16:
+        return None
+    return SpanContext(match[1], match[2], int(match[3], 16) & 1 == 1)
+
+
+def run_in_trace(carrier, function, *args):
+    """Call ``function(*args)`` in another process, inside the trace ``carrier`` came from."""
+    parent = extract(carrier)
+    if parent is None:
+        return function(*args)
+    with start_span(f"{function.__module__}.{function.__qualname__}", CONSUMER, parent=parent):
+        return function(*args)
+
+
+def trace_query(execute, sql, params, many, context):
+    """Database execute wrapper adding a span per query within a trace."""
+    if _current_span.get() is None or get_exporter() is None:
+        return execute(sql, params, many, context)
+    connection = context["connection"]
+    attributes = {
+        "db.system": connection.vendor,
+        "db.name": connection.alias,
+        "db.statement": sql if len(sql) <= 2000 else sql[:2000] + "...",
+    }
+    if many:
+        attributes["db.operation.batch"] = True
+    with start_span(sql.split(None, 1)[0].upper() if sql else "query", CLIENT, attributes):
+        return execute(sql, params, many, context)
+
+
+def record_request_exception(sender, **kwargs):
+    """got_request_exception receiver: puts the view's exception on the request span."""
+    span = _current_span.get()
+    exc = sys.exc_info()[1]
+    if span is not None and exc is not None:
+        span.record_exception(exc)
+
+
+def install_query_tracing(sender, connection, **kwargs):
+    """connection_created receiver, like ``metrics.install_query_metrics``."""
+    if trace_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(trace_query)
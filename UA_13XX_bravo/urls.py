@@ -16,7 +16,7 @@ Including another URLconf
 """
 
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 
 from drf_spectacular.views import (
     SpectacularAPIView,
@@ -24,6 +24,8 @@ from drf_spectacular.views import (
     SpectacularRedocView,
 )
 
+from .views import DataExportView, DatabasePoolStatsView, MetricsView
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -38,6 +40,13 @@ urlpatterns += [
         name="swagger-ui",
     ),
     path("api/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+    path("api/db-pool-stats/", DatabasePoolStatsView.as_view(), name="db-pool-stats"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    re_path(
+        r"^api/exports/(?P<dataset>[a-z_]+)\.(?P<file_format>csv|ndjson)$",
+        DataExportView.as_view(),
+        name="data-export",
+    ),
     path("auth/", include("djoser.urls")),
     path("auth/", include("djoser.urls.jwt")),
     path("auth/", include("users.urls")),
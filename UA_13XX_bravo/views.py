@@ -0,0 +1,82 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from django.views import View
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .db import get_pool_stats
+from .exports import DATASETS, export
+from .metrics import render
+from .streaming import streaming_body
+
+EXPORT_CONTENT_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class DatabasePoolStatsView(APIView):
+    """
+    Report database connection pool usage of the worker serving the request.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_pool_stats())
+
+
+class DataExportView(APIView):
+    """
+    Stream a whole dataset as CSV or NDJSON, e.g. ``/api/exports/projects.csv``.
+
+    ``?since=<ISO 8601>`` limits the export to rows changed after that
+    moment; the ``X-Export-Watermark`` response header is the ``since`` to
+    use for the next incremental export.
+    """
+    permission_classes = [IsAdminUser]
+
+    def perform_content_negotiation(self, request, force=False):
+        # The body is CSV/NDJSON whatever the Accept header says; errors stay JSON
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, dataset, file_format):
+        if dataset not in DATASETS:
+            raise Http404(f"Unknown dataset: {dataset}")
+        since = request.query_params.get("since")
+        if since:
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                since = None
+            if since is None:
+                raise ValidationError({"since": "Expected an ISO 8601 timestamp."})
+
+        blocks, until = export(dataset, file_format, since=since or None)
+        response = StreamingHttpResponse(
+            streaming_body(request, blocks), content_type=EXPORT_CONTENT_TYPES[file_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="{dataset}.{file_format}"'
+        response["X-Export-Watermark"] = until.isoformat()
+        return response
+
+
+class MetricsView(View):
+    """
+    Prometheus scrape endpoint, summing the metrics of all workers.
+
+    A plain Django view: scrapers authenticate with METRICS_TOKEN as a
+    bearer token, not with user credentials. Without a token the endpoint
+    is closed, except under DEBUG.
+    """
+
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if not token:
+            if not settings.DEBUG:
+                return HttpResponse(status=403)
+        elif not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+        return HttpResponse(render(), content_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,137 @@
+"""
+Compare how many slow, I/O-bound requests each serving mode handles at once.
+
+The script starts a stub of Google's userinfo endpoint that answers after
+``--upstream-delay`` seconds, boots the project under gunicorn in WSGI mode
+(sync workers) and in ASGI mode (uvicorn workers) with ``GOOGLE_USERINFO_URL``
+pointing at the stub, and fires batches of concurrent ``POST /auth/google/``
+requests at each.
+
+With W sync workers a batch of C requests takes roughly ``C / W * delay``;
+the async view keeps every request in flight at once, so a batch takes about
+``delay`` regardless of C.
+
+Run from the project root with the usual database environment (.env):
+
+    python benchmarks/asgi_concurrency.py --workers 2 --concurrency 10 50 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+MODES = {
+    "wsgi": ["UA_13XX_bravo.wsgi:application"],
+    "asgi": ["--worker-class", "uvicorn_worker.UvicornWorker", "UA_13XX_bravo.asgi:application"],
+}
+
+
+def start_upstream(delay):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = json.dumps({"email": "bench@example.com", "given_name": "Bench"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+async def run_batch(url, concurrency):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+
+        async def one():
+            started = time.perf_counter()
+            response = await client.post(url, json={"token": "bench-access-token"})
+            return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, code in results if code != 200)
+    return {
+        "elapsed": elapsed,
+        "rps": concurrency / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "errors": errors,
+    }
+
+
+def bench_mode(mode, args, upstream_url):
+    env = dict(os.environ, GOOGLE_USERINFO_URL=upstream_url)
+    command = [
+        sys.executable, "-m", "gunicorn",
+        "--workers", str(args.workers),
+        "--bind", f"127.0.0.1:{args.port}",
+        "--timeout", "120",
+        "--log-level", "warning",
+        *MODES[mode],
+    ]
+    server = subprocess.Popen(command, env=env)
+    try:
+        wait_for_port(args.port)
+        url = f"http://127.0.0.1:{args.port}/auth/google/"
+        asyncio.run(run_batch(url, 1))  # warm up workers and create the user
+        return [(c, asyncio.run(run_batch(url, c))) for c in args.concurrency]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--upstream-delay", type=float, default=0.5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    upstream = start_upstream(args.upstream_delay)
+    upstream_url = f"http://127.0.0.1:{upstream.server_port}/userinfo"
+
+    print(f"workers={args.workers} upstream_delay={args.upstream_delay}s")
+    print(f"{'mode':<6}{'conc':>6}{'elapsed s':>11}{'req/s':>9}{'p50 s':>8}{'p95 s':>8}{'errors':>8}")
+    for mode in args.modes:
+        for concurrency, r in bench_mode(mode, args, upstream_url):
+            print(
+                f"{mode:<6}{concurrency:>6}{r['elapsed']:>11.2f}{r['rps']:>9.1f}"
+                f"{r['p50']:>8.2f}{r['p95']:>8.2f}{r['errors']:>8}"
+            )
+    upstream.shutdown()
+
+
+if __name__ == "__main__":
+    main()
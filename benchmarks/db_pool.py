@@ -0,0 +1,131 @@
+"""
+Measure connection acquisition under concurrent load, pooled vs persistent.
+
+Each of ``--threads`` threads runs ``--iterations`` short request-like units
+of work (acquire a connection, run a query, release it the way Django does at
+the end of a request) while a monitor samples ``pg_stat_activity``. With
+persistent connections (``DB_POOL_ENABLED=False``) every thread keeps its own
+connection open; with the pool the server-side count stays at or below
+``DB_POOL_MAX_SIZE``.
+
+Run from the project root with the usual database environment (.env):
+
+    python benchmarks/db_pool.py --threads 50 --iterations 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+
+def run_mode(args):
+    """Body of one measurement, executed in a fresh interpreter per mode."""
+    sys.path.insert(0, os.getcwd())
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "UA_13XX_bravo.settings")
+    import django
+
+    django.setup()
+    from django.db import close_old_connections, connection, connections
+
+    def server_connections():
+        with connections["default"].cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database() AND pid <> pg_backend_pid()"
+            )
+            return cursor.fetchone()[0]
+
+    acquire_times = []
+    peak = 0
+    stop = threading.Event()
+    lock = threading.Lock()
+
+    def monitor():
+        nonlocal peak
+        while not stop.is_set():
+            count = server_connections()
+            peak = max(peak, count)
+            time.sleep(0.02)
+        connections["default"].close()
+
+    def worker():
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            connection.ensure_connection()
+            acquired = time.perf_counter() - started
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_sleep(%s)", [args.query_seconds])
+            # Same as the request_finished handler: return pooled connections,
+            # keep persistent ones until CONN_MAX_AGE expires.
+            close_old_connections()
+            with lock:
+                acquire_times.append(acquired)
+        if args.mode == "persistent":
+            # Persistent connections live until the thread dies; measure them
+            # before that happens.
+            barrier.wait()
+
+    barrier = threading.Barrier(args.threads + 1)
+    monitor_thread = threading.Thread(target=monitor)
+    monitor_thread.start()
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    if args.mode == "persistent":
+        barrier.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    monitor_thread.join()
+
+    acquire_times.sort()
+    print(json.dumps({
+        "elapsed": elapsed,
+        "peak_connections": peak,
+        "acquire_p50_ms": statistics.median(acquire_times) * 1000,
+        "acquire_p99_ms": acquire_times[int(len(acquire_times) * 0.99) - 1] * 1000,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--query-seconds", type=float, default=0.005)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--mode", choices=["pool", "persistent"])
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args)
+        return
+
+    print(f"threads={args.threads} iterations={args.iterations} pool_max_size={args.pool_size}")
+    print(f"{'mode':<12}{'elapsed s':>10}{'peak conns':>12}{'acquire p50 ms':>16}{'acquire p99 ms':>16}")
+    for mode in ("persistent", "pool"):
+        env = dict(
+            os.environ,
+            DB_POOL_ENABLED="True" if mode == "pool" else "False",
+            DB_POOL_MAX_SIZE=str(args.pool_size),
+            LOG_LEVEL="WARNING",
+        )
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode,
+             "--threads", str(args.threads), "--iterations", str(args.iterations),
+             "--query-seconds", str(args.query_seconds)],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{mode:<12}{r['elapsed']:>10.2f}{r['peak_connections']:>12}"
+            f"{r['acquire_p50_ms']:>16.2f}{r['acquire_p99_ms']:>16.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
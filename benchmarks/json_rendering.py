@@ -0,0 +1,95 @@
+"""
+Compare DRF's JSONRenderer/JSONParser with the orjson-backed FastJSON pair.
+
+Builds ``--rows`` notification and company list payloads in the shape the
+list endpoints return (no database access), then renders and parses them
+with both implementations. Prints the median time per payload and the
+speedup. Without orjson installed both sides use stdlib json.
+
+Run from the project root with the usual environment (.env):
+
+    python benchmarks/json_rendering.py --rows 10000 --repeat 10
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "UA_13XX_bravo.settings")
+    import django
+
+    django.setup()
+    from django.utils import timezone
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from UA_13XX_bravo import fastjson
+    from UA_13XX_bravo.fastjson import FastJSONParser, FastJSONRenderer
+
+    now = timezone.now()
+    payloads = {
+        "notifications": [
+            {
+                "id": i, "user": 1, "entity": {"id": i, "name": f"Entity {i}"}, "type": "Push",
+                "content": "Something happened to a company you follow", "created_at": now, "read": bool(i % 2),
+            }
+            for i in range(args.rows)
+        ],
+        "companies": {
+            "count": args.rows,
+            "results": [
+                {
+                    "id": i, "type": "startup", "company_name": f"Company {i}", "description": "A company " * 10,
+                    "website": "https://example.com", "startup_logo": "", "industry": "Fintech",
+                    "required_funding": Decimal("125000.00"), "company_size": i % 500,
+                    "phone_number": "+380501234567", "created_at": now, "updated_at": now,
+                }
+                for i in range(args.rows)
+            ],
+        },
+    }
+
+    results = {"orjson": fastjson.orjson is not None}
+    for name, payload in payloads.items():
+        body = JSONRenderer().render(payload)
+        assert FastJSONRenderer().render(payload) == body
+        drf_render = measure(lambda: JSONRenderer().render(payload), args.repeat)
+        fast_render = measure(lambda: FastJSONRenderer().render(payload), args.repeat)
+        drf_parse = measure(lambda: JSONParser().parse(io.BytesIO(body)), args.repeat)
+        fast_parse = measure(lambda: FastJSONParser().parse(io.BytesIO(body)), args.repeat)
+        results[name] = {
+            "rows": args.rows,
+            "bytes": len(body),
+            "render_drf_ms": round(drf_render * 1000, 2),
+            "render_fast_ms": round(fast_render * 1000, 2),
+            "render_speedup": round(drf_render / fast_render, 1),
+            "parse_drf_ms": round(drf_parse * 1000, 2),
+            "parse_fast_ms": round(fast_parse * 1000, 2),
+            "parse_speedup": round(drf_parse / fast_parse, 1),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Compare logging straight to rotating files with the queued pipeline.
+
+Logs ``--records`` records from ``--threads`` threads, first with the
+JSON formatter on RotatingFileHandlers called on the logging thread, then
+behind the QueueHandler/QueueListener pipeline of UA_13XX_bravo.log.
+Prints the records per second the logging threads sustain and, for the
+queue, how long the listener took to drain what was left and how many
+records were dropped (the queue is bounded by LOG_QUEUE_SIZE).
+
+Run from the project root with the usual environment (.env):
+
+    python benchmarks/logging_throughput.py --records 50000 --threads 4
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+
+def run_threads(logger, records, threads):
+    per_thread = records // threads
+
+    def work():
+        for i in range(per_thread):
+            logger.info("processed item %s of %s", i, per_thread, extra={"company_id": i % 100})
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "UA_13XX_bravo.settings")
+    import django
+
+    django.setup()
+    from django.conf import settings
+
+    from UA_13XX_bravo.log import JSONFormatter, LogPipeline
+
+    def file_handlers(directory):
+        handlers = []
+        for name in ("app", "error", "critical"):
+            handler = RotatingFileHandler(
+                os.path.join(directory, f"{name}.log"), maxBytes=settings.MAX_LOG_FILE_SIZE,
+                backupCount=settings.BACKUP_COUNT,
+            )
+            handler.setFormatter(JSONFormatter())
+            handler.setLevel(logging.INFO if name == "app" else logging.ERROR)
+            handlers.append(handler)
+        return handlers
+
+    logger = logging.getLogger("benchmarks.logging")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        handlers = file_handlers(directory)
+        for handler in handlers:
+            logger.addHandler(handler)
+        written, elapsed = run_threads(logger, args.records, args.threads)
+        for handler in handlers:
+            logger.removeHandler(handler)
+            handler.close()
+        results["direct"] = {"records_per_s": round(written / elapsed)}
+
+    with tempfile.TemporaryDirectory() as directory:
+        handlers = file_handlers(directory)
+        pipeline = LogPipeline(handlers, settings.LOG_QUEUE_SIZE, settings.LOG_DEBUG_SAMPLE_RATE)
+        pipeline.start()
+        logger.addHandler(pipeline.queue_handler)
+        written, elapsed = run_threads(logger, args.records, args.threads)
+        started = time.perf_counter()
+        pipeline.stop()
+        drained = time.perf_counter() - started
+        logger.removeHandler(pipeline.queue_handler)
+        for handler in handlers:
+            handler.close()
+        results["queued"] = {
+            "records_per_s": round(written / elapsed),
+            "drain_ms": round(drained * 1000, 1),
+            "dropped": pipeline.queue_handler.dropped,
+            "queue_size": settings.LOG_QUEUE_SIZE,
+        }
+
+    results["speedup"] = round(results["queued"]["records_per_s"] / results["direct"]["records_per_s"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
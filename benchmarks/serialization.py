@@ -0,0 +1,95 @@
+"""
+Compare the ModelSerializer list path with the lean serializers.
+
+Serializes ``--rows`` in-memory rows (no database access) with the regular
+serializer, as the list endpoint did before, and with the lean serializer
+fed ``.values()``-style dicts, as it does now. Prints the median time per
+page for each and the speedup.
+
+Run from the project root with the usual environment (.env):
+
+    python benchmarks/serialization.py --rows 1000 --repeat 20
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "UA_13XX_bravo.settings")
+    import django
+
+    django.setup()
+    from django.utils import timezone
+
+    from companies.models import CompanyProfile, CompanyType
+    from companies.serializers import CompanyProfileListSerializer, CompanyProfileSerializer
+    from notifications.models import Entity, Notification, Type
+    from notifications.serializers import NotificationListSerializer, NotificationSerializer
+
+    now = timezone.now()
+    companies = [
+        CompanyProfile(
+            id=i, company_name=f"Company {i}", description="A company " * 10, website="https://example.com",
+            startup_logo="", industry="Fintech", required_funding=Decimal("125000.00"), company_size=i % 500,
+            phone_number="+380501234567", created_at=now, updated_at=now - timedelta(days=i),
+            type=CompanyType.STARTUP,
+        )
+        for i in range(1, args.rows + 1)
+    ]
+    push = Type(id=1, name="Push")
+    notifications = [
+        Notification(
+            id=i, user_id=1, type=push, content="Something happened", created_at=now, read=bool(i % 2),
+            entity=Entity(id=i, name=f"Entity {i}"),
+        )
+        for i in range(1, args.rows + 1)
+    ]
+
+    def rows(objects, lean):
+        def value(obj, source):
+            for part in source.split("__"):
+                obj = getattr(obj, part)
+            return str(obj) if source == "phone_number" else obj
+
+        return [{source: value(obj, source) for source in lean().columns} for obj in objects]
+
+    results = {}
+    for name, objects, model_serializer, lean_serializer in [
+        ("companies", companies, CompanyProfileSerializer, CompanyProfileListSerializer),
+        ("notifications", notifications, NotificationSerializer, NotificationListSerializer),
+    ]:
+        values = rows(objects, lean_serializer)
+        drf = measure(lambda: model_serializer(objects, many=True).data, args.repeat)
+        lean = measure(lambda: lean_serializer().serialize(values), args.repeat)
+        results[name] = {
+            "rows": args.rows,
+            "model_serializer_ms": round(drf * 1000, 2),
+            "lean_serializer_ms": round(lean * 1000, 2),
+            "speedup": round(drf / lean, 1),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
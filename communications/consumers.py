@@ -1,10 +1,12 @@
-import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 
 from django.db.utils import IntegrityError
 from communications.models import ChatRoom
 from companies.models import CompanyProfile, CompanyType
 from asgiref.sync import sync_to_async
+from UA_13XX_bravo import fastjson
+from UA_13XX_bravo.metrics import CHAT_CONNECTIONS, CHAT_GROUP_SIZE, CHAT_MESSAGES
+from UA_13XX_bravo.tracing import CONSUMER, SERVER, extract, inject, start_span, traced
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +19,15 @@ class ChatConsumer(AsyncWebsocketConsumer):
         Handles WebSocket connection and creates the chat room if it doesn't exist.
         Returns detailed error info to the client if validation fails.
         """
+        # A traceparent header on the handshake continues the client's trace
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in self.scope.get("headers", ())}
+        with start_span("chat.connect", SERVER, {"url.path": self.scope.get("path", "")}, parent=extract(headers)):
+            await self.join_room()
 
+    async def join_room(self):
+        """
+        Validates the request and adds the connection to the room's group.
+        """
         error = self.scope.get("auth_error")  # from middlware
         if error:
             await self.accept()
@@ -35,6 +45,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
         self.room = await self.get_or_create_chat_room(self.company1, self.company2)
         self.room_group_name = f"chat_{self.room.id}"
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
+        CHAT_CONNECTIONS.inc()
 
     async def set_params(self):
         kwargs = self.scope["url_route"]["kwargs"]
@@ -101,6 +112,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 company_id_1=company1, company_id_2=company2
             )
 
+    @traced("chat.disconnect")
     async def disconnect(self, close_code):
         """
         Disconnects the user from the chat group upon exit.
@@ -109,7 +121,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
             await self.channel_layer.group_discard(
                 self.room_group_name, self.channel_name
             )
+            CHAT_CONNECTIONS.dec()
 
+    @traced("chat.receive", SERVER)
     async def receive(self, text_data):
         """
         Handles receiving a message and saves it in the database.
@@ -117,7 +131,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
         if not hasattr(self, "room"):
             await self.send_error("Chat room not initialized.")
             return
-        data = json.loads(text_data)
+        data = fastjson.loads(text_data)
         message_content = data.get("message")
 
         # Save the message to the database
@@ -125,19 +139,25 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.room, self.company1, self.company2, message_content
         )
 
-        # Send the message to all participants in the chat room
+        # Send the message to all participants in the chat room; the receiving
+        # consumers continue this trace
         await self.channel_layer.group_send(
             self.room_group_name,
-            {
+            inject({
                 "type": "chat_message",
                 "message": message_content,
                 "sender": self.user.email,
-            },
+            }),
         )
+        CHAT_MESSAGES.inc()
+        # Only the in-memory layer can tell; its groups are per process
+        members = getattr(self.channel_layer, "groups", {}).get(self.room_group_name)
+        if members is not None:
+            CHAT_GROUP_SIZE.observe(len(members))
 
     async def send_error(self, message: str, code: int = 4001):
         await self.send(
-            text_data=json.dumps(
+            text_data=fastjson.dumps_text(
                 {
                     "type": "error",
                     "message": message,
@@ -150,14 +170,15 @@ class ChatConsumer(AsyncWebsocketConsumer):
         """
         Sends a message to the WebSocket client.
         """
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "message": event["message"],
-                    "sender": event["sender"],
-                }
+        with start_span("chat.deliver", CONSUMER, parent=extract(event)):
+            await self.send(
+                text_data=fastjson.dumps_text(
+                    {
+                        "message": event["message"],
+                        "sender": event["sender"],
+                    }
+                )
             )
-        )
 
     async def save_message(self, room, sender, receiver, content):
         """
@@ -1,3 +1,25 @@
 from django.contrib import admin
 
-# Register your models here.
+from companies.models import CompanyFollowers, CompanyProfile
+
+
+class CompanyProfileAdmin(admin.ModelAdmin):
+    list_display = ('company_name', 'type', 'industry', 'created_at')
+    search_fields = ('company_name',)
+    list_filter = ('type',)
+
+
+class CompanyFollowersAdmin(admin.ModelAdmin):
+    list_display = ('id', 'investor', 'startup', 'created_at')
+    # One joined query for the page instead of two lookups per row, and id
+    # inputs instead of <select>s listing every company.
+    list_select_related = ('investor', 'startup')
+    raw_id_fields = ('investor', 'startup')
+    search_fields = ('investor__company_name', 'startup__company_name')
+    ordering = ('-id',)
+    # Skip the unfiltered COUNT(*) over the whole table on every page load
+    show_full_result_count = False
+
+
+admin.site.register(CompanyProfile, CompanyProfileAdmin)
+admin.site.register(CompanyFollowers, CompanyFollowersAdmin)
@@ -0,0 +1,134 @@
+from decimal import Decimal
+
+import django_filters
+from django.db.models import Case, CharField, Count, Q, Value, When
+from rest_framework.pagination import LimitOffsetPagination
+
+from .models import CompanyProfile, CompanyType
+
+# (label, min, max) with inclusive bounds; None means unbounded. Labels are
+# returned in the facets together with the bounds, so a client can turn a
+# facet into company_size_min/_max or required_funding_min/_max params.
+COMPANY_SIZE_BANDS = [
+    ("1-10", 1, 10),
+    ("11-50", 11, 50),
+    ("51-200", 51, 200),
+    ("201-1000", 201, 1000),
+    ("1000+", 1001, None),
+]
+REQUIRED_FUNDING_BANDS = [
+    ("<100k", Decimal("0"), Decimal("99999.99")),
+    ("100k-1M", Decimal("100000"), Decimal("999999.99")),
+    ("1M-10M", Decimal("1000000"), Decimal("9999999.99")),
+    ("10M+", Decimal("10000000"), None),
+]
+
+
+class CommaSeparatedCharFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    """``?industry=Fintech,Health`` matches either value."""
+
+
+class CompanyProfileFilter(django_filters.FilterSet):
+    industry = CommaSeparatedCharFilter(field_name="industry")
+    type = django_filters.MultipleChoiceFilter(choices=CompanyType.CHOICES)
+    company_size = django_filters.RangeFilter()
+    required_funding = django_filters.RangeFilter()
+
+    class Meta:
+        model = CompanyProfile
+        fields = ["industry", "type", "company_size", "required_funding"]
+
+
+def band_expression(field, bands):
+    whens = []
+    for label, low, high in bands:
+        condition = Q(**{f"{field}__gte": low})
+        if high is not None:
+            condition &= Q(**{f"{field}__lte": high})
+        whens.append(When(condition, then=Value(label)))
+    return Case(*whens, default=Value(None), output_field=CharField())
+
+
+def company_facets(queryset):
+    """
+    Count the companies in ``queryset`` per industry, type, size band and
+    funding band.
+
+    A single ``GROUP BY`` over all four dimensions returns at most one row
+    per combination; each facet is the marginal sum of those rows. The
+    grand total comes for free and is returned alongside.
+
+    Returns:
+        tuple: ``(total, facets)``
+    """
+    rows = (
+        queryset.order_by()
+        .annotate(
+            size_band=band_expression("company_size", COMPANY_SIZE_BANDS),
+            funding_band=band_expression("required_funding", REQUIRED_FUNDING_BANDS),
+        )
+        .values("industry", "type", "size_band", "funding_band")
+        .annotate(count=Count("id"))
+    )
+
+    total = 0
+    counts = {"industry": {}, "type": {}, "company_size": {}, "required_funding": {}}
+    for row in rows:
+        total += row["count"]
+        for facet, key in (
+            ("industry", "industry"),
+            ("type", "type"),
+            ("company_size", "size_band"),
+            ("required_funding", "funding_band"),
+        ):
+            value = row[key]
+            if value not in (None, ""):
+                counts[facet][value] = counts[facet].get(value, 0) + row["count"]
+
+    def bands(facet, definitions):
+        return [
+            {"value": label, "min": low, "max": high, "count": counts[facet].get(label, 0)}
+            for label, low, high in definitions
+        ]
+
+    facets = {
+        "industry": [
+            {"value": value, "count": count}
+            for value, count in sorted(counts["industry"].items(), key=lambda item: (-item[1], item[0]))
+        ],
+        "type": [
+            {"value": value, "count": counts["type"].get(value, 0)} for value, _ in CompanyType.CHOICES
+        ],
+        "company_size": bands("company_size", COMPANY_SIZE_BANDS),
+        "required_funding": bands("required_funding", REQUIRED_FUNDING_BANDS),
+    }
+    return total, facets
+
+
+class FacetedLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Limit/offset pages with facet counts for the whole filtered result.
+
+    The total count is taken from the facet query instead of a separate
+    ``COUNT(*)``, so a page costs two queries: facets and the page itself.
+    """
+    default_limit = 20
+    max_limit = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.total, self.facets = company_facets(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        return self.total
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data["facets"] = self.facets
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema["properties"]["facets"] = {"type": "object"}
+        return schema
+
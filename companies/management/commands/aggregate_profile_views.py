@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from companies.analytics import aggregate_profile_views
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold new profile view events into hourly and daily buckets. "
+        "Safe to run repeatedly (e.g. every few minutes from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            processed = aggregate_profile_views(batch_size=options["batch_size"])
+            total += processed
+            if processed < options["batch_size"]:
+                break
+        self.stdout.write(self.style.SUCCESS(f"Aggregated {total} profile views."))
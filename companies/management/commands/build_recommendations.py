@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from companies import recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild startup similarities and per-investor recommendations from the "
+        "follow graph. Only rows affected by changes since the last run are "
+        "rewritten unless --full is given. Run it periodically (e.g. from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Rewrite every row instead of only changed ones")
+        parser.add_argument("--top-k", type=int, help="Recommendations kept per investor")
+        parser.add_argument("--neighbours", type=int, help="Similar startups kept per startup")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        stats = recommendations.refresh_recommendations(
+            full=options["full"], top_k=options["top_k"], neighbours=options["neighbours"]
+        )
+        backend = "scipy" if recommendations.sparse is not None else "pure Python"
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed {stats['startups']} startups and {stats['investors']} investors "
+            f"in {time.perf_counter() - started:.2f}s ({backend})."
+        ))
@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+
+from UA_13XX_bravo.imports import BulkImportCommand
+
+User = get_user_model()
+
+
+class Command(BulkImportCommand):
+    help = (
+        "Import company profiles from a CSV (company_name,description,type,... and optionally owner) "
+        "or NDJSON file. Each batch is validated and inserted in one transaction."
+    )
+    label = "companies"
+    import_function = "companies.utils.bulk_create_companies"
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--owner", help="Email of the user linked to companies whose row has no owner")
+
+    def import_kwargs(self, options):
+        owner = None
+        if options["owner"]:
+            owner = User.objects.filter(email__iexact=options["owner"]).first()
+            if owner is None:
+                raise CommandError(f"User not found: {options['owner']}")
+        return {**super().import_kwargs(options), "owner": owner}
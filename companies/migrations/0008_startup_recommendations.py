@@ -0,0 +1,50 @@
+# Generated by Django 5.1.6 on 2026-10-19 17:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0007_alter_companyprofile_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvestorFollowDigest',
+            fields=[
+                ('investor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='companies.companyprofile')),
+                ('follows_digest', models.CharField(max_length=40)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StartupRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('investor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='startup_recommendations', to='companies.companyprofile')),
+                ('startup', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='companies.companyprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['investor', 'rank'], name='startup_rec_investor_rank_idx')],
+                'unique_together': {('investor', 'startup')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StartupSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('co_followers', models.PositiveIntegerField()),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='companies.companyprofile')),
+                ('startup', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_startups', to='companies.companyprofile')),
+            ],
+            options={
+                'verbose_name_plural': 'Startup similarities',
+                'unique_together': {('startup', 'similar')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.6 on 2026-10-19 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0010_profile_view_analytics'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companyprofile',
+            index=models.Index(fields=['type', 'industry'], name='company_type_industry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companyprofile',
+            index=models.Index(fields=['industry'], name='company_industry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companyprofile',
+            index=models.Index(fields=['company_size'], name='company_size_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companyprofile',
+            index=models.Index(fields=['required_funding'], name='company_funding_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import connection, models
+from django.utils import timezone
 from users.models import User
 from phonenumber_field.modelfields import PhoneNumberField
 from django.core.exceptions import ValidationError
@@ -36,6 +37,13 @@ class CompanyProfile(models.Model):
 
     class Meta:
         verbose_name_plural = "Company"
+        # Filters and facet bands of the company list
+        indexes = [
+            models.Index(fields=["type", "industry"], name="company_type_industry_idx"),
+            models.Index(fields=["industry"], name="company_industry_idx"),
+            models.Index(fields=["company_size"], name="company_size_idx"),
+            models.Index(fields=["required_funding"], name="company_funding_idx"),
+        ]
 
 
 class UserToCompany(models.Model):
@@ -54,7 +62,68 @@ class UserToCompany(models.Model):
     class Meta:
         unique_together = ("user", "company")
         verbose_name_plural = "User to Company"
-        
+
+
+class CompanyFollowersQuerySet(models.QuerySet):
+    def with_companies(self):
+        """Join both companies so ``__str__`` and serializers don't query per row."""
+        return self.select_related("investor", "startup")
+
+    def for_investor(self, investor):
+        return self.filter(investor=investor)
+
+    def followers_of(self, startup):
+        return self.filter(startup=startup)
+
+    def follow(self, investor_id, startup_ids):
+        """
+        Make an investor follow startups in a single ``INSERT ... SELECT``.
+
+        Company types are checked inside the statement: rows are only
+        produced for ids that are startups, and only if the investor is an
+        enterprise. Existing relations are skipped with ``ON CONFLICT DO
+        NOTHING``, so repeating the call is harmless. ``save()``/``clean()``
+        are bypassed; the statement enforces the same rules.
+
+        Returns:
+            dict: ``{startup_id: created_at}`` for the relations created now.
+        """
+        startup_ids = list(startup_ids)
+        if not startup_ids:
+            return {}
+        follows = self.model._meta.db_table
+        companies = CompanyProfile._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {follows} (investor_id, startup_id, created_at)
+                SELECT %s, startup.id, %s FROM {companies} AS startup
+                WHERE startup.id = ANY(%s) AND startup.type = %s
+                  AND EXISTS (
+                    SELECT 1 FROM {companies} AS investor
+                    WHERE investor.id = %s AND investor.type = %s
+                  )
+                ON CONFLICT (investor_id, startup_id) DO NOTHING
+                RETURNING startup_id, created_at
+                """,
+                [
+                    investor_id, timezone.now(), startup_ids, CompanyType.STARTUP,
+                    investor_id, CompanyType.ENTERPRISE,
+                ],
+            )
+            return dict(cursor.fetchall())
+
+    def unfollow(self, investor_id, startup_id):
+        """
+        Remove a follow relation; returns whether one existed.
+
+        The relation has no dependents or delete signals, so Django issues
+        a single ``DELETE`` without loading the row first.
+        """
+        deleted, _ = self.filter(investor_id=investor_id, startup_id=startup_id).delete()
+        return bool(deleted)
+
+
 class CompanyFollowers(models.Model):
     investor = models.ForeignKey(
         CompanyProfile, on_delete=models.CASCADE, related_name="invested_startups",
@@ -64,21 +133,43 @@ class CompanyFollowers(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = CompanyFollowersQuerySet.as_manager()
+
     class Meta:
         unique_together = ("investor", "startup")  
         verbose_name_plural = "Investor-Startup Relations"
 
+    def company_types(self):
+        """
+        Map investor/startup ids to their type.
+
+        Companies already loaded on the instance are used as-is; the rest are
+        fetched in a single query, so validating a relation built from ids
+        costs one round trip instead of two.
+        """
+        types, missing = {}, set()
+        for name in ("investor", "startup"):
+            company_id = getattr(self, f"{name}_id")
+            if self._meta.get_field(name).is_cached(self):
+                types[company_id] = getattr(self, name).type
+            elif company_id is not None:
+                missing.add(company_id)
+        if missing:
+            types.update(CompanyProfile.objects.filter(pk__in=missing).values_list("pk", "type"))
+        return types
+
     def clean(self):
         """Ensure that investor is an enterprise and startup is a startup."""
         errors = {}
+        types = self.company_types()
         
-        if self.investor.type != CompanyType.ENTERPRISE:
+        if types.get(self.investor_id) != CompanyType.ENTERPRISE:
             errors["investor"] = "The company must be an investor (enterprise)."
             
-        if self.startup.type != CompanyType.STARTUP:
+        if types.get(self.startup_id) != CompanyType.STARTUP:
             errors["startup"] = "The company must be a startup."
             
-        if self.investor == self.startup:
+        if self.investor_id == self.startup_id:
             errors["non_self_follow"] = "A company cannot follow itself."
         
         if errors:
@@ -94,3 +185,120 @@ class CompanyFollowers(models.Model):
 
     def __str__(self):
         return f"{self.investor.company_name} follows {self.startup.company_name}"
+
+
+class StartupSimilarity(models.Model):
+    """
+    Precomputed "investors who followed X also followed Y" neighbours.
+
+    Rebuilt offline by ``manage.py build_recommendations``; ``score`` is the
+    cosine similarity of the two startups' follower sets.
+    """
+    startup = models.ForeignKey(
+        CompanyProfile, on_delete=models.CASCADE, related_name="similar_startups",
+    )
+    similar = models.ForeignKey(
+        CompanyProfile, on_delete=models.CASCADE, related_name="+",
+    )
+    score = models.FloatField()
+    co_followers = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ("startup", "similar")
+        verbose_name_plural = "Startup similarities"
+
+
+class StartupRecommendation(models.Model):
+    """Top-K startups recommended to an investor company, served as-is by the API."""
+    investor = models.ForeignKey(
+        CompanyProfile, on_delete=models.CASCADE, related_name="startup_recommendations",
+    )
+    startup = models.ForeignKey(
+        CompanyProfile, on_delete=models.CASCADE, related_name="+",
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ("investor", "startup")
+        indexes = [models.Index(fields=["investor", "rank"], name="startup_rec_investor_rank_idx")]
+
+
+class InvestorFollowDigest(models.Model):
+    """
+    Hash of the follow set an investor's recommendations were built from.
+
+    Lets an incremental refresh find investors whose follows changed,
+    including unfollows, without keeping a copy of the whole graph.
+    """
+    investor = models.OneToOneField(
+        CompanyProfile, on_delete=models.CASCADE, primary_key=True, related_name="+",
+    )
+    follows_digest = models.CharField(max_length=40)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+
+class StartupViewHistory(models.Model):
+    """
+    Latest time a user viewed a company profile.
+
+    Written in batches by companies.view_history.recorder rather than once
+    per page view.
+    """
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="startup_views",
+    )
+    company = models.ForeignKey(
+        CompanyProfile, on_delete=models.CASCADE, related_name="+",
+    )
+    viewed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("user", "company")
+        indexes = [models.Index(fields=["user", "-viewed_at"], name="view_history_user_viewed_idx")]
+        verbose_name_plural = "Startup view history"
+
+
+class ProfileViewEvent(models.Model):
+    """
+    Raw, append-only log of profile views, written by the view history
+    recorder and rolled up into ProfileViewBucket by
+    ``manage.py aggregate_profile_views``.
+    """
+    company = models.ForeignKey(
+        CompanyProfile, on_delete=models.CASCADE, related_name="+",
+    )
+    viewer = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="+",
+    )
+    viewed_at = models.DateTimeField()
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+
+class ProfileViewBucket(models.Model):
+    """Views of a company profile per hour or day, with an approximate count of distinct viewers."""
+
+    class Granularity(models.TextChoices):
+        HOUR = "hour", "Hour"
+        DAY = "day", "Day"
+
+    company = models.ForeignKey(
+        CompanyProfile, on_delete=models.CASCADE, related_name="view_buckets",
+    )
+    granularity = models.CharField(max_length=4, choices=Granularity.choices)
+    start = models.DateTimeField()
+    views = models.PositiveIntegerField(default=0)
+    unique_viewers = models.PositiveIntegerField(default=0)
+    # HyperLogLog registers (companies.analytics.HyperLogLog), so buckets can
+    # be merged into distinct counts for longer periods
+    viewer_sketch = models.BinaryField()
+
+    class Meta:
+        unique_together = ("company", "granularity", "start")
+
+
+class AnalyticsWatermark(models.Model):
+    """Id of the last raw event folded into the buckets, per pipeline."""
+    name = models.CharField(max_length=50, primary_key=True)
+    last_event_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
@@ -1,5 +1,6 @@
 from rest_framework.permissions import BasePermission
 from companies.models import UserToCompany
+from companies.utils import get_token_memberships
 
 class IsCompanyMember(BasePermission):
     """
@@ -17,9 +18,14 @@ class IsCompanyMember(BasePermission):
             bool: True if the user is associated with the company, False otherwise.
         """
         company_id = request.auth.get('company_id', None)
-
-        if not company_id or not UserToCompany.objects.filter(user=request.user, company_id=company_id).exists():
+        if not company_id:
             return False
 
+        # Tokens carry the user's memberships; only older tokens need the database
+        memberships = get_token_memberships(request.auth)
+        if memberships is None or company_id not in memberships:
+            if not UserToCompany.objects.filter(user=request.user, company_id=company_id).exists():
+                return False
+
         request.company_id = company_id
         return True
\ No newline at end of file
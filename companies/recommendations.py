@@ -0,0 +1,203 @@
+"""
+Item-to-item startup recommendations from the follow graph.
+
+"Investors who followed X also followed Y": startups are compared by the
+cosine similarity of their follower sets, computed from the sparse
+investor x startup matrix A as the co-occurrence counts C = AᵀA. Each
+startup keeps its ``neighbours`` most similar startups, and an investor's
+recommendations are the top-K startups by summed similarity to what they
+already follow.
+
+Everything here runs offline (``manage.py build_recommendations``); the API
+only reads the resulting StartupRecommendation rows. SciPy is used for the
+matrix product when it is installed, otherwise a pure-Python loop computes
+the same counts.
+"""
+import hashlib
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import CompanyFollowers, InvestorFollowDigest, StartupRecommendation, StartupSimilarity
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # optional, see co_occurrence_python
+    np = sparse = None
+
+# Scores are stored rounded so reruns on an unchanged graph compare equal
+SCORE_DIGITS = 6
+
+
+def load_follow_graph() -> dict:
+    """Followed startup ids per investor company, read in a single query."""
+    follows = defaultdict(set)
+    for investor_id, startup_id in CompanyFollowers.objects.values_list("investor_id", "startup_id").iterator():
+        follows[investor_id].add(startup_id)
+    return dict(follows)
+
+
+def co_occurrence_python(follows: dict) -> dict:
+    """Count co-followers per startup pair: {x: {y: n}}, x != y."""
+    counts = defaultdict(lambda: defaultdict(int))
+    for startups in follows.values():
+        for x in startups:
+            row = counts[x]
+            for y in startups:
+                if x != y:
+                    row[y] += 1
+    return counts
+
+
+def co_occurrence_scipy(follows: dict) -> dict:
+    """Same as co_occurrence_python, as a sparse AᵀA product."""
+    startup_ids = sorted({s for startups in follows.values() for s in startups})
+    column = {startup_id: i for i, startup_id in enumerate(startup_ids)}
+    rows, cols = [], []
+    for i, startups in enumerate(follows.values()):
+        rows.extend([i] * len(startups))
+        cols.extend(column[s] for s in startups)
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+        shape=(len(follows), len(startup_ids)),
+    )
+    product = (matrix.T @ matrix).tocoo()
+
+    counts = defaultdict(dict)
+    for x, y, n in zip(product.row.tolist(), product.col.tolist(), product.data.tolist()):
+        if x != y:
+            counts[startup_ids[x]][startup_ids[y]] = n
+    return counts
+
+
+def co_occurrence(follows: dict) -> dict:
+    if sparse is not None and follows:
+        return co_occurrence_scipy(follows)
+    return co_occurrence_python(follows)
+
+
+def compute_similarities(follows: dict, neighbours: int) -> dict:
+    """
+    Keep each startup's ``neighbours`` most similar startups.
+
+    Returns:
+        dict: ``{startup_id: [(similar_id, score, co_followers), ...]}`` sorted
+        by descending score, ties broken by id.
+    """
+    follower_counts = defaultdict(int)
+    for startups in follows.values():
+        for startup_id in startups:
+            follower_counts[startup_id] += 1
+
+    similarities = {}
+    for x, row in co_occurrence(follows).items():
+        scored = [
+            (y, round(n / math.sqrt(follower_counts[x] * follower_counts[y]), SCORE_DIGITS), n)
+            for y, n in row.items()
+        ]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        similarities[x] = scored[:neighbours]
+    return similarities
+
+
+def recommend(followed: set, similarities: dict, top_k: int) -> list:
+    """Top-K ``(startup_id, score)`` for one investor, excluding startups they follow."""
+    scores = defaultdict(float)
+    for x in followed:
+        for y, score, _ in similarities.get(x, ()):
+            if y not in followed:
+                scores[y] += score
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return [(y, round(score, SCORE_DIGITS)) for y, score in ranked[:top_k]]
+
+
+def follows_digest(startups: set) -> str:
+    return hashlib.sha1(",".join(map(str, sorted(startups))).encode()).hexdigest()
+
+
+def refresh_recommendations(full=False, top_k=None, neighbours=None) -> dict:
+    """
+    Rebuild the similarity and recommendation tables.
+
+    The co-occurrence matrix is always computed from the whole graph, but
+    only what changed is written: similarity rows of startups whose
+    neighbour list differs from the stored one, and recommendations of
+    investors whose follows changed (by digest) or who follow a startup
+    whose neighbours changed. ``full=True`` rewrites everything.
+
+    Returns:
+        dict: Counts of startups and investors refreshed.
+    """
+    top_k = top_k or settings.RECOMMENDATIONS_TOP_K
+    neighbours = neighbours or settings.RECOMMENDATIONS_NEIGHBOURS
+
+    follows = load_follow_graph()
+    similarities = compute_similarities(follows, neighbours)
+    digests = {investor_id: follows_digest(startups) for investor_id, startups in follows.items()}
+
+    if full:
+        changed_startups = set(similarities) | set(
+            StartupSimilarity.objects.values_list("startup_id", flat=True).distinct()
+        )
+        stale_investors = set(digests) | set(InvestorFollowDigest.objects.values_list("investor_id", flat=True))
+    else:
+        stored = defaultdict(list)
+        for startup_id, similar_id, score, co_followers in (
+            StartupSimilarity.objects.order_by("startup_id", "-score", "similar_id")
+            .values_list("startup_id", "similar_id", "score", "co_followers")
+            .iterator()
+        ):
+            stored[startup_id].append((similar_id, score, co_followers))
+        changed_startups = {
+            startup_id for startup_id in set(similarities) | set(stored)
+            if similarities.get(startup_id, []) != stored.get(startup_id, [])
+        }
+        stored_digests = dict(InvestorFollowDigest.objects.values_list("investor_id", "follows_digest"))
+        stale_investors = {
+            investor_id for investor_id in set(digests) | set(stored_digests)
+            if digests.get(investor_id) != stored_digests.get(investor_id)
+        }
+        stale_investors |= {
+            investor_id for investor_id, startups in follows.items() if startups & changed_startups
+        }
+
+    with transaction.atomic():
+        StartupSimilarity.objects.filter(startup_id__in=changed_startups).delete()
+        StartupSimilarity.objects.bulk_create(
+            (
+                StartupSimilarity(startup_id=x, similar_id=y, score=score, co_followers=n)
+                for x in changed_startups
+                for y, score, n in similarities.get(x, ())
+            ),
+            batch_size=5000,
+        )
+
+        StartupRecommendation.objects.filter(investor_id__in=stale_investors).delete()
+        StartupRecommendation.objects.bulk_create(
+            (
+                StartupRecommendation(investor_id=investor_id, startup_id=y, score=score, rank=rank)
+                for investor_id in stale_investors
+                if investor_id in follows
+                for rank, (y, score) in enumerate(recommend(follows[investor_id], similarities, top_k), start=1)
+            ),
+            batch_size=5000,
+        )
+
+        InvestorFollowDigest.objects.filter(investor_id__in=stale_investors - set(digests)).delete()
+        InvestorFollowDigest.objects.bulk_create(
+            [
+                InvestorFollowDigest(investor_id=investor_id, follows_digest=digests[investor_id])
+                for investor_id in stale_investors
+                if investor_id in digests
+            ],
+            batch_size=5000,
+            update_conflicts=True,
+            unique_fields=["investor"],
+            update_fields=["follows_digest", "refreshed_at"],
+        )
+
+    return {"startups": len(changed_startups), "investors": len(stale_investors)}
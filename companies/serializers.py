@@ -1,6 +1,14 @@
 from rest_framework import serializers
-from .models import CompanyProfile, UserToCompany, CompanyFollowers, CompanyType
+from .models import (
+    CompanyProfile,
+    UserToCompany,
+    CompanyFollowers,
+    CompanyType,
+    StartupRecommendation,
+    StartupViewHistory,
+)
 from django.db import transaction    
+from UA_13XX_bravo.fieldsets import LeanField, LeanSerializer, as_datetime, as_decimal, as_string
     
 
 class CompanyProfileSerializer(serializers.ModelSerializer):
@@ -39,6 +47,22 @@ class CompanyProfileSerializer(serializers.ModelSerializer):
         return value
 
 
+class CompanyProfileListSerializer(LeanSerializer):
+    """Same output as CompanyProfileSerializer, for the list endpoint."""
+    id = LeanField()
+    type = LeanField()
+    company_name = LeanField()
+    description = LeanField()
+    website = LeanField()
+    startup_logo = LeanField()
+    industry = LeanField()
+    required_funding = LeanField(convert=as_decimal)
+    company_size = LeanField()
+    phone_number = LeanField(convert=as_string)
+    created_at = LeanField(convert=as_datetime)
+    updated_at = LeanField(convert=as_datetime)
+
+
 class UserToCompanySerializer(serializers.ModelSerializer):
     class Meta:
         model = UserToCompany
@@ -75,6 +99,15 @@ class UserToCompanySerializer(serializers.ModelSerializer):
         return data
     
 
+class UserToCompanyListSerializer(LeanSerializer):
+    """Same output as UserToCompanySerializer, for the list endpoint."""
+    id = LeanField()
+    created_at = LeanField(convert=as_datetime)
+    updated_at = LeanField(convert=as_datetime)
+    user = LeanField("user_id", model_fields=("user",))
+    company = LeanField("company_id", model_fields=("company",))
+
+
 class CompanyRegistrationSerializer(serializers.ModelSerializer):
     """
     Serializer for registering a new company.
@@ -133,4 +166,28 @@ class CompanyFollowersSerializer(serializers.ModelSerializer):
 class FollowedStartupSerializer(serializers.ModelSerializer):
     class Meta:
         model = CompanyProfile
-        fields = ["id", "company_name", "description", "website", "startup_logo"]
\ No newline at end of file
+        fields = ["id", "company_name", "description", "website", "startup_logo"]
+
+
+class FollowStartupsBatchSerializer(serializers.Serializer):
+    startup_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+    )
+
+
+class StartupRecommendationSerializer(serializers.ModelSerializer):
+    startup = FollowedStartupSerializer(read_only=True)
+
+    class Meta:
+        model = StartupRecommendation
+        fields = ["rank", "score", "startup"]
+
+
+class StartupViewHistorySerializer(serializers.ModelSerializer):
+    company_name = serializers.CharField(source="company.company_name", read_only=True)
+
+    class Meta:
+        model = StartupViewHistory
+        fields = ["company", "company_name", "viewed_at"]
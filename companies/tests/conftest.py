@@ -1,6 +1,7 @@
 import pytest
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
+from companies import view_history
 from companies.models import CompanyProfile
 
 User = get_user_model()
@@ -31,4 +32,11 @@ def another_user(db):
     return User.objects.create_user(
         email="another@example.com",
         password="testpass123"
-    )
\ No newline at end of file
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_view_history_buffer():
+    """Profile views recorded by one test must not be flushed into another."""
+    yield
+    view_history.recorder.discard()
@@ -0,0 +1,72 @@
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+
+from companies.filters import company_facets
+from companies.models import CompanyProfile, CompanyType
+
+URL = reverse("companyprofile-list")
+
+
+@pytest.fixture
+def catalog(db):
+    def make(name, industry, type, size, funding):
+        return CompanyProfile.objects.create(
+            company_name=name, description="", industry=industry, type=type,
+            company_size=size, required_funding=Decimal(funding),
+        )
+
+    return [
+        make("Pay", "Fintech", CompanyType.STARTUP, 8, "50000"),
+        make("Ledger", "Fintech", CompanyType.STARTUP, 40, "500000"),
+        make("Clinic", "Health", CompanyType.STARTUP, 150, "2000000"),
+        make("Bank", "Fintech", CompanyType.ENTERPRISE, 5000, "0"),
+        make("Aid", None, CompanyType.NONPROFIT, None, "0"),
+    ]
+
+
+def facet(data, name):
+    return {row["value"]: row["count"] for row in data["facets"][name]}
+
+
+def test_filters_combine(api_client, test_user, catalog):
+    api_client.force_authenticate(user=test_user)
+
+    response = api_client.get(URL, {
+        "industry": "Fintech,Health", "type": "startup",
+        "company_size_min": 10, "required_funding_max": 1000000,
+    })
+
+    assert response.status_code == 200
+    assert [c["company_name"] for c in response.data["results"]] == ["Ledger"]
+    assert response.data["count"] == 1
+
+
+def test_page_and_facets_in_two_queries(api_client, test_user, catalog, django_assert_num_queries):
+    api_client.force_authenticate(user=test_user)
+
+    with django_assert_num_queries(2):  # grouped facet query + page
+        response = api_client.get(URL, {"type": "startup", "limit": 2})
+
+    assert response.data["count"] == 3
+    assert len(response.data["results"]) == 2
+    assert response.data["next"] is not None
+    assert facet(response.data, "industry") == {"Fintech": 2, "Health": 1}
+    assert facet(response.data, "type") == {"startup": 3, "enterprise": 0, "nonprofit": 0}
+    assert facet(response.data, "company_size") == {"1-10": 1, "11-50": 1, "51-200": 1, "201-1000": 0, "1000+": 0}
+    assert facet(response.data, "required_funding") == {"<100k": 1, "100k-1M": 1, "1M-10M": 1, "10M+": 0}
+
+
+def test_facets_of_unfiltered_catalog(catalog):
+    total, facets = company_facets(CompanyProfile.objects.all())
+
+    assert total == 5
+    assert {row["value"]: row["count"] for row in facets["industry"]} == {"Fintech": 3, "Health": 1}
+    assert facets["company_size"][-1] == {"value": "1000+", "min": 1001, "max": None, "count": 1}
+
+
+def test_invalid_filter_is_rejected(api_client, test_user, catalog):
+    api_client.force_authenticate(user=test_user)
+
+    assert api_client.get(URL, {"type": "charity"}).status_code == 400
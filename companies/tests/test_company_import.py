@@ -0,0 +1,104 @@
+import json
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from companies.models import CompanyProfile, CompanyType, UserToCompany
+from companies.utils import bulk_create_companies
+
+URL = reverse("companyprofile-bulk-import")
+
+
+def company(name, **extra):
+    return {"company_name": name, "description": "About", "type": CompanyType.STARTUP, **extra}
+
+
+def test_valid_rows_are_created_with_owner_links(test_user, django_assert_max_num_queries):
+    rows = [
+        company("Acme", required_funding="1500.50", company_size="12", phone_number="+380501234567",
+                website="https://acme.example", owner=test_user.email.upper()),
+        company("Beta", type=CompanyType.ENTERPRISE),
+    ]
+
+    with django_assert_max_num_queries(8):
+        results = bulk_create_companies(rows)
+
+    assert [result["status"] for result in results] == ["created", "created"]
+    acme = CompanyProfile.objects.get(pk=results[0]["id"])
+    assert acme.required_funding == Decimal("1500.50")
+    assert acme.company_size == 12
+    assert str(acme.phone_number) == "+380501234567"
+    assert acme.created_at is not None
+    assert CompanyProfile.objects.get(pk=results[1]["id"]).required_funding == Decimal("0.00")
+    assert list(UserToCompany.objects.values_list("user_id", "company_id")) == [(test_user.id, acme.id)]
+
+
+def test_invalid_rows_are_reported(test_user, test_companies):
+    UserToCompany.objects.create(user=test_user, company=CompanyProfile.objects.create(
+        company_name="Owned", description="", type=CompanyType.STARTUP,
+    ))
+    rows = [
+        company("AlphaTech"),
+        company("Fresh"),
+        company("Fresh"),
+        company("", type="bank"),
+        company("Money", required_funding="1.234", company_size="-1", website="nope", phone_number="12"),
+        company("Second", owner=test_user.email),
+        company("Ghost", owner="nobody@example.com"),
+    ]
+
+    results = bulk_create_companies(rows)
+
+    assert [result["status"] for result in results] == [
+        "invalid", "created", "invalid", "invalid", "invalid", "invalid", "invalid",
+    ]
+    assert results[0]["errors"] == {"company_name": "A company with this name already exists."}
+    assert results[2]["errors"] == {"company_name": "A company with this name already exists."}
+    assert set(results[3]["errors"]) == {"company_name", "type"}
+    assert set(results[4]["errors"]) == {"required_funding", "company_size", "website", "phone_number"}
+    assert "same type" in results[5]["errors"]["owner"]
+    assert results[6]["errors"] == {"owner": "User not found."}
+
+
+def test_dry_run_saves_nothing(db):
+    results = bulk_create_companies([company("Acme")], dry_run=True)
+
+    assert results == [{"row": 0, "status": "valid"}]
+    assert not CompanyProfile.objects.exists()
+
+
+def test_command_streams_ndjson(db, tmp_path, capsys):
+    path = tmp_path / "companies.ndjson"
+    path.write_text("\n".join(json.dumps(company(f"C{i}")) for i in range(5)) + "\n" + json.dumps(company("C0")))
+
+    call_command("import_companies", path, "--batch-size", 2)
+
+    assert CompanyProfile.objects.count() == 5
+    captured = capsys.readouterr()
+    assert "Row 6: {'company_name'" in captured.err
+    assert "Imported 5 companies, 1 rows failed." in captured.out
+
+
+def test_command_owner(test_user, tmp_path):
+    path = tmp_path / "companies.csv"
+    path.write_text("company_name,description,type\nAcme,About,startup\nFund,About,enterprise\n")
+
+    call_command("import_companies", path, "--owner", test_user.email)
+
+    assert set(UserToCompany.objects.filter(user=test_user).values_list("company__company_name", flat=True)) == {
+        "Acme", "Fund",
+    }
+
+
+def test_endpoint_is_staff_only(api_client, test_user):
+    api_client.force_authenticate(user=test_user)
+    assert api_client.post(URL, {"rows": [company("Acme")]}, format="json").status_code == 403
+
+    test_user.is_staff = True
+    test_user.save()
+    response = api_client.post(URL, {"rows": [company("Acme"), company("")]}, format="json")
+
+    assert response.status_code == 201
+    assert (response.data["created"], response.data["failed"]) == (1, 1)
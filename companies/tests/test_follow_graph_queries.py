@@ -0,0 +1,56 @@
+import pytest
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+from companies.models import CompanyFollowers, CompanyProfile, CompanyType
+
+
+@pytest.fixture
+def graph(db):
+    investors = CompanyProfile.objects.bulk_create(
+        CompanyProfile(company_name=f"Fund {i}", description="", type=CompanyType.ENTERPRISE) for i in range(5)
+    )
+    startups = CompanyProfile.objects.bulk_create(
+        CompanyProfile(company_name=f"Startup {i}", description="", type=CompanyType.STARTUP) for i in range(4)
+    )
+    CompanyFollowers.objects.bulk_create(
+        CompanyFollowers(investor=investor, startup=startup) for investor in investors for startup in startups
+    )
+    return investors, startups
+
+
+def test_clean_loads_types_from_ids_in_one_query(graph, django_assert_num_queries):
+    investors, startups = graph
+
+    with django_assert_num_queries(1):
+        CompanyFollowers(investor_id=investors[0].pk, startup_id=startups[0].pk).clean()
+
+    with django_assert_num_queries(1):
+        with pytest.raises(ValidationError) as excinfo:
+            CompanyFollowers(investor_id=startups[0].pk, startup_id=investors[0].pk).clean()
+    assert set(excinfo.value.message_dict) == {"investor", "startup"}
+
+
+def test_clean_uses_loaded_companies(graph, django_assert_num_queries):
+    investors, startups = graph
+
+    with django_assert_num_queries(0):
+        CompanyFollowers(investor=investors[0], startup=startups[0]).clean()
+
+
+def test_with_companies_renders_without_extra_queries(graph, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        names = [str(follow) for follow in CompanyFollowers.objects.with_companies()]
+
+    assert len(names) == 20
+    assert "Fund 0 follows Startup 0" in names
+
+
+def test_admin_changelist_query_count_is_constant(graph, admin_client, django_assert_max_num_queries):
+    url = reverse("admin:companies_companyfollowers_changelist")
+
+    with django_assert_max_num_queries(8):
+        response = admin_client.get(url)
+
+    assert response.status_code == 200
+    assert b"Fund 4 follows Startup 3" in response.content
@@ -0,0 +1,86 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from companies.models import CompanyFollowers, CompanyProfile, CompanyType, UserToCompany
+from users.models import User
+from users.serializers import CustomTokenObtainPairSerializer
+
+
+@pytest.fixture
+def investor(db):
+    user = User.objects.create_user(email="fund@example.com", password="StrongPass123!")
+    company = CompanyProfile.objects.create(company_name="Fund", type=CompanyType.ENTERPRISE)
+    UserToCompany.objects.create(user=user, company=company)
+    return user, company
+
+
+@pytest.fixture
+def client(investor):
+    token = CustomTokenObtainPairSerializer.get_token(investor[0]).access_token
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+@pytest.fixture
+def startups(db):
+    return [
+        CompanyProfile.objects.create(company_name=f"Startup {i}", type=CompanyType.STARTUP)
+        for i in range(3)
+    ]
+
+
+def test_follow_checks_types_in_the_statement(investor, startups):
+    _, fund = investor
+    other_fund = CompanyProfile.objects.create(company_name="Other Fund", type=CompanyType.ENTERPRISE)
+
+    created = CompanyFollowers.objects.follow(fund.id, [startups[0].id, other_fund.id, 999999])
+    assert list(created) == [startups[0].id]
+
+    assert CompanyFollowers.objects.follow(fund.id, [startups[0].id]) == {}
+    assert CompanyFollowers.objects.follow(startups[1].id, [startups[2].id]) == {}
+    assert CompanyFollowers.objects.count() == 1
+
+
+def test_follow_and_unfollow_are_single_statements(client, startups, django_assert_num_queries):
+    startup_id = startups[0].id
+
+    with django_assert_num_queries(2):  # JWT user + INSERT
+        response = client.post(reverse("follow-startup", kwargs={"startup_id": startup_id}))
+    assert response.status_code == 201
+    assert response.data["startup"] == startup_id
+
+    with django_assert_num_queries(2):  # JWT user + DELETE
+        response = client.post(reverse("unfollow-startup", kwargs={"startup_id": startup_id}))
+    assert response.status_code == 200
+    assert not CompanyFollowers.objects.exists()
+
+
+def test_failed_follow_explains_itself(client, investor, startups):
+    url = reverse("follow-startup", kwargs={"startup_id": startups[0].id})
+    client.post(url)
+
+    assert client.post(url).data["detail"] == "You are already following this startup."
+    assert client.post(reverse("follow-startup", kwargs={"startup_id": investor[1].id})).status_code == 404
+    assert client.post(reverse("unfollow-startup", kwargs={"startup_id": startups[1].id})).status_code == 400
+    assert client.post(reverse("unfollow-startup", kwargs={"startup_id": 999999})).status_code == 404
+
+
+def test_batch_follow(client, investor, startups, django_assert_max_num_queries):
+    CompanyFollowers.objects.create(investor=investor[1], startup=startups[0])
+    ids = [startups[0].id, startups[1].id, investor[1].id, startups[2].id, startups[1].id]
+
+    with django_assert_max_num_queries(3):
+        response = client.post(reverse("follow-startups-batch"), {"startup_ids": ids}, format="json")
+
+    assert response.status_code == 201
+    assert response.data == {
+        "followed": [startups[1].id, startups[2].id],
+        "already_following": [startups[0].id],
+        "not_found": [investor[1].id],
+    }
+
+    response = client.post(reverse("follow-startups-batch"), {"startup_ids": ids}, format="json")
+    assert response.status_code == 200
+    assert response.data["followed"] == []
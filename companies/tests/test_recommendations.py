@@ -0,0 +1,97 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from companies import recommendations
+from companies.models import (
+    CompanyFollowers,
+    CompanyProfile,
+    CompanyType,
+    StartupRecommendation,
+    StartupSimilarity,
+    UserToCompany,
+)
+from users.models import User
+from users.serializers import CustomTokenObtainPairSerializer
+
+
+@pytest.fixture
+def graph(db):
+    """Three funds; A and B share taste, C only overlaps on s1."""
+    funds = {
+        name: CompanyProfile.objects.create(company_name=f"Fund {name}", type=CompanyType.ENTERPRISE)
+        for name in "ABC"
+    }
+    startups = {
+        name: CompanyProfile.objects.create(company_name=name, type=CompanyType.STARTUP)
+        for name in ("s1", "s2", "s3", "s4")
+    }
+    for fund, followed in {"A": ["s1", "s2", "s3"], "B": ["s1", "s2"], "C": ["s1", "s4"]}.items():
+        for startup in followed:
+            CompanyFollowers.objects.create(investor=funds[fund], startup=startups[startup])
+    return funds, startups
+
+
+def recommended(fund):
+    return list(
+        StartupRecommendation.objects.filter(investor=fund)
+        .order_by("rank")
+        .values_list("startup__company_name", flat=True)
+    )
+
+
+def test_python_and_scipy_co_occurrence_agree(graph):
+    pytest.importorskip("scipy")
+    follows = recommendations.load_follow_graph()
+
+    python = recommendations.co_occurrence_python(follows)
+    scipy = recommendations.co_occurrence_scipy(follows)
+
+    assert {x: dict(row) for x, row in python.items()} == {x: dict(row) for x, row in scipy.items()}
+
+
+def test_build_recommendations(graph, monkeypatch):
+    funds, startups = graph
+    # Exercise the fallback regardless of what is installed
+    monkeypatch.setattr(recommendations, "sparse", None)
+
+    call_command("build_recommendations")
+
+    assert recommended(funds["B"]) == ["s3", "s4"]
+    assert recommended(funds["C"]) == ["s2", "s3"]
+    assert recommended(funds["A"]) == ["s4"]
+    assert not StartupSimilarity.objects.filter(startup=startups["s1"], similar=startups["s1"]).exists()
+
+
+def test_incremental_refresh_only_touches_changes(graph):
+    funds, startups = graph
+    recommendations.refresh_recommendations()
+
+    assert recommendations.refresh_recommendations() == {"startups": 0, "investors": 0}
+
+    CompanyFollowers.objects.filter(investor=funds["C"], startup=startups["s4"]).delete()
+    stats = recommendations.refresh_recommendations()
+
+    assert stats["startups"] == 2  # s1 and s4 lost C's co-follow
+    assert recommended(funds["A"]) == []
+    assert recommended(funds["C"]) == ["s2", "s3"]
+    assert recommendations.refresh_recommendations(full=True)["investors"] == 3
+
+
+def test_recommended_startups_endpoint(graph, django_assert_max_num_queries):
+    funds, _ = graph
+    user = User.objects.create_user(email="fund-b@example.com", password="StrongPass123!")
+    UserToCompany.objects.create(user=user, company=funds["B"])
+    recommendations.refresh_recommendations()
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {CustomTokenObtainPairSerializer.get_token(user).access_token}"
+    )
+
+    with django_assert_max_num_queries(2):  # JWT user + recommendations
+        response = client.get(reverse("recommended-startups"))
+
+    assert response.status_code == 200
+    assert [r["startup"]["company_name"] for r in response.data] == ["s3", "s4"]
+    assert response.data[0]["rank"] == 1
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from companies.analytics import HyperLogLog, aggregate_profile_views
+from companies.models import CompanyProfile, CompanyType, ProfileViewBucket, ProfileViewEvent, UserToCompany
+from companies.view_history import ViewHistoryRecorder
+from users.models import User
+from users.serializers import CustomTokenObtainPairSerializer
+
+
+@pytest.fixture(autouse=True)
+def no_settle_delay(settings):
+    settings.PROFILE_VIEW_SETTLE_SECONDS = 0
+
+
+@pytest.fixture
+def startup(db):
+    return CompanyProfile.objects.create(company_name="Watched", type=CompanyType.STARTUP)
+
+
+@pytest.fixture
+def viewers(db):
+    return User.objects.bulk_create(User(email=f"viewer{i}@example.com") for i in range(5))
+
+
+def record(startup, viewers, when):
+    recorder = ViewHistoryRecorder(flush_seconds=3600, max_pending=10000)
+    for viewer, minutes in when:
+        recorder.record(viewers[viewer].id, startup.id, minutes)
+    recorder.flush()
+
+
+@pytest.mark.parametrize("n", [0, 1, 50, 1000, 20000])
+def test_hyperloglog_estimates_distinct_counts(n):
+    sketch = HyperLogLog()
+    for i in range(n):
+        sketch.add(i)
+        sketch.add(i)
+
+    assert abs(sketch.count() - n) <= max(1, n * 0.1)
+
+    other = HyperLogLog()
+    for i in range(n, 2 * n):
+        other.add(i)
+    assert abs(HyperLogLog(bytes(sketch)).merge(other).count() - 2 * n) <= max(1, n * 0.2)
+
+
+def test_events_roll_up_incrementally(startup, viewers, django_assert_max_num_queries):
+    day = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+    record(startup, viewers, [(0, day + timedelta(hours=9)), (0, day + timedelta(hours=9, minutes=5)),
+                              (1, day + timedelta(hours=10))])
+    assert ProfileViewEvent.objects.count() == 3
+
+    # Independent of the number of events: watermark, events, buckets, upsert
+    with django_assert_max_num_queries(10):
+        assert aggregate_profile_views() == 3
+    assert aggregate_profile_views() == 0
+
+    record(startup, viewers, [(2, day + timedelta(hours=10, minutes=30)), (1, day + timedelta(hours=23))])
+    call_command("aggregate_profile_views")
+
+    buckets = {
+        (b.granularity, b.start.hour): (b.views, b.unique_viewers)
+        for b in ProfileViewBucket.objects.filter(company=startup)
+    }
+    assert buckets == {
+        ("hour", 9): (2, 1),
+        ("hour", 10): (2, 2),
+        ("hour", 23): (1, 1),
+        ("day", 0): (5, 3),
+    }
+
+
+def test_recent_events_wait_to_settle(startup, viewers, settings):
+    settings.PROFILE_VIEW_SETTLE_SECONDS = 60
+    record(startup, viewers, [(0, timezone.now())])
+
+    assert aggregate_profile_views() == 0
+
+
+def test_unsettled_event_holds_back_later_ids(startup, viewers, settings):
+    settings.PROFILE_VIEW_SETTLE_SECONDS = 60
+    now = timezone.now()
+    ProfileViewEvent.objects.create(company=startup, viewer=viewers[0], viewed_at=now, recorded_at=now)
+    ProfileViewEvent.objects.create(
+        company=startup, viewer=viewers[1], viewed_at=now, recorded_at=now - timedelta(minutes=5),
+    )
+
+    assert aggregate_profile_views() == 0
+    settings.PROFILE_VIEW_SETTLE_SECONDS = 0
+    assert aggregate_profile_views() == 2
+
+
+def test_dashboard_reads_buckets(startup, viewers, django_assert_max_num_queries):
+    now = timezone.now()
+    record(startup, viewers, [(i % 3, now - timedelta(days=i % 2)) for i in range(6)])
+    aggregate_profile_views()
+    owner = User.objects.create_user(email="owner@example.com", password="StrongPass123!")
+    UserToCompany.objects.create(user=owner, company=startup)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {CustomTokenObtainPairSerializer.get_token(owner).access_token}")
+
+    with django_assert_max_num_queries(2):  # JWT user + buckets
+        response = client.get(reverse("company-view-analytics"), {"days": 7})
+
+    assert response.status_code == 200
+    assert response.data["views"] == 6
+    assert response.data["unique_viewers"] == 3
+    assert len(response.data["buckets"]) == 2
+
+    assert client.get(reverse("company-view-analytics"), {"granularity": "week"}).status_code == 400
+    assert client.get(reverse("company-view-analytics"), {"days": 1000}).status_code == 400
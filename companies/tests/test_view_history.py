@@ -0,0 +1,115 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from companies import view_history
+from companies.models import CompanyProfile, CompanyType, StartupViewHistory
+from companies.view_history import ViewHistoryRecorder
+
+
+@pytest.fixture
+def startups(db):
+    return [
+        CompanyProfile.objects.create(company_name=f"Viewed {i}", type=CompanyType.STARTUP)
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+def test_views_are_coalesced_into_one_upsert(test_user, startups, django_assert_num_queries):
+    recorder = ViewHistoryRecorder(flush_seconds=3600, max_pending=100)
+    now = timezone.now()
+
+    with django_assert_num_queries(0):
+        for minutes in range(50):
+            recorder.record(test_user.id, startups[minutes % 2].id, now + timedelta(minutes=minutes))
+
+    # company check + history upsert + event insert (plus savepoint statements)
+    with django_assert_num_queries(5):
+        assert recorder.flush() == 2
+
+    latest = dict(StartupViewHistory.objects.values_list("company_id", "viewed_at"))
+    assert latest == {startups[0].id: now + timedelta(minutes=48), startups[1].id: now + timedelta(minutes=49)}
+
+    recorder.record(test_user.id, startups[0].id, now + timedelta(hours=1))
+    recorder.flush()
+    assert StartupViewHistory.objects.count() == 2
+    assert StartupViewHistory.objects.get(company=startups[0]).viewed_at == now + timedelta(hours=1)
+
+
+def test_recorder_flushes_when_buffer_is_full(test_user, startups):
+    recorder = ViewHistoryRecorder(flush_seconds=3600, max_pending=2)
+
+    recorder.record(test_user.id, startups[0].id)
+    assert not StartupViewHistory.objects.exists()
+    recorder.record(test_user.id, startups[1].id)
+
+    assert StartupViewHistory.objects.count() == 2
+
+
+def test_flush_drops_deleted_companies(test_user, startups):
+    recorder = ViewHistoryRecorder(flush_seconds=3600)
+    recorder.record(test_user.id, startups[0].id)
+    recorder.record(test_user.id, 999999)
+
+    assert recorder.flush() == 1
+
+
+def test_history_endpoints(client, test_user, startups):
+    client.get(reverse("companyprofile-detail", kwargs={"pk": startups[0].id}))
+    response = client.post(reverse("startup-view-history-mark-viewed", kwargs={"pk": startups[1].id}))
+    assert response.status_code == 202
+
+    response = client.get(reverse("startup-view-history-list"))
+    assert response.status_code == 200
+    assert [row["company_name"] for row in response.data["results"]] == ["Viewed 1", "Viewed 0"]
+
+    client.post(reverse("startup-view-history-mark-viewed", kwargs={"pk": startups[2].id}))
+    response = client.delete(reverse("startup-view-history-clear-history"))
+    assert response.data["message"] == "Successfully cleared 2 viewed startup(s)."
+    view_history.recorder.flush()
+    assert not StartupViewHistory.objects.filter(user=test_user).exists()
+
+
+def test_mark_viewed_rejects_unknown_startups(client, test_user):
+    enterprise = CompanyProfile.objects.create(company_name="Big Co", type=CompanyType.ENTERPRISE)
+
+    for pk in ("abc", 999999, enterprise.id):
+        response = client.post(reverse("startup-view-history-mark-viewed", kwargs={"pk": pk}))
+        assert response.status_code == 404
+    assert not view_history.recorder._pending
+
+
+def test_listing_flushes_only_own_views(client, test_user, another_user, startups):
+    view_history.recorder.record(another_user.id, startups[0].id)
+    client.post(reverse("startup-view-history-mark-viewed", kwargs={"pk": startups[1].id}))
+
+    response = client.get(reverse("startup-view-history-list"))
+
+    assert [row["company_name"] for row in response.data["results"]] == ["Viewed 1"]
+    assert list(StartupViewHistory.objects.values_list("user_id", flat=True)) == [test_user.id]
+    assert list(view_history.recorder._pending) == [(another_user.id, startups[0].id)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_recorder_flushes_on_a_timer(test_user, startups):
+    recorder = ViewHistoryRecorder(flush_seconds=0.05, max_pending=100)
+    try:
+        recorder.record(test_user.id, startups[0].id)
+        deadline = time.monotonic() + 5
+        while not StartupViewHistory.objects.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        recorder.stop()
+
+    assert list(StartupViewHistory.objects.values_list("company_id", flat=True)) == [startups[0].id]
@@ -5,6 +5,10 @@ from .views import (
     RegisterCompanyView,
     UserToCompanyViewSet,
     FollowStartupView,
+    FollowStartupsBatchView,
+    RecommendedStartupsView,
+    CompanyViewAnalyticsView,
+    StartupViewHistoryViewSet,
     ListFollowedStartupsView, 
     UnFollowStartupView 
 )
@@ -12,11 +16,15 @@ from .views import (
 router = DefaultRouter()
 router.register(r"company", CompanyProfileViewSet, basename="companyprofile")
 router.register(r"user-to-company", UserToCompanyViewSet, basename="user-to-company")
+router.register(r"startup-view-history", StartupViewHistoryViewSet, basename="startup-view-history")
 
 urlpatterns = [
     path("", include(router.urls)),
     path("register/", RegisterCompanyView.as_view(), name="register_company"),
     path("startups/<int:startup_id>/save/", FollowStartupView.as_view(), name="follow-startup"),
     path("investor/saved-startups", ListFollowedStartupsView.as_view(), name='list-followed-stastups'),
+    path("investor/saved-startups/batch/", FollowStartupsBatchView.as_view(), name="follow-startups-batch"),
+    path("investor/recommended-startups/", RecommendedStartupsView.as_view(), name="recommended-startups"),
+    path("company-analytics/views/", CompanyViewAnalyticsView.as_view(), name="company-view-analytics"),
     path("startups/<int:startup_id>/unsave/", UnFollowStartupView.as_view(), name="unfollow-startup"),
 ]
@@ -0,0 +1,215 @@
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import transaction
+from django.utils import timezone
+from phonenumber_field.phonenumber import to_python as to_phone_number
+
+from UA_13XX_bravo.imports import copy_insert, existing_values, reserve_ids
+from .models import CompanyProfile, CompanyType, UserToCompany
+
+User = get_user_model()
+
+# JWT claim holding the user's memberships as {"<company_id>": "<company_type>"}
+MEMBERSHIPS_CLAIM = "companies"
+
+
+def get_membership_claims(user) -> dict:
+    """
+    Load all of the user's company memberships in a single query.
+
+    Returns:
+        dict: Company types keyed by company id (as a string, so the mapping
+        can be embedded in a JWT as-is), in membership creation order.
+    """
+    memberships = (
+        UserToCompany.objects.filter(user=user)
+        .order_by("id")
+        .values_list("company_id", "company__type")
+    )
+    return {str(company_id): company_type for company_id, company_type in memberships}
+
+
+def get_token_memberships(token) -> dict | None:
+    """
+    Read the memberships embedded in a validated JWT.
+
+    Returns:
+        dict | None: Company types keyed by integer company id, or None when
+        there is no token or it was issued before the claim existed.
+    """
+    if token is None:
+        return None
+    claims = token.get(MEMBERSHIPS_CLAIM)
+    if claims is None:
+        return None
+    return {int(company_id): company_type for company_id, company_type in claims.items()}
+
+
+COMPANY_TYPES = {value for value, _ in CompanyType.CHOICES}
+MAX_REQUIRED_FUNDING = Decimal("9999999999.99")
+_validate_url = URLValidator()
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_url(url):
+    # Imports repeat the same few sites and logo hosts; URLValidator is slow
+    try:
+        _validate_url(url)
+    except ValidationError:
+        return False
+    return True
+
+
+IMPORT_FIELDS = (
+    "company_name", "description", "type", "website", "startup_logo", "industry",
+    "required_funding", "company_size", "phone_number", "owner",
+)
+
+
+def _parse_company(row):
+    """Validate one import row; returns (values, owner email, errors)."""
+    fields = {}
+    for key in IMPORT_FIELDS:
+        value = row.get(key)
+        fields[key] = "" if value is None else str(value).strip()
+
+    errors = {}
+    name = fields["company_name"]
+    if not name:
+        errors["company_name"] = "Company name cannot be empty."
+    elif len(name) > 255:
+        errors["company_name"] = "Ensure this field has no more than 255 characters."
+
+    if not fields["description"]:
+        errors["description"] = "This field may not be blank."
+
+    if fields["type"] not in COMPANY_TYPES:
+        errors["type"] = "Invalid company type. Choose from: {}".format(", ".join(sorted(COMPANY_TYPES)))
+
+    for key in ("website", "startup_logo"):
+        if fields[key] and not _is_valid_url(fields[key]):
+            errors[key] = "Enter a valid URL."
+
+    funding = Decimal("0.00")
+    if fields["required_funding"]:
+        try:
+            funding = Decimal(fields["required_funding"])
+        except InvalidOperation:
+            errors["required_funding"] = "A valid number is required."
+        else:
+            if not funding.is_finite() or funding.as_tuple().exponent < -2:
+                errors["required_funding"] = "Ensure that there are no more than 2 decimal places."
+            elif not 0 <= funding <= MAX_REQUIRED_FUNDING:
+                errors["required_funding"] = "Ensure this value is between 0 and 9999999999.99."
+
+    size = None
+    if fields["company_size"]:
+        try:
+            size = int(fields["company_size"])
+        except ValueError:
+            errors["company_size"] = "A valid integer is required."
+        else:
+            if size < 0:
+                errors["company_size"] = "Ensure this value is greater than or equal to 0."
+
+    phone = None
+    if fields["phone_number"]:
+        phone = to_phone_number(fields["phone_number"])
+        if phone is None or not phone.is_valid():
+            errors["phone_number"] = "Enter a valid phone number."
+        else:
+            phone = phone.as_e164
+
+    values = {
+        "company_name": name,
+        "description": fields["description"],
+        "type": fields["type"],
+        "website": fields["website"] or None,
+        "startup_logo": fields["startup_logo"],
+        "industry": fields["industry"] or None,
+        "required_funding": funding,
+        "company_size": size,
+        "phone_number": phone,
+    }
+    return values, fields["owner"].lower(), errors
+
+
+def bulk_create_companies(rows, owner=None, dry_run=False):
+    """
+    Validate and insert many company profiles in one transaction.
+
+    Rows are dicts with the CompanyProfile fields and, optionally,
+    ``owner`` (a user's email); owners are linked to their companies like
+    company registration does, including its one-company-per-type rule.
+    ``owner`` is used for rows without one. Names are checked for
+    uniqueness against the names of the batch loaded in one query, plus
+    the batch itself; owners and their existing memberships are loaded in
+    one query each. Valid rows get ids drawn from the sequence in one query
+    and are written with ``COPY FROM``.
+
+    Args:
+        rows (list[dict]): The rows to import.
+        owner (User | None): Default owner.
+        dry_run (bool): Validate only.
+
+    Returns:
+        list[dict]: One result per row, in input order, with ``row``,
+        ``status`` (``created``, ``valid`` on dry runs, or ``invalid``) and
+        either ``id`` or ``errors``.
+    """
+    parsed = [_parse_company(row) for row in rows]
+    names = {values["company_name"] for values, _, errors in parsed if not errors}
+    emails = {email for _, email, errors in parsed if not errors and email}
+
+    results = []
+    with transaction.atomic():
+        taken = existing_values(CompanyProfile, "company_name", names)
+        users = {email.lower(): pk for email, pk in User.objects.filter(email__in=emails).values_list("email", "pk")}
+        if owner is not None:
+            users[""] = owner.pk
+        owned_types = set(
+            UserToCompany.objects.filter(user_id__in=set(users.values())).values_list("user_id", "company__type")
+        )
+
+        valid = []
+        for index, (values, email, errors) in enumerate(parsed):
+            user_id = users.get(email)
+            if not errors:
+                if values["company_name"] in taken:
+                    errors["company_name"] = "A company with this name already exists."
+                if email and user_id is None:
+                    errors["owner"] = "User not found."
+                elif user_id is not None and (user_id, values["type"]) in owned_types:
+                    errors["owner"] = "This user is already linked to another company with the same type."
+            if errors:
+                results.append({"row": index, "status": "invalid", "errors": errors})
+                continue
+
+            taken.add(values["company_name"])
+            if user_id is not None:
+                owned_types.add((user_id, values["type"]))
+            valid.append((index, values, user_id))
+            results.append({"row": index, "status": "valid"})
+
+        if dry_run or not valid:
+            return results
+
+        now = timezone.now()
+        ids = reserve_ids(CompanyProfile, len(valid))
+        columns = ["id", *valid[0][1], "created_at", "updated_at"]
+        copy_insert(
+            CompanyProfile, columns, ([pk, *values.values(), now, now] for pk, (_, values, _) in zip(ids, valid))
+        )
+        copy_insert(
+            UserToCompany,
+            ["user_id", "company_id", "created_at", "updated_at"],
+            ((user_id, pk, now, now) for pk, (_, _, user_id) in zip(ids, valid) if user_id is not None),
+        )
+        for pk, (index, _, _) in zip(ids, valid):
+            results[index].update(status="created", id=pk)
+
+    return results
@@ -0,0 +1,149 @@
+"""
+Buffered recording of company profile views.
+
+A page view only updates an in-process dict keyed by (user, company), so
+repeated views of the same profile coalesce into one pending entry holding
+the latest timestamp, and appends a raw event for analytics. Pending
+entries are written with a single bulk upsert (and the events with a
+single bulk insert) every ``VIEW_HISTORY_FLUSH_SECONDS`` by a background
+thread, as soon as ``VIEW_HISTORY_MAX_PENDING`` entries are waiting, and
+at interpreter exit. History can therefore lag behind by up to the flush
+interval per worker; ``flush(user_id)`` writes one user's views early.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from .models import CompanyProfile, ProfileViewEvent, StartupViewHistory
+
+logger = logging.getLogger(__name__)
+
+
+class ViewHistoryRecorder:
+    def __init__(self, flush_seconds=None, max_pending=None):
+        self.flush_seconds = settings.VIEW_HISTORY_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self.max_pending = settings.VIEW_HISTORY_MAX_PENDING if max_pending is None else max_pending
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._events = []
+        self._last_flush = time.monotonic()
+        self._stopped = threading.Event()
+        self._timer_pid = None
+
+    def _ensure_timer(self):
+        """Start the flushing thread in this process (again after a fork) if it isn't running."""
+        if self._timer_pid == os.getpid():
+            return
+        with self._lock:
+            if self._timer_pid != os.getpid():
+                self._timer_pid = os.getpid()
+                threading.Thread(target=self._flush_periodically, name="view-history-flush", daemon=True).start()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_seconds):
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Periodic flush of startup views failed")
+            finally:
+                connection.close()
+
+    def stop(self):
+        """Stop the flushing thread; pending views stay buffered."""
+        self._stopped.set()
+
+    def record(self, user_id, company_id, viewed_at=None):
+        """Note a view; flushes inline when the buffer is due."""
+        viewed_at = viewed_at or timezone.now()
+        key = (user_id, company_id)
+        self._ensure_timer()
+        with self._lock:
+            previous = self._pending.get(key)
+            if previous is None or previous < viewed_at:
+                self._pending[key] = viewed_at
+            self._events.append((user_id, company_id, viewed_at))
+            due = (
+                len(self._events) >= self.max_pending
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+        if due:
+            self.flush()
+
+    def discard(self, user_id=None):
+        """Drop pending views of a user (e.g. when they clear their history), or of everyone."""
+        with self._lock:
+            if user_id is None:
+                self._pending, self._events = {}, []
+            else:
+                self._pending = {key: value for key, value in self._pending.items() if key[0] != user_id}
+
+    def flush(self, user_id=None):
+        """
+        Write pending views with one ``INSERT ... ON CONFLICT DO UPDATE``
+        and the raw events with one ``INSERT``; only those of ``user_id``
+        when given, e.g. before listing that user's history.
+
+        Views of companies deleted in the meantime are dropped. Returns the
+        number of history rows written.
+        """
+        with self._lock:
+            if user_id is None:
+                pending, self._pending = self._pending, {}
+                events, self._events = self._events, []
+                self._last_flush = time.monotonic()
+            else:
+                pending = {key: value for key, value in self._pending.items() if key[0] == user_id}
+                for key in pending:
+                    del self._pending[key]
+                events = [event for event in self._events if event[0] == user_id]
+                if events:
+                    self._events = [event for event in self._events if event[0] != user_id]
+        if not events:
+            return 0
+
+        existing = set(
+            CompanyProfile.objects.filter(pk__in={company_id for _, company_id, _ in events})
+            .values_list("pk", flat=True)
+        )
+        rows = [
+            StartupViewHistory(user_id=user_id, company_id=company_id, viewed_at=viewed_at)
+            for (user_id, company_id), viewed_at in pending.items()
+            if company_id in existing
+        ]
+        try:
+            with transaction.atomic():
+                StartupViewHistory.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=["user", "company"],
+                    update_fields=["viewed_at"],
+                )
+                ProfileViewEvent.objects.bulk_create(
+                    ProfileViewEvent(viewer_id=user_id, company_id=company_id, viewed_at=viewed_at)
+                    for user_id, company_id, viewed_at in events
+                    if company_id in existing
+                )
+        except DatabaseError:
+            # History is best effort; never fail the request that triggered the flush
+            logger.exception("Failed to flush %d startup views", len(rows))
+            return 0
+        return len(rows)
+
+
+recorder = ViewHistoryRecorder()
+
+
+@atexit.register
+def _flush_at_exit():
+    recorder.stop()
+    try:
+        recorder.flush()
+    except Exception:  # pylint: disable=broad-except
+        # The database may already be unreachable while the worker shuts down
+        logger.warning("Could not flush startup views at exit", exc_info=True)
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django.db import transaction
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
@@ -6,30 +8,87 @@ from django.http import Http404
 from rest_framework import viewsets, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.exceptions import ValidationError, PermissionDenied, NotFound
 from rest_framework.decorators import action
 from rest_framework.generics import CreateAPIView
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.filters import OrderingFilter, SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
 import logging
 
-from .models import CompanyProfile, UserToCompany, CompanyFollowers, CompanyType
+from .models import (
+    CompanyProfile,
+    ProfileViewBucket,
+    UserToCompany,
+    CompanyFollowers,
+    CompanyType,
+    StartupRecommendation,
+    StartupViewHistory,
+)
+from . import view_history
+from UA_13XX_bravo.fieldsets import SparseFieldsetMixin
+from UA_13XX_bravo.imports import BulkImportSerializer, import_response
+from UA_13XX_bravo.streaming import StreamingListMixin
 from .serializers import (
+    CompanyProfileListSerializer,
     CompanyProfileSerializer,
     UserToCompanySerializer,
+    UserToCompanyListSerializer,
     CompanyFollowersSerializer,
     CompanyRegistrationSerializer,
     FollowedStartupSerializer,
+    FollowStartupsBatchSerializer,
+    StartupRecommendationSerializer,
+    StartupViewHistorySerializer,
 )
+from .analytics import view_summary
+from .filters import CompanyProfileFilter, FacetedLimitOffsetPagination
+from .permissions import IsCompanyMember
+from .utils import bulk_create_companies, get_token_memberships
 
 logger = logging.getLogger(__name__)
 
 
-class CompanyProfileViewSet(viewsets.ModelViewSet):
-    queryset = CompanyProfile.objects.all()
+class CompanyProfileViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+    """
+    Company profiles. The list supports ``industry`` (comma-separated),
+    ``type``, ``company_size_min``/``_max`` and ``required_funding_min``/``_max``
+    filters, ``search``, ``ordering`` and limit/offset pagination, and
+    returns facet counts for the filtered result next to the page. List and
+    detail responses can be narrowed with ``?fields=``.
+    """
+    queryset = CompanyProfile.objects.all().order_by("id")
     serializer_class = CompanyProfileSerializer
+    lean_serializer_class = CompanyProfileListSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_class = CompanyProfileFilter
+    search_fields = ["company_name", "industry"]
+    ordering_fields = ["company_name", "company_size", "required_funding", "created_at"]
+    pagination_class = FacetedLimitOffsetPagination
+    replica_read_actions = ("list",)
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        view_history.recorder.record(request.user.id, int(kwargs["pk"]))
+        return response
+
+    @action(
+        detail=False, methods=["post"], url_path="import",
+        serializer_class=BulkImportSerializer, permission_classes=[IsAdminUser],
+    )
+    def bulk_import(self, request):
+        """
+        Create many companies in one transaction (staff only). Rows may name
+        an ``owner`` by email to link like registration does. Valid rows are
+        saved even when others fail; pass ``dry_run`` to validate only.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return import_response(
+            bulk_create_companies(serializer.validated_data["rows"], dry_run=serializer.validated_data["dry_run"])
+        )
 
     def perform_create(self, serializer):
         """When creating a company, it automatically adds a user connection."""
@@ -46,9 +105,10 @@ class CompanyProfileViewSet(viewsets.ModelViewSet):
                 raise ValidationError(user_to_company_serializer.errors)
 
 
-class UserToCompanyViewSet(viewsets.ModelViewSet):
+class UserToCompanyViewSet(StreamingListMixin, viewsets.ModelViewSet):
     queryset = UserToCompany.objects.all()
     serializer_class = UserToCompanySerializer
+    lean_serializer_class = UserToCompanyListSerializer
     permission_classes = [IsAuthenticated]
 
 
@@ -92,7 +152,19 @@ class InvestorStartupMixin:
     Class for retrieving the investor's company and startup.
     """
     def get_investor_company(self, request):
-        """Retrieve the investor's enterprise company or raise a permission error."""
+        """
+        Retrieve the investor's enterprise company or raise a permission error.
+
+        When the JWT carries membership claims the company is resolved from
+        them without a query; the returned instance then only has ``id`` and
+        ``type`` populated.
+        """
+        memberships = get_token_memberships(request.auth)
+        if memberships:
+            for company_id, company_type in memberships.items():
+                if company_type == CompanyType.ENTERPRISE:
+                    return CompanyProfile(id=company_id, type=company_type)
+
         try:
             return request.user.company_memberships.get(company__type=CompanyType.ENTERPRISE).company
         except UserToCompany.DoesNotExist:
@@ -109,17 +181,65 @@ class FollowStartupView(APIView, InvestorStartupMixin):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, startup_id):
-        """Allow an investor to follow a startup."""
+        """
+        Allow an investor to follow a startup.
+
+        The follow is a single ``INSERT ... ON CONFLICT DO NOTHING`` that
+        also checks both company types; only a request that inserts nothing
+        pays for the lookups that explain why.
+        """
         investor_company = self.get_investor_company(request)
-        startup = self.get_startup(startup_id)
 
-        if CompanyFollowers.objects.filter(investor=investor_company, startup=startup).exists():
-            return Response({"detail": "You are already following this startup."}, status=status.HTTP_400_BAD_REQUEST)
+        created = CompanyFollowers.objects.follow(investor_company.id, [startup_id])
+        if not created:
+            self.get_startup(startup_id)
+            if CompanyFollowers.objects.filter(investor_id=investor_company.id, startup_id=startup_id).exists():
+                return Response({"detail": "You are already following this startup."}, status=status.HTTP_400_BAD_REQUEST)
+            raise PermissionDenied("User is not linked to an enterprise company.")
 
-        follow_relation = CompanyFollowers.objects.create(investor=investor_company, startup=startup)
+        follow_relation = CompanyFollowers(
+            investor_id=investor_company.id, startup_id=startup_id, created_at=created[startup_id]
+        )
         serializer = CompanyFollowersSerializer(follow_relation)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class FollowStartupsBatchView(APIView, InvestorStartupMixin):
+    """Follow many startups at once, e.g. when an investor imports a watchlist."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Request body: ``{"startup_ids": [1, 2, 3]}``
+
+        Response: ids grouped into ``followed`` (new), ``already_following``
+        and ``not_found`` (missing or not a startup). Following is
+        idempotent, so a retried import reports its earlier rows as
+        ``already_following``.
+        """
+        investor_company = self.get_investor_company(request)
+        serializer = FollowStartupsBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        startup_ids = list(dict.fromkeys(serializer.validated_data["startup_ids"]))
+
+        created = CompanyFollowers.objects.follow(investor_company.id, startup_ids)
+        remaining = [startup_id for startup_id in startup_ids if startup_id not in created]
+        existing = set(
+            CompanyFollowers.objects.for_investor(investor_company.id)
+            .filter(startup_id__in=remaining)
+            .values_list("startup_id", flat=True)
+        ) if remaining else set()
+
+        return Response(
+            {
+                "followed": [startup_id for startup_id in startup_ids if startup_id in created],
+                "already_following": [startup_id for startup_id in remaining if startup_id in existing],
+                "not_found": [startup_id for startup_id in remaining if startup_id not in existing],
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
     
 class UnFollowStartupView(APIView, InvestorStartupMixin):
     """A view that allows an investor to unfollow a startup."""
@@ -134,14 +254,11 @@ class UnFollowStartupView(APIView, InvestorStartupMixin):
         A success message if unfollowed, or an error message.
         """
         investor_company = self.get_investor_company(request)
-        startup = self.get_startup(startup_id)
 
-        unfollow_relation = CompanyFollowers.objects.filter(investor=investor_company, startup=startup)
-        if not unfollow_relation.exists():
+        if not CompanyFollowers.objects.unfollow(investor_company.id, startup_id):
+            self.get_startup(startup_id)
             return Response({"detail": "You are not following this startup."}, status=status.HTTP_400_BAD_REQUEST)
 
-        unfollow_relation.delete()
-
         return Response({"detail": "Successfully unfollowed the startup."}, status=status.HTTP_200_OK)
     
 class CustomPagination(PageNumberPagination):
@@ -155,6 +272,7 @@ class ListFollowedStartupsView(APIView, InvestorStartupMixin):
     """
     permission_classes = [IsAuthenticated]
     pagination_class = CustomPagination
+    replica_read_actions = ("get",)
 
     def get(self, request):
         """
@@ -185,43 +303,98 @@ class ListFollowedStartupsView(APIView, InvestorStartupMixin):
         serializer = FollowedStartupSerializer(result_page, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
       
-# class StartupViewHistoryViewSet(viewsets.ReadOnlyModelViewSet):
-#     """
-#     API endpoint to list, add and clear the viewing history of startup profiles.
-#     Only authenticated users can access their own history.
-#     """
-#     serializer_class = StartupViewHistorySerializer
-#     permission_classes = [IsAuthenticated]
-
-#     def get_queryset(self):
-#         return StartupViewHistory.objects.filter(user=self.request.user).order_by("-viewed_at")
-
-#     @action(detail=True, methods=["post"], url_path="view", url_name="mark-viewed")
-#     def mark_as_viewed(self, request, pk=None):
-#         """
-#         Record a view for the specified startup (company) by the authenticated user.
-#         """
-#         try:
-#             company = CompanyProfile.objects.get(pk=pk)
-#         except CompanyProfile.DoesNotExist:
-#             return Response({"detail": "Company not found."}, status=status.HTTP_404_NOT_FOUND)
-
-#         StartupViewHistory.objects.update_or_create(
-#             user=request.user,
-#             company=company,
-#             defaults={"viewed_at": timezone.now()},
-#         )
-
-#         return Response({"detail": "View recorded successfully."}, status=status.HTTP_200_OK)
-
-#     @action(detail=False, methods=["delete"], url_path="clear", url_name="clear-history")
-#     def clear_view_history(self, request):
-#         """
-#         Delete all startup view history records for the authenticated user.
-#         """
-#         deleted_count, _ = StartupViewHistory.objects.filter(user=request.user).delete()
-#         return Response(
-#             {"message": f"Successfully cleared {deleted_count} viewed startup(s)."},
-#             status=status.HTTP_200_OK
-#         )
+class StartupViewHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint to list, add and clear the viewing history of startup profiles.
+    Only authenticated users can access their own history.
+
+    Views go through the buffered recorder in ``companies.view_history``
+    instead of writing a row per page view.
+    """
+    serializer_class = StartupViewHistorySerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = CustomPagination
+
+    def get_queryset(self):
+        return (
+            StartupViewHistory.objects.filter(user=self.request.user)
+            .select_related("company")
+            .order_by("-viewed_at")
+        )
+
+    def list(self, request, *args, **kwargs):
+        # Show the user their own recent views even before the next timed flush
+        view_history.recorder.flush(user_id=request.user.id)
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=True, methods=["post"], url_path="view", url_name="mark-viewed")
+    def mark_as_viewed(self, request, pk=None):
+        """
+        Record a view for the specified startup (company) by the authenticated user.
+        """
+        # One primary key lookup, so unknown ids never reach the buffer
+        if not pk.isdigit() or not CompanyProfile.objects.filter(pk=pk, type=CompanyType.STARTUP).exists():
+            raise NotFound("Startup not found.")
+        view_history.recorder.record(request.user.id, int(pk))
+        return Response({"detail": "View recorded successfully."}, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["delete"], url_path="clear", url_name="clear-history")
+    def clear_view_history(self, request):
+        """
+        Delete all startup view history records for the authenticated user.
+        """
+        view_history.recorder.discard(request.user.id)
+        deleted_count, _ = StartupViewHistory.objects.filter(user=request.user).delete()
+        return Response(
+            {"message": f"Successfully cleared {deleted_count} viewed startup(s)."},
+            status=status.HTTP_200_OK
+        )
+
+
+class RecommendedStartupsView(APIView, InvestorStartupMixin):
+    """
+    Startups followed by investors with similar interests.
 
+    Served from the table built by ``manage.py build_recommendations``;
+    nothing is computed per request, and investors without follows (or
+    before the first build) get an empty list.
+    """
+    permission_classes = [IsAuthenticated]
+    replica_read_actions = ("get",)
+
+    def get(self, request):
+        investor_company = self.get_investor_company(request)
+        recommendations = (
+            StartupRecommendation.objects.filter(investor_id=investor_company.id)
+            .select_related("startup")
+            .order_by("rank")
+        )
+        serializer = StartupRecommendationSerializer(recommendations, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class CompanyViewAnalyticsView(APIView):
+    """
+    Profile view dashboard for the company selected in the JWT.
+
+    Query params: ``granularity`` (``day`` or ``hour``, default ``day``) and
+    ``days`` (1-90, default 30). Reads only the pre-aggregated buckets
+    filled by ``manage.py aggregate_profile_views``.
+    """
+    permission_classes = [IsAuthenticated, IsCompanyMember]
+    replica_read_actions = ("get",)
+    max_days = 90
+
+    def get(self, request):
+        granularity = request.query_params.get("granularity", ProfileViewBucket.Granularity.DAY)
+        if granularity not in ProfileViewBucket.Granularity.values:
+            raise ValidationError({"granularity": f"Choose from: {', '.join(ProfileViewBucket.Granularity.values)}."})
+        try:
+            days = int(request.query_params.get("days", 30))
+        except ValueError:
+            raise ValidationError({"days": "A valid integer is required."})
+        if not 1 <= days <= self.max_days:
+            raise ValidationError({"days": f"Must be between 1 and {self.max_days}."})
+
+        summary = view_summary(request.company_id, granularity, timezone.now() - timedelta(days=days))
+        return Response(summary, status=status.HTTP_200_OK)
@@ -1,16 +1,39 @@
 #!/bin/sh
 
-echo "Applying database migrations..."
-python manage.py migrate --no-input
+# Migrates and loads fixtures only when they changed since the last start
+echo "Preparing database..."
+python manage.py prepare_database
 
-echo "Loading initial data..."
-python manage.py loaddata notifications/fixtures/type_fixture.json
-
-echo "Collecting static files..."
-python manage.py collectstatic --noinput
+# Static files are collected when the image is built; a bind-mounted
+# source tree (docker-compose) may not have them yet
+if [ -z "$(ls -A staticfiles 2>/dev/null)" ]; then
+    echo "Collecting static files..."
+    python manage.py collectstatic --noinput
+fi
 
 CPU_COUNT=$(nproc)
-WORKERS=$((2 * CPU_COUNT + 1))
 
-echo "Starting Django server with $WORKERS workers..."
-exec gunicorn --workers "$WORKERS" --bind 0.0.0.0:8000 UA_13XX_bravo.wsgi:application
\ No newline at end of file
+# Per-worker metrics files, summed by /metrics (UA_13XX_bravo.metrics)
+export METRICS_DIR=${METRICS_DIR:-/tmp/django-metrics}
+# Scrapers send "Authorization: Bearer $METRICS_TOKEN"; without it /metrics
+# answers 403 (outside DEBUG)
+if [ -z "$METRICS_TOKEN" ]; then
+    echo "METRICS_TOKEN is not set; /metrics is disabled."
+fi
+
+# SERVER_MODE=asgi (default) runs uvicorn workers under gunicorn: async views
+# and WebSockets are served natively and one worker handles many slow requests.
+# SERVER_MODE=wsgi keeps the classic 2N+1 sync workers.
+# Both preload the app in the master and fork the workers (gunicorn.conf.py).
+SERVER_MODE=${SERVER_MODE:-asgi}
+
+if [ "$SERVER_MODE" = "wsgi" ]; then
+    WORKERS=${WEB_CONCURRENCY:-$((2 * CPU_COUNT + 1))}
+    echo "Starting Django (WSGI) with $WORKERS workers..."
+    exec gunicorn --workers "$WORKERS" --bind 0.0.0.0:8000 UA_13XX_bravo.wsgi:application
+fi
+
+WORKERS=${WEB_CONCURRENCY:-$CPU_COUNT}
+echo "Starting Django (ASGI) with $WORKERS workers..."
+exec gunicorn --workers "$WORKERS" --worker-class uvicorn_worker.UvicornWorker \
+    --bind 0.0.0.0:8000 UA_13XX_bravo.asgi:application
@@ -0,0 +1,34 @@
+"""
+Gunicorn settings, read automatically from the working directory.
+
+The app is imported once in the master (``preload_app``) and the workers
+are forked from it, so they start without importing Django again and
+share the imported code copy-on-write. Set GUNICORN_PRELOAD=False to load
+the app in every worker instead, e.g. to pick up code changes on HUP.
+
+The metrics files of the workers (METRICS_DIR, see UA_13XX_bravo.metrics)
+are cleared when the server starts; a worker's gauges go when it exits.
+"""
+import os
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+
+
+def when_ready(server):
+    # Runs in the master after the app was loaded, before workers are forked
+    if server.cfg.preload_app:
+        from UA_13XX_bravo.startup import warm_up
+
+        warm_up()
+
+
+def on_starting(server):
+    from UA_13XX_bravo.metrics import clear_directory
+
+    clear_directory(os.getenv("METRICS_DIR"))
+
+
+def child_exit(server, worker):
+    from UA_13XX_bravo.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid, os.getenv("METRICS_DIR"))
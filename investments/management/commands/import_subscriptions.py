@@ -0,0 +1,10 @@
+from UA_13XX_bravo.imports import BulkImportCommand
+
+
+class Command(BulkImportCommand):
+    help = (
+        "Import subscriptions from a CSV (creator,project,investment_share) "
+        "or NDJSON file. Each batch is validated and inserted in one transaction."
+    )
+    label = "subscriptions"
+    import_function = "investments.utils.bulk_create_subscriptions"
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.6 on 2026-10-19 17:28
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, F, Sum
+from django.db.models.functions import Round
+
+
+def backfill_portfolio_exposure(apps, schema_editor):
+    Subscription = apps.get_model("investments", "Subscription")
+    PortfolioExposure = apps.get_model("investments", "PortfolioExposure")
+
+    rows = Subscription.objects.values("creator_id", "project__company_id").annotate(
+        project_count=Count("id"),
+        total_share=Sum("investment_share"),
+        exposure=Sum(
+            Round(F("investment_share") * F("project__required_funding") / 100, 2),
+            output_field=DecimalField(max_digits=17, decimal_places=2),
+        ),
+    )
+    PortfolioExposure.objects.bulk_create(
+        (
+            PortfolioExposure(
+                investor_id=row["creator_id"],
+                company_id=row["project__company_id"],
+                project_count=row["project_count"],
+                total_share=row["total_share"],
+                exposure=row["exposure"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0007_alter_companyprofile_type'),
+        ('investments', '0005_alter_subscription_investment_share'),
+        ('projects', '0003_project_funding_aggregates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioExposure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_count', models.PositiveIntegerField(default=0)),
+                ('total_share', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('exposure', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=17)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='companies.companyprofile')),
+                ('investor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='portfolio_exposures', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('investor', 'company'), name='unique_portfolio_exposure_per_company')],
+            },
+        ),
+        migrations.RunPython(backfill_portfolio_exposure, migrations.RunPython.noop),
+    ]
@@ -1,13 +1,122 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 from django.contrib.auth import get_user_model
+from companies.models import CompanyProfile
 from projects.models import Project
 from django.core.exceptions import ValidationError
-from django.db.models import Sum
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, F, Sum
+from django.db.models.functions import Now, Round
+from django.utils import timezone
 
 User = get_user_model()
 
+
+def update_project_totals(project_id, count_delta, share_delta):
+    """
+    Apply a change in subscriptions to the project's maintained aggregates.
+
+    Uses a single ``UPDATE ... SET x = x + delta`` so concurrent writers
+    never overwrite each other's totals. ``updated_at`` moves too, so the
+    project is picked up by the next incremental export.
+    """
+    Project.objects.filter(pk=project_id).update(
+        subscriber_count=F("subscriber_count") + count_delta,
+        allocated_share=F("allocated_share") + share_delta,
+        updated_at=Now(),
+    )
+
+
+def funding_exposure(investment_share, required_funding):
+    """Amount of a project's required funding covered by an investment share."""
+    exposure = Decimal(investment_share) * Decimal(required_funding) / 100
+    # ROUND_HALF_UP matches PostgreSQL's ROUND() used by refresh_portfolios
+    return exposure.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def update_portfolio_exposure(investor_id, company_id, count_delta, share_delta, exposure_delta):
+    """
+    Apply a change in one investor's subscriptions to their rollup row for a company.
+
+    Rows are created on the first subscription and dropped when the last one
+    goes away, so a portfolio read never has to filter out empty companies.
+    New subscriptions go through a single ``INSERT ... ON CONFLICT DO
+    UPDATE``, so concurrent first subscriptions to one company (or a
+    concurrent ``refresh_portfolios``) add up instead of colliding.
+    """
+    rollup = PortfolioExposure.objects.filter(investor_id=investor_id, company_id=company_id)
+    if count_delta > 0:
+        table = PortfolioExposure._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} AS rollup
+                    (investor_id, company_id, project_count, total_share, exposure, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (investor_id, company_id) DO UPDATE SET
+                    project_count = rollup.project_count + EXCLUDED.project_count,
+                    total_share = rollup.total_share + EXCLUDED.total_share,
+                    exposure = rollup.exposure + EXCLUDED.exposure,
+                    updated_at = EXCLUDED.updated_at
+                """,
+                [investor_id, company_id, count_delta, share_delta, exposure_delta, timezone.now()],
+            )
+        return
+    rollup.update(
+        project_count=F("project_count") + count_delta,
+        total_share=F("total_share") + share_delta,
+        exposure=F("exposure") + exposure_delta,
+        updated_at=Now(),
+    )
+    if count_delta < 0:
+        rollup.filter(project_count__lte=0).delete()
+
+
+def refresh_portfolios(investor_ids):
+    """
+    Rebuild the portfolio rollups of the given investors from their subscriptions.
+
+    Used after bulk imports and when a project's funding target or company
+    changes; a single grouped query computes every (investor, company) row.
+    Rows are upserted rather than deleted and reinserted, so concurrent
+    ``update_portfolio_exposure`` calls never hit the unique constraint.
+    """
+    investor_ids = set(investor_ids)
+    rows = (
+        Subscription.objects.filter(creator_id__in=investor_ids)
+        .values("creator_id", "project__company_id")
+        .annotate(
+            project_count=Count("id"),
+            total_share=Sum("investment_share"),
+            exposure=Sum(
+                Round(F("investment_share") * F("project__required_funding") / 100, 2),
+                output_field=DecimalField(max_digits=17, decimal_places=2),
+            ),
+        )
+    )
+    with transaction.atomic():
+        kept = PortfolioExposure.objects.bulk_create(
+            [
+                PortfolioExposure(
+                    investor_id=row["creator_id"],
+                    company_id=row["project__company_id"],
+                    project_count=row["project_count"],
+                    total_share=row["total_share"],
+                    exposure=row["exposure"],
+                )
+                for row in rows
+            ],
+            update_conflicts=True,
+            unique_fields=["investor", "company"],
+            update_fields=["project_count", "total_share", "exposure", "updated_at"],
+        )
+        # Companies the investors no longer hold subscriptions in
+        PortfolioExposure.objects.filter(investor_id__in=investor_ids).exclude(
+            pk__in=[exposure.pk for exposure in kept]
+        ).delete()
+
+
 class Subscription(models.Model):
     """
     Represents an investment made by a user in a specific project.
@@ -51,7 +160,40 @@ class Subscription(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()  # Ensure clean() is called before saving
-        super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = (
+                    Subscription.objects.filter(pk=self.pk)
+                    .values(
+                        "creator_id",
+                        "project_id",
+                        "investment_share",
+                        "project__company_id",
+                        "project__required_funding",
+                    )
+                    .first()
+                )
+            super().save(*args, **kwargs)
+
+            if previous:
+                update_project_totals(previous["project_id"], -1, -previous["investment_share"])
+                update_portfolio_exposure(
+                    previous["creator_id"],
+                    previous["project__company_id"],
+                    -1,
+                    -previous["investment_share"],
+                    -funding_exposure(previous["investment_share"], previous["project__required_funding"]),
+                )
+            update_project_totals(self.project_id, 1, self.investment_share)
+            update_portfolio_exposure(
+                self.creator_id,
+                self.project.company_id,
+                1,
+                self.investment_share,
+                funding_exposure(self.investment_share, self.project.required_funding),
+            )
 
     def __str__(self):
         return f"Subscription #{self.pk} — ({self.investment_share}%)"
@@ -62,4 +204,40 @@ class Subscription(models.Model):
                 fields=["creator", "project"],
                 name="unique_subscription_per_project"
             )
-        ]
\ No newline at end of file
+        ]
+
+
+class PortfolioExposure(models.Model):
+    """
+    Per-investor rollup of subscriptions grouped by the projects' company.
+
+    Maintained incrementally by Subscription (see update_portfolio_exposure)
+    so the portfolio summary reads a handful of rows however many
+    subscriptions an investor holds.
+    """
+    investor = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="portfolio_exposures"
+    )
+    company = models.ForeignKey(
+        CompanyProfile,
+        on_delete=models.CASCADE,
+        related_name="+"
+    )
+    project_count = models.PositiveIntegerField(default=0)
+    total_share = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
+    # Sum of investment_share% of each project's required funding
+    exposure = models.DecimalField(max_digits=17, decimal_places=2, default=Decimal("0.00"))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.investor} — {self.company} ({self.exposure})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["investor", "company"],
+                name="unique_portfolio_exposure_per_company"
+            )
+        ]
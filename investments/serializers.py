@@ -1,5 +1,6 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import Subscription
+from .models import PortfolioExposure, Subscription
 
 
 class SubscriptionSerializer(serializers.ModelSerializer):
@@ -21,4 +22,30 @@ class SubscriptionSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data["creator"] = self.context["request"].user
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+
+class SubscriptionBatchSerializer(serializers.Serializer):
+    """
+    Input for the batch endpoint: a list of rows with ``project``,
+    ``investment_share`` and optionally ``creator`` (investor email).
+    Row contents are validated by ``bulk_create_subscriptions`` so that
+    each row gets its own result instead of failing the whole request.
+    """
+    rows = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=settings.SUBSCRIPTION_BATCH_MAX_ROWS,
+    )
+    dry_run = serializers.BooleanField(default=False)
+
+
+class PortfolioExposureSerializer(serializers.ModelSerializer):
+    """An investor's holdings in one company, read from the portfolio rollup."""
+    company_name = serializers.CharField(source="company.company_name", read_only=True)
+    industry = serializers.CharField(source="company.industry", read_only=True, allow_null=True)
+
+    class Meta:
+        model = PortfolioExposure
+        fields = ["company", "company_name", "industry", "project_count", "total_share", "exposure"]
+        read_only_fields = fields
@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from projects.models import Project
+from UA_13XX_bravo.tracing import traced
+from .models import (
+    Subscription,
+    funding_exposure,
+    refresh_portfolios,
+    update_portfolio_exposure,
+    update_project_totals,
+)
+
+
+@receiver(post_delete, sender=Subscription)
+@traced()
+def release_project_totals(sender, instance, **kwargs):
+    """Keep project aggregates in step when subscriptions are deleted (including cascades)."""
+    update_project_totals(instance.project_id, -1, -instance.investment_share)
+
+
+@receiver(post_delete, sender=Subscription)
+@traced()
+def release_portfolio_exposure(sender, instance, **kwargs):
+    """Remove a deleted subscription from its investor's portfolio rollup."""
+    project = Project.objects.filter(pk=instance.project_id).values("company_id", "required_funding").first()
+    if project is None:
+        return  # the rollup row went with the project's company
+    update_portfolio_exposure(
+        instance.creator_id,
+        project["company_id"],
+        -1,
+        -instance.investment_share,
+        -funding_exposure(instance.investment_share, project["required_funding"]),
+    )
+
+
+@receiver(pre_save, sender=Project)
+@traced()
+def remember_portfolio_inputs(sender, instance, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if instance._state.adding or (
+        update_fields is not None and not {"company", "required_funding"} & set(update_fields)
+    ):
+        instance._portfolio_inputs = None
+        return
+    instance._portfolio_inputs = (
+        Project.objects.filter(pk=instance.pk).values_list("company_id", "required_funding").first()
+    )
+
+
+@receiver(post_save, sender=Project)
+@traced()
+def refresh_affected_portfolios(sender, instance, created, **kwargs):
+    """Rebuild the rollups of a project's investors when its company or funding target changes."""
+    previous = getattr(instance, "_portfolio_inputs", None)
+    if previous is None or previous == (instance.company_id, instance.required_funding):
+        return
+    investor_ids = Subscription.objects.filter(project=instance).values_list("creator_id", flat=True)
+    refresh_portfolios(list(investor_ids))
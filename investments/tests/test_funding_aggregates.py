@@ -0,0 +1,122 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from investments.models import Subscription
+from projects.models import Project, ProjectStatus
+
+
+@pytest.fixture
+def projects(test_company_with_user):
+    def make(name, required, raised, status=ProjectStatus.ACTIVE):
+        return Project.objects.create(
+            name=name,
+            status=status,
+            information="",
+            required_funding=required,
+            raised_amount=raised,
+            company=test_company_with_user,
+        )
+
+    return [
+        make("Half", 1000, 500),
+        make("Almost", 1000, 900),
+        make("Done", 1000, 1000),
+        make("Fresh", 1000, 0),
+        make("Closed", 1000, 950, status=ProjectStatus.COMPLETED),
+    ]
+
+
+@pytest.mark.django_db
+def test_funded_percent_is_maintained_on_save(test_project):
+    assert test_project.funded_percent == Decimal("0.00")
+
+    test_project.raised_amount = Decimal("25000")
+    test_project.save(update_fields=["raised_amount"])
+
+    test_project.refresh_from_db()
+    assert test_project.funded_percent == Decimal("25.00")
+
+
+@pytest.mark.django_db
+def test_subscription_changes_update_project_totals(test_project, test_user, another_user):
+    first = Subscription.objects.create(creator=test_user, project=test_project, investment_share=Decimal("20.5"))
+    Subscription.objects.create(creator=another_user, project=test_project, investment_share=Decimal("30"))
+
+    test_project.refresh_from_db()
+    assert test_project.subscriber_count == 2
+    assert test_project.allocated_share == Decimal("50.50")
+
+    first.investment_share = Decimal("10")
+    first.save()
+    test_project.refresh_from_db()
+    assert test_project.subscriber_count == 2
+    assert test_project.allocated_share == Decimal("40.00")
+
+    first.delete()
+    test_project.refresh_from_db()
+    assert test_project.subscriber_count == 1
+    assert test_project.allocated_share == Decimal("30.00")
+
+    another_user.delete()  # cascades to the remaining subscription
+    test_project.refresh_from_db()
+    assert test_project.subscriber_count == 0
+    assert test_project.allocated_share == Decimal("0.00")
+
+
+@pytest.mark.django_db
+def test_closest_to_funded_leaderboard(api_client, test_user, projects):
+    api_client.force_authenticate(user=test_user)
+
+    response = api_client.get(reverse("projects:projects-closest-to-funded"), {"limit": 2})
+
+    assert response.status_code == 200
+    assert [p["name"] for p in response.data] == ["Almost", "Half"]
+    assert response.data[0]["funded_percent"] == "90.00"
+
+
+@pytest.mark.django_db
+def test_most_subscribed_leaderboard(api_client, test_user, another_user, projects):
+    half, almost = projects[0], projects[1]
+    Subscription.objects.create(creator=test_user, project=almost, investment_share=10)
+    Subscription.objects.create(creator=test_user, project=half, investment_share=10)
+    Subscription.objects.create(creator=another_user, project=half, investment_share=10)
+    api_client.force_authenticate(user=test_user)
+
+    response = api_client.get(reverse("projects:projects-most-subscribed"))
+
+    assert response.status_code == 200
+    names = [p["name"] for p in response.data]
+    assert names[:2] == ["Half", "Almost"]
+    assert "Closed" not in names
+    assert response.data[0]["subscriber_count"] == 2
+
+
+@pytest.mark.django_db
+def test_leaderboard_rejects_invalid_limit(api_client, test_user):
+    api_client.force_authenticate(user=test_user)
+
+    response = api_client.get(reverse("projects:projects-most-subscribed"), {"limit": "ten"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "queryset, index",
+    [
+        (lambda: Project.objects.filter(status=ProjectStatus.ACTIVE, funded_percent__lt=100)
+         .order_by("-funded_percent", "id")[:10], "project_active_funded_idx"),
+        (lambda: Project.objects.filter(status=ProjectStatus.ACTIVE)
+         .order_by("-subscriber_count", "id")[:10], "project_active_subs_idx"),
+    ],
+)
+def test_leaderboards_are_index_scans(projects, queryset, index):
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset().explain()
+
+    assert index in plan
+    assert "Sort" not in plan
@@ -0,0 +1,119 @@
+import threading
+from decimal import Decimal
+
+import pytest
+from django.db import connection, transaction
+from django.urls import reverse
+
+from companies.models import CompanyProfile
+from investments.models import PortfolioExposure, Subscription, refresh_portfolios, update_portfolio_exposure
+from investments.utils import bulk_create_subscriptions
+from projects.models import Project
+
+URL = reverse("subscription-portfolio")
+
+
+@pytest.fixture
+def holdings(test_user, test_company_with_user):
+    test_company_with_user.industry = "Fintech"
+    test_company_with_user.save()
+    other = CompanyProfile.objects.create(company_name="Other", description="", industry="Health")
+
+    def project(name, company, required):
+        return Project.objects.create(name=name, information="", required_funding=required, company=company)
+
+    projects = [
+        project("A", test_company_with_user, 1000),
+        project("B", test_company_with_user, 2000),
+        project("C", other, 10000),
+    ]
+    for p, share in zip(projects, ["10", "25", "5"]):
+        Subscription.objects.create(creator=test_user, project=p, investment_share=Decimal(share))
+    return projects
+
+
+def rollup(user):
+    return {
+        (e.company_id, e.project_count, e.total_share, e.exposure)
+        for e in PortfolioExposure.objects.filter(investor=user)
+    }
+
+
+@pytest.mark.django_db
+def test_portfolio_summary(api_client, test_user, holdings, django_assert_max_num_queries):
+    api_client.force_authenticate(user=test_user)
+
+    with django_assert_max_num_queries(1):
+        response = api_client.get(URL)
+
+    assert response.status_code == 200
+    assert response.data["project_count"] == 3
+    assert response.data["total_share"] == "40.00"
+    assert response.data["total_exposure"] == "1100.00"
+    assert [c["company_name"] for c in response.data["companies"]] == ["TestCompany", "Other"]
+    assert response.data["companies"][0]["exposure"] == "600.00"
+    assert response.data["industries"][1] == {
+        "industry": "Health", "project_count": 1, "total_share": "5.00", "exposure": "500.00",
+    }
+
+
+@pytest.mark.django_db
+def test_rollup_tracks_subscription_changes(test_user, holdings):
+    a, b, c = holdings
+
+    subscription = Subscription.objects.get(project=b)
+    subscription.investment_share = Decimal("12.5")
+    subscription.save()
+    Subscription.objects.get(project=c).delete()
+
+    assert rollup(test_user) == {(a.company_id, 2, Decimal("22.50"), Decimal("350.00"))}
+    refresh_portfolios([test_user.pk])
+    assert rollup(test_user) == {(a.company_id, 2, Decimal("22.50"), Decimal("350.00"))}
+
+
+@pytest.mark.django_db
+def test_rollup_follows_project_changes(test_user, holdings):
+    a, _, c = holdings
+
+    a.required_funding = 3000
+    a.save()
+    c.company = a.company
+    c.save()
+
+    assert rollup(test_user) == {(a.company_id, 3, Decimal("40.00"), Decimal("1300.00"))}
+
+
+@pytest.mark.django_db
+def test_bulk_import_refreshes_rollup(test_user, another_user, holdings):
+    a = holdings[0]
+
+    bulk_create_subscriptions([
+        {"creator": "another@example.com", "project": a.pk, "investment_share": "50"},
+    ])
+
+    assert rollup(another_user) == {(a.company_id, 1, Decimal("50.00"), Decimal("500.00"))}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_first_subscriptions_share_one_rollup(test_user, test_company_with_user):
+    company = test_company_with_user
+    inserted, commit = threading.Event(), threading.Event()
+
+    def other_request():
+        try:
+            with transaction.atomic():
+                update_portfolio_exposure(test_user.pk, company.pk, 1, Decimal("10"), Decimal("100"))
+                inserted.set()
+                commit.wait(5)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=other_request)
+    thread.start()
+    assert inserted.wait(5)
+    # Commit the other row while this insert is waiting on it
+    threading.Timer(0.2, commit.set).start()
+    update_portfolio_exposure(test_user.pk, company.pk, 1, Decimal("25"), Decimal("500"))
+    thread.join()
+
+    assert rollup(test_user) == {(company.pk, 2, Decimal("35.00"), Decimal("600.00"))}
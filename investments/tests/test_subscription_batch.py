@@ -0,0 +1,139 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from investments.models import Subscription
+from investments.utils import bulk_create_subscriptions
+from projects.models import Project
+
+URL = reverse("subscription-batch")
+
+
+@pytest.fixture
+def admin_user(django_user_model):
+    return django_user_model.objects.create_superuser(email="admin@example.com", password="adminpass")
+
+
+@pytest.mark.django_db
+def test_batch_validates_rows_against_running_allocation(test_user, another_user, test_project):
+    Subscription.objects.create(creator=test_user, project=test_project, investment_share=Decimal("50"))
+
+    results = bulk_create_subscriptions([
+        {"creator": "another@example.com", "project": test_project.pk, "investment_share": "30"},
+        {"creator": "apiuser@example.com", "project": test_project.pk, "investment_share": "10"},
+        {"creator": "nobody@example.com", "project": test_project.pk, "investment_share": "5"},
+        {"creator": "another@example.com", "project": 999999, "investment_share": "5"},
+        {"creator": "another@example.com", "project": test_project.pk, "investment_share": "1.234"},
+    ])
+
+    assert [r["status"] for r in results] == ["created", "invalid", "invalid", "invalid", "invalid"]
+    assert "non_field_errors" in results[1]["errors"]
+    assert "creator" in results[2]["errors"]
+    assert "project" in results[3]["errors"]
+    assert "investment_share" in results[4]["errors"]
+
+    test_project.refresh_from_db()
+    assert test_project.subscriber_count == 2
+    assert test_project.allocated_share == Decimal("80.00")
+
+
+@pytest.mark.django_db
+def test_batch_rejects_rows_past_full_allocation(django_user_model, test_project):
+    for i in range(3):
+        django_user_model.objects.create_user(email=f"investor{i}@example.com", password="pass")
+
+    results = bulk_create_subscriptions([
+        {"creator": f"investor{i}@example.com", "project": test_project.pk, "investment_share": "40"}
+        for i in range(3)
+    ])
+
+    assert [r["status"] for r in results] == ["created", "created", "invalid"]
+    assert test_project.subscriptions.count() == 2
+
+
+@pytest.mark.django_db
+def test_batch_query_count_is_independent_of_size(django_user_model, test_company_with_user, django_assert_max_num_queries):
+    projects = [
+        Project.objects.create(name=f"P{i}", required_funding=1000, company=test_company_with_user)
+        for i in range(20)
+    ]
+    users = [django_user_model(email=f"bulk{i}@example.com") for i in range(50)]
+    django_user_model.objects.bulk_create(users)
+    rows = [
+        {"creator": f"bulk{u}@example.com", "project": p.pk, "investment_share": "1"}
+        for u in range(50) for p in projects
+    ]
+
+    with django_assert_max_num_queries(11 + len(projects)):
+        results = bulk_create_subscriptions(rows)
+
+    assert all(r["status"] == "created" for r in results)
+    assert Subscription.objects.count() == 1000
+    assert Project.objects.get(pk=projects[0].pk).subscriber_count == 50
+
+
+@pytest.mark.django_db
+def test_batch_dry_run_saves_nothing(test_user, test_project):
+    results = bulk_create_subscriptions(
+        [{"project": test_project.pk, "investment_share": "10"}], creator=test_user, dry_run=True
+    )
+
+    assert results == [{"row": 0, "status": "valid"}]
+    assert not Subscription.objects.exists()
+
+
+@pytest.mark.django_db
+def test_batch_endpoint_creates_own_subscriptions(api_client, test_user, test_project):
+    api_client.force_authenticate(user=test_user)
+
+    response = api_client.post(URL, {"rows": [
+        {"project": test_project.pk, "investment_share": "10"},
+        {"creator": "another@example.com", "project": test_project.pk, "investment_share": "10"},
+    ]}, format="json")
+
+    assert response.status_code == 201
+    assert response.data["created"] == 1
+    assert response.data["failed"] == 1
+    assert "creator" in response.data["results"][1]["errors"]
+    assert Subscription.objects.get().creator == test_user
+
+
+@pytest.mark.django_db
+def test_batch_endpoint_lets_staff_import_for_investors(api_client, admin_user, another_user, test_project):
+    api_client.force_authenticate(user=admin_user)
+
+    response = api_client.post(URL, {"rows": [
+        {"creator": "another@example.com", "project": test_project.pk, "investment_share": "10"},
+    ]}, format="json")
+
+    assert response.status_code == 201
+    assert Subscription.objects.get().creator == another_user
+
+
+@pytest.mark.django_db
+def test_batch_endpoint_rejects_empty_payload(api_client, test_user):
+    api_client.force_authenticate(user=test_user)
+
+    response = api_client.post(URL, {"rows": []}, format="json")
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_import_subscriptions_command(tmp_path, test_user, another_user, test_project, capsys):
+    path = tmp_path / "subscriptions.csv"
+    path.write_text(
+        "creator,project,investment_share\n"
+        f"apiuser@example.com,{test_project.pk},25\n"
+        f"another@example.com,{test_project.pk},80\n"
+    )
+
+    call_command("import_subscriptions", str(path), "--batch-size", "1")
+
+    out, err = capsys.readouterr()
+    assert "Imported 1 subscriptions, 1 rows failed." in out
+    assert "Row 2" in err
+    test_project.refresh_from_db()
+    assert test_project.allocated_share == Decimal("25.00")
@@ -0,0 +1,138 @@
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from projects.models import Project
+from .models import Subscription, refresh_portfolios, update_project_totals
+
+User = get_user_model()
+
+MIN_SHARE = Decimal("0.01")
+MAX_SHARE = Decimal("100.00")
+
+
+def _parse_share(value, errors):
+    try:
+        share = Decimal(str(value))
+    except (InvalidOperation, TypeError, ValueError):
+        errors["investment_share"] = "A valid number is required."
+        return None
+    if not share.is_finite() or share.as_tuple().exponent < -2:
+        errors["investment_share"] = "Investment share must have no more than 2 decimal places."
+    elif share < MIN_SHARE or share > MAX_SHARE:
+        errors["investment_share"] = "Investment share must be between 0.01 and 100."
+    return share
+
+
+def _parse_project(value, errors):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        errors["project"] = "A valid project id is required."
+        return None
+
+
+def bulk_create_subscriptions(rows, creator=None, dry_run=False):
+    """
+    Validate and insert many subscriptions in one transaction.
+
+    Rows are dicts with ``project``, ``investment_share`` and, unless a fixed
+    ``creator`` is given, ``creator`` (the investor's email). Validation runs
+    in a single pass against allocations loaded up front: referenced projects
+    are locked and their maintained ``allocated_share`` read in one query,
+    users and existing (creator, project) pairs in one query each. Rows are
+    checked in order, so a row that would push a project past 100% fails
+    while earlier rows for the same project succeed. Valid rows are inserted
+    with ``bulk_create``, project totals updated once per project and the
+    investors' portfolio rollups rebuilt together.
+
+    Args:
+        rows (list[dict]): The rows to import.
+        creator (User | None): Owner of every row; ``creator`` columns must
+            then be empty or match this user's email.
+        dry_run (bool): Validate only and roll back.
+
+    Returns:
+        list[dict]: One result per row, in input order, with ``row``,
+        ``status`` (``created``, ``valid`` on dry runs, or ``invalid``) and
+        either ``id`` or ``errors``.
+    """
+    parsed = []
+    for row in rows:
+        errors = {}
+        share = _parse_share(row.get("investment_share"), errors)
+        project_id = _parse_project(row.get("project"), errors)
+        email = (row.get("creator") or "").strip()
+        if creator is not None and email and email.lower() != creator.email.lower():
+            errors["creator"] = "You can only create your own subscriptions."
+        elif creator is None and not email:
+            errors["creator"] = "Creator email is required."
+        parsed.append((email.lower(), project_id, share, errors))
+
+    project_ids = {project_id for _, project_id, _, errors in parsed if not errors}
+    emails = {email for email, _, _, errors in parsed if not errors and email}
+
+    results = []
+    with transaction.atomic():
+        allocated = dict(
+            Project.objects.select_for_update()
+            .filter(pk__in=project_ids)
+            .order_by("pk")
+            .values_list("pk", "allocated_share")
+        )
+        if creator is not None:
+            user_ids = {email: creator.pk for email in emails}
+            user_ids[""] = creator.pk
+        else:
+            user_ids = {
+                email.lower(): pk
+                for email, pk in User.objects.filter(email__in=emails).values_list("email", "pk")
+            }
+        taken = set(
+            Subscription.objects.filter(
+                project_id__in=project_ids, creator_id__in=set(user_ids.values())
+            ).values_list("creator_id", "project_id")
+        )
+
+        to_create = []
+        for index, (email, project_id, share, errors) in enumerate(parsed):
+            user_id = user_ids.get(email)
+            if not errors:
+                if project_id not in allocated:
+                    errors["project"] = "Project not found."
+                if user_id is None:
+                    errors["creator"] = "User not found."
+            if not errors:
+                if (user_id, project_id) in taken:
+                    errors["non_field_errors"] = "This investor is already subscribed to the project."
+                elif allocated[project_id] + share > MAX_SHARE:
+                    errors["investment_share"] = "Total investment for this project cannot exceed 100%."
+
+            if errors:
+                results.append({"row": index, "status": "invalid", "errors": errors})
+                continue
+
+            taken.add((user_id, project_id))
+            allocated[project_id] += share
+            to_create.append(Subscription(creator_id=user_id, project_id=project_id, investment_share=share))
+            results.append({"row": index, "status": "valid"})
+
+        if dry_run or not to_create:
+            return results
+
+        created = iter(Subscription.objects.bulk_create(to_create))
+        totals = defaultdict(lambda: [0, Decimal("0")])
+        for result in results:
+            if result["status"] == "valid":
+                subscription = next(created)
+                result.update(status="created", id=subscription.pk)
+                totals[subscription.project_id][0] += 1
+                totals[subscription.project_id][1] += subscription.investment_share
+
+        for project_id, (count, share) in totals.items():
+            update_project_totals(project_id, count, share)
+        refresh_portfolios({subscription.creator_id for subscription in to_create})
+
+    return results
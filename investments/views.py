@@ -1,6 +1,12 @@
-from rest_framework import viewsets, permissions
-from .models import Subscription
-from .serializers import SubscriptionSerializer
+from collections import defaultdict
+from decimal import Decimal
+
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .models import PortfolioExposure, Subscription
+from .serializers import PortfolioExposureSerializer, SubscriptionSerializer, SubscriptionBatchSerializer
+from .utils import bulk_create_subscriptions
 
 
 class SubscriptionViewSet(viewsets.ModelViewSet):
@@ -18,6 +24,74 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         serializer.save(creator=self.request.user)
 
     def get_permissions(self):
-        if self.action in ["list", "create", "retrieve"]:
+        if self.action in ["list", "create", "retrieve", "batch", "portfolio"]:
             return super().get_permissions()
-        return [permissions.IsAdminUser()]  # updates/deletions are prohibited
\ No newline at end of file
+        return [permissions.IsAdminUser()]  # updates/deletions are prohibited
+
+    def get_serializer_class(self):
+        if self.action == "batch":
+            return SubscriptionBatchSerializer
+        if self.action == "portfolio":
+            return PortfolioExposureSerializer
+        return super().get_serializer_class()
+
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """
+        Create many subscriptions in one transaction.
+
+        Staff may import rows for any investor by email; everyone else only
+        creates their own. Valid rows are saved even when others fail, and
+        the response reports every row. Pass ``dry_run`` to validate only.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = bulk_create_subscriptions(
+            serializer.validated_data["rows"],
+            creator=None if request.user.is_staff else request.user,
+            dry_run=serializer.validated_data["dry_run"],
+        )
+        failed = sum(1 for result in results if result["status"] == "invalid")
+        created = sum(1 for result in results if result["status"] == "created")
+        return Response(
+            {"created": created, "failed": failed, "results": results},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"])
+    def portfolio(self, request):
+        """
+        Summarise the user's investments: totals plus exposure per company
+        and per industry. Reads the maintained rollup, one row per company,
+        so the cost does not grow with the number of subscriptions.
+        """
+        exposures = (
+            PortfolioExposure.objects.filter(investor=request.user)
+            .select_related("company")
+            .order_by("-exposure", "company_id")
+        )
+        companies = self.get_serializer(exposures, many=True).data
+
+        industries = defaultdict(lambda: {"project_count": 0, "total_share": Decimal("0"), "exposure": Decimal("0")})
+        for exposure in exposures:
+            industry = industries[exposure.company.industry]
+            industry["project_count"] += exposure.project_count
+            industry["total_share"] += exposure.total_share
+            industry["exposure"] += exposure.exposure
+
+        return Response({
+            "project_count": sum(e.project_count for e in exposures),
+            "total_share": str(sum((e.total_share for e in exposures), Decimal("0.00"))),
+            "total_exposure": str(sum((e.exposure for e in exposures), Decimal("0.00"))),
+            "companies": companies,
+            "industries": [
+                {
+                    "industry": name,
+                    "project_count": totals["project_count"],
+                    "total_share": str(totals["total_share"]),
+                    "exposure": str(totals["exposure"]),
+                }
+                for name, totals in sorted(industries.items(), key=lambda item: -item[1]["exposure"])
+            ],
+        })
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from UA_13XX_bravo.fieldsets import LeanField, LeanSerializer, as_datetime
 from .models import Notification, NotificationPreference, Type, User, Entity
 
 
@@ -87,6 +88,21 @@ class NotificationSerializer(serializers.ModelSerializer):
         return instance
 
 
+def _entity(entity_id, name):
+    return None if entity_id is None else {"id": entity_id, "name": name}
+
+
+class NotificationListSerializer(LeanSerializer):
+    """Same output as NotificationSerializer, for the list endpoint."""
+    id = LeanField()
+    user = LeanField("user_id", model_fields=("user",))
+    entity = LeanField("entity_id", "entity__name", convert=_entity, model_fields=("entity",))
+    type = LeanField("type__name", model_fields=("type",))
+    content = LeanField()
+    created_at = LeanField(convert=as_datetime)
+    read = LeanField()
+
+
 class NotificationPreferenceSerializer(serializers.ModelSerializer):
     enabled = serializers.BooleanField(default=True)
     type = serializers.CharField()  # Using CharField instead of SlugRelatedField
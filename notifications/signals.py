@@ -3,14 +3,16 @@ from django.dispatch import receiver
 from .models import Notification, Type
 from companies.models import CompanyFollowers, CompanyProfile, UserToCompany
 from django.contrib.auth import get_user_model
-from .utils import send_email_notification
 from django.core.mail import send_mail
+from UA_13XX_bravo.metrics import NOTIFICATION_FANOUT
+from UA_13XX_bravo.tracing import traced
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+@traced()
 def send_notification_and_email(user, notif_type_name, content):
     """
     Creates a notification and sends an email to the user.
@@ -48,14 +50,17 @@ def send_notification_and_email(user, notif_type_name, content):
 
 
 @receiver(post_save, sender=CompanyProfile)
+@traced()
 def notify_followers_on_update(sender, instance, created, **kwargs):
     if created:
         return
     
-    followers = CompanyFollowers.objects.filter(startup=instance)
+    followers = CompanyFollowers.objects.followers_of(instance)
+    notified = 0
     for follow in followers:
-        investor_user = UserToCompany.objects.filter(company=follow.investor).first()
+        investor_user = UserToCompany.objects.filter(company_id=follow.investor_id).select_related("user").first()
         if investor_user:
             content = f"{instance.company_name} updated their profile."
             send_notification_and_email(investor_user.user, "new_post", content)
-            print(send_notification_and_email)
\ No newline at end of file
+            notified += 1
+    NOTIFICATION_FANOUT.labels(type="new_post").observe(notified)
@@ -3,7 +3,10 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db import transaction
 from .models import Notification, NotificationPreference, Type
+from UA_13XX_bravo.fieldsets import SparseFieldsetMixin
+from UA_13XX_bravo.streaming import StreamingListMixin
 from .serializers import (
+    NotificationListSerializer,
     NotificationSerializer,
     NotificationPreferenceSerializer,
     TypeSerializer,
@@ -14,8 +17,10 @@ from rest_framework.views import APIView
 from .permissions import IsOwner
 
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = NotificationSerializer
+    lean_serializer_class = NotificationListSerializer
+    replica_read_actions = ("list",)
 
     def get_queryset(self):
         return (
@@ -105,14 +110,16 @@ class NotificationPreferenceViewSet(viewsets.ModelViewSet):
 
 class TypesListView(APIView):
     permission_classes = [IsAuthenticated]
+    replica_read_actions = ("get",)
 
     def get(self, request):
         types = Type.get_cached_types()
         serializer = TypeSerializer(types, many=True)
         return Response(serializer.data)
     
-class InvestorNotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class InvestorNotificationViewSet(StreamingListMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = NotificationSerializer
+    lean_serializer_class = NotificationListSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
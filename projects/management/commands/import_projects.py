@@ -0,0 +1,10 @@
+from UA_13XX_bravo.imports import BulkImportCommand
+
+
+class Command(BulkImportCommand):
+    help = (
+        "Import projects from a CSV (company,name,status,information,required_funding,raised_amount) "
+        "or NDJSON file. Each batch is validated and inserted in one transaction."
+    )
+    label = "projects"
+    import_function = "projects.utils.bulk_create_projects"
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.6 on 2026-10-19 17:21
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_funding_aggregates(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    Subscription = apps.get_model("investments", "Subscription")
+
+    totals = Subscription.objects.values("project_id").annotate(
+        count=Count("id"), share=Sum("investment_share")
+    )
+    for row in totals.iterator():
+        Project.objects.filter(pk=row["project_id"]).update(
+            subscriber_count=row["count"], allocated_share=row["share"]
+        )
+
+    batch = []
+    for project in Project.objects.only("required_funding", "raised_amount").iterator():
+        if project.required_funding:
+            percent = (project.raised_amount or 0) * 100 / project.required_funding
+            project.funded_percent = min(percent, Decimal("100")).quantize(Decimal("0.01"))
+            batch.append(project)
+        if len(batch) >= 1000:
+            Project.objects.bulk_update(batch, ["funded_percent"])
+            batch = []
+    Project.objects.bulk_update(batch, ["funded_percent"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0007_alter_companyprofile_type'),
+        ('projects', '0002_alter_project_company_alter_project_raised_amount_and_more'),
+        ('investments', '0005_alter_subscription_investment_share'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='allocated_share',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='funded_percent',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='subscriber_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['-funded_percent', 'id'], name='project_active_funded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['-subscriber_count', 'id'], name='project_active_subs_idx'),
+        ),
+        migrations.RunPython(backfill_funding_aggregates, migrations.RunPython.noop),
+    ]
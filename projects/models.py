@@ -10,6 +10,16 @@ class ProjectStatus(models.TextChoices):
     COMPLETED = "completed", "Completed"
 
 
+def funded_percent(raised_amount, required_funding) -> Decimal:
+    """Share of the required funding already raised, capped at 100."""
+    if not required_funding:
+        return Decimal("0.00")
+    # Values assigned in code may still be ints or floats at this point
+    raised = Decimal(str(raised_amount or 0))
+    percent = raised * 100 / Decimal(str(required_funding))
+    return min(percent, Decimal("100")).quantize(Decimal("0.01"))
+
+
 class Project(models.Model):
     name = models.CharField(max_length=255, unique=True)
     status = models.CharField(max_length=20, choices=ProjectStatus.choices)
@@ -27,6 +37,16 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Maintained aggregates: funded_percent on save, the subscription totals by
+    # investments.Subscription whenever its rows change.
+    funded_percent = models.DecimalField(
+        max_digits=5, decimal_places=2, default=Decimal("0.00"), editable=False
+    )
+    subscriber_count = models.PositiveIntegerField(default=0, editable=False)
+    allocated_share = models.DecimalField(
+        max_digits=5, decimal_places=2, default=Decimal("0.00"), editable=False
+    )
+
     def __str__(self):
         return self.name
 
@@ -34,5 +54,30 @@ class Project(models.Model):
         if self.raised_amount and self.raised_amount > self.required_funding:
             raise ValidationError("Raised amount cannot exceed required funding.")
 
+    def compute_funded_percent(self) -> Decimal:
+        return funded_percent(self.raised_amount, self.required_funding)
+
+    def save(self, *args, **kwargs):
+        self.funded_percent = self.compute_funded_percent()
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"raised_amount", "required_funding"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "funded_percent"}
+
+        super().save(*args, **kwargs)
+
     class Meta:
         db_table = "project"
+        indexes = [
+            # Leaderboards read these in index order instead of sorting
+            models.Index(
+                fields=["-funded_percent", "id"],
+                name="project_active_funded_idx",
+                condition=models.Q(status=ProjectStatus.ACTIVE),
+            ),
+            models.Index(
+                fields=["-subscriber_count", "id"],
+                name="project_active_subs_idx",
+                condition=models.Q(status=ProjectStatus.ACTIVE),
+            ),
+        ]
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from projects.models import Project
+from UA_13XX_bravo.fieldsets import LeanField, LeanSerializer, as_decimal
 
 
 class ProjectListSerializer(serializers.ModelSerializer):
@@ -25,9 +26,26 @@ class ProjectListSerializer(serializers.ModelSerializer):
             "required_funding",
             "raised_amount",
             "company",
+            "funded_percent",
+            "subscriber_count",
+            "allocated_share",
         )
 
 
+class ProjectLeanListSerializer(LeanSerializer):
+    """Same output as ProjectListSerializer, for the list endpoint."""
+    id = LeanField()
+    name = LeanField()
+    status = LeanField()
+    information = LeanField()
+    required_funding = LeanField(convert=as_decimal)
+    raised_amount = LeanField(convert=as_decimal)
+    company = LeanField("company_id", model_fields=("company",))
+    funded_percent = LeanField(convert=as_decimal)
+    subscriber_count = LeanField()
+    allocated_share = LeanField(convert=as_decimal)
+
+
 class ProjectCreateUpdateSerializer(serializers.ModelSerializer):
     status = serializers.ChoiceField(
         choices=[choice[0] for choice in Project._meta.get_field("status").choices],
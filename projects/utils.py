@@ -0,0 +1,131 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+
+from companies.models import CompanyProfile
+from UA_13XX_bravo.imports import copy_insert, existing_values, reserve_ids
+from .models import Project, ProjectStatus, funded_percent
+
+MAX_AMOUNT = Decimal("9999999999999.99")
+STATUSES = set(ProjectStatus.values)
+
+
+def _parse_amount(value, field, errors, default=None):
+    value = "" if value is None else str(value).strip()
+    if not value:
+        if default is None:
+            errors[field] = "This field is required."
+        return default
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        errors[field] = "A valid number is required."
+        return None
+    if not amount.is_finite() or amount.as_tuple().exponent < -2:
+        errors[field] = "Ensure that there are no more than 2 decimal places."
+    elif amount < 0:
+        errors[field] = f"{field.replace('_', ' ').capitalize()} cannot be negative."
+    elif amount > MAX_AMOUNT:
+        errors[field] = "Ensure that there are no more than 15 digits in total."
+    return amount
+
+
+def _parse_project(row):
+    errors = {}
+    name = str(row.get("name") or "").strip()
+    if not name:
+        errors["name"] = "This field may not be blank."
+    elif len(name) > 255:
+        errors["name"] = "Ensure this field has no more than 255 characters."
+    information = str(row.get("information") or "").strip()
+    if not information:
+        errors["information"] = "This field may not be blank."
+    status = str(row.get("status") or "").strip()
+    if status not in STATUSES:
+        errors["status"] = "Invalid company status. Choose from: {}".format(", ".join(ProjectStatus.values))
+    try:
+        company_id = int(row.get("company"))
+    except (TypeError, ValueError):
+        errors["company"] = "A valid company id is required."
+        company_id = None
+
+    required = _parse_amount(row.get("required_funding"), "required_funding", errors)
+    raised = _parse_amount(row.get("raised_amount"), "raised_amount", errors, default=Decimal("0.00"))
+    if not errors and raised > required:
+        errors["raised_amount"] = "Raised amount cannot be greater than required funding."
+
+    values = {
+        "name": name,
+        "status": status,
+        "information": information,
+        "company_id": company_id,
+        "required_funding": required,
+        "raised_amount": raised,
+    }
+    return values, errors
+
+
+def bulk_create_projects(rows, dry_run=False):
+    """
+    Validate and insert many projects in one transaction.
+
+    Rows are dicts with ``company`` (id), ``name``, ``status``,
+    ``information``, ``required_funding`` and optionally ``raised_amount``,
+    checked like ProjectCreateUpdateSerializer. Names are checked for
+    uniqueness against the names of the batch loaded in one query, plus the
+    batch itself, and companies are loaded in one query. Valid rows are
+    written with ``COPY FROM``, with ids drawn from the sequence in one
+    query and ``funded_percent`` computed up front.
+
+    Returns:
+        list[dict]: One result per row, in input order, with ``row``,
+        ``status`` (``created``, ``valid`` on dry runs, or ``invalid``) and
+        either ``id`` or ``errors``.
+    """
+    parsed = [_parse_project(row) for row in rows]
+    names = {values["name"] for values, errors in parsed if not errors}
+    company_ids = {values["company_id"] for values, errors in parsed if not errors}
+
+    results = []
+    with transaction.atomic():
+        taken = existing_values(Project, "name", names)
+        companies = set(CompanyProfile.objects.filter(pk__in=company_ids).values_list("pk", flat=True))
+
+        valid = []
+        for index, (values, errors) in enumerate(parsed):
+            if not errors:
+                if values["name"] in taken:
+                    errors["name"] = "project with this name already exists."
+                if values["company_id"] not in companies:
+                    errors["company"] = "Company not found."
+            if errors:
+                results.append({"row": index, "status": "invalid", "errors": errors})
+                continue
+            taken.add(values["name"])
+            valid.append((index, values))
+            results.append({"row": index, "status": "valid"})
+
+        if dry_run or not valid:
+            return results
+
+        now = timezone.now()
+        zero = Decimal("0.00")
+        ids = reserve_ids(Project, len(valid))
+        copy_insert(
+            Project,
+            ["id", *valid[0][1], "funded_percent", "subscriber_count", "allocated_share", "created_at", "updated_at"],
+            (
+                [
+                    pk,
+                    *values.values(),
+                    funded_percent(values["raised_amount"], values["required_funding"]),
+                    0, zero, now, now,
+                ]
+                for pk, (_, values) in zip(ids, valid)
+            ),
+        )
+        for pk, (index, _) in zip(ids, valid):
+            results[index].update(status="created", id=pk)
+
+    return results
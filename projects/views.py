@@ -1,16 +1,26 @@
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from companies.permissions import IsCompanyMember
 
-from projects.models import Project
-from projects.serializers import ProjectCreateUpdateSerializer, ProjectListSerializer
+from projects.models import Project, ProjectStatus
+from projects.serializers import ProjectCreateUpdateSerializer, ProjectLeanListSerializer, ProjectListSerializer
+from projects.utils import bulk_create_projects
+from UA_13XX_bravo.imports import BulkImportSerializer, import_response
+from UA_13XX_bravo.streaming import StreamingListMixin
 
 
-class ProjectViewSet(ModelViewSet):
+class ProjectViewSet(StreamingListMixin, ModelViewSet):
     http_method_names = ("get", "post", "put", "delete")
     serializer_class = ProjectListSerializer
+    lean_serializer_class = ProjectLeanListSerializer
     permission_classes = [IsAuthenticated]
     queryset = Project.objects.all()
+    replica_read_actions = ("list", "closest_to_funded", "most_subscribed")
+    leaderboard_default_limit = 10
+    leaderboard_max_limit = 100
 
     def get_permissions(self):
         match (self.action):
@@ -30,5 +40,52 @@ class ProjectViewSet(ModelViewSet):
         match self.action:
             case "create" | "update" | "partial_update":
                 return ProjectCreateUpdateSerializer
+            case "bulk_import":
+                return BulkImportSerializer
             case _:
                 return ProjectListSerializer
+
+    @action(detail=False, methods=["post"], url_path="import", permission_classes=[IsAdminUser])
+    def bulk_import(self, request):
+        """
+        Create many projects for any companies in one transaction (staff
+        only). Valid rows are saved even when others fail; pass ``dry_run``
+        to validate only.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return import_response(
+            bulk_create_projects(serializer.validated_data["rows"], dry_run=serializer.validated_data["dry_run"])
+        )
+
+    @action(detail=False, methods=["get"], url_path="closest-to-funded")
+    def closest_to_funded(self, request):
+        """Active projects that still need funding, most funded first."""
+        projects = Project.objects.filter(
+            status=ProjectStatus.ACTIVE, funded_percent__lt=100
+        ).order_by("-funded_percent", "id")
+        return self.leaderboard_response(projects)
+
+    @action(detail=False, methods=["get"], url_path="most-subscribed")
+    def most_subscribed(self, request):
+        """Active projects with the most investors first."""
+        projects = Project.objects.filter(status=ProjectStatus.ACTIVE).order_by(
+            "-subscriber_count", "id"
+        )
+        return self.leaderboard_response(projects)
+
+    def leaderboard_response(self, queryset):
+        """
+        Return the top ``?limit=`` rows of a leaderboard.
+
+        The orderings match the partial indexes on Project, so Postgres reads
+        the first rows straight from the index.
+        """
+        try:
+            limit = int(self.request.query_params.get("limit", self.leaderboard_default_limit))
+        except ValueError:
+            raise ValidationError({"limit": "Limit must be an integer."})
+        limit = max(1, min(limit, self.leaderboard_max_limit))
+
+        serializer = self.get_serializer(queryset[:limit], many=True)
+        return Response(serializer.data)
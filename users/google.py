@@ -0,0 +1,150 @@
+"""
+Google OAuth token verification.
+
+ID tokens are verified locally against Google's JWKS key set. The key set is
+kept in the Django cache for as long as Google's ``Cache-Control: max-age``
+allows and is refetched when it expires or when a token is signed with a key
+we have not seen yet, so most logins need no outbound request. Opaque access
+tokens fall back to the userinfo endpoint. All HTTP calls go through an async
+client with timeouts.
+"""
+import logging
+import re
+import ssl
+
+import httpx
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+JWKS_CACHE_KEY = "google_oauth_jwks"
+JWKS_REFRESH_LOCK_KEY = "google_oauth_jwks_refreshed"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+_ssl_context = None
+
+
+class GoogleAuthError(Exception):
+    """Raised when a Google token cannot be verified."""
+
+
+def _http_client() -> httpx.AsyncClient:
+    # Building an SSL context costs tens of milliseconds, so share one across
+    # the short-lived clients (a client cannot outlive its event loop).
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return httpx.AsyncClient(timeout=settings.GOOGLE_HTTP_TIMEOUT, verify=_ssl_context)
+
+
+async def fetch_jwks() -> dict:
+    """
+    Download Google's signing keys and store them in the cache.
+
+    Returns:
+        dict: JWK dictionaries keyed by their ``kid``.
+
+    Raises:
+        GoogleAuthError: If the key set cannot be retrieved.
+    """
+    try:
+        async with _http_client() as client:
+            response = await client.get(settings.GOOGLE_JWKS_URL)
+        response.raise_for_status()
+        keys = {key["kid"]: key for key in response.json().get("keys", [])}
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        logger.error(f"Failed to fetch Google JWKS: {e}")
+        raise GoogleAuthError("Failed to retrieve Google signing keys") from e
+
+    match = MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+    timeout = int(match.group(1)) if match else settings.GOOGLE_JWKS_CACHE_SECONDS
+
+    await cache.aset(JWKS_CACHE_KEY, keys, timeout)
+    await cache.aset(JWKS_REFRESH_LOCK_KEY, True, settings.GOOGLE_JWKS_MIN_REFRESH_SECONDS)
+    return keys
+
+
+async def get_signing_key(kid: str):
+    """
+    Return the public key for ``kid``, refreshing the cached key set if needed.
+
+    A refresh triggered by an unknown ``kid`` is rate limited so that forged
+    tokens cannot make us hammer Google's endpoint.
+    """
+    keys = await cache.aget(JWKS_CACHE_KEY)
+    if keys is None or (kid not in keys and not await cache.aget(JWKS_REFRESH_LOCK_KEY)):
+        keys = await fetch_jwks()
+
+    jwk = keys.get(kid)
+    if jwk is None:
+        raise GoogleAuthError("Unknown Google signing key")
+    return jwt.PyJWK(jwk).key
+
+
+async def verify_id_token(token: str) -> dict:
+    """
+    Verify a Google ID token locally and return its claims.
+
+    Raises:
+        GoogleAuthError: If the signature, audience, issuer or expiry is invalid.
+    """
+    try:
+        header = jwt.get_unverified_header(token)
+    except jwt.PyJWTError as e:
+        raise GoogleAuthError("Malformed Google ID token") from e
+
+    key = await get_signing_key(header.get("kid"))
+
+    try:
+        claims = jwt.decode(
+            token,
+            key=key,
+            algorithms=["RS256"],
+            audience=settings.GOOGLE_CLIENT_ID,
+        )
+    except jwt.PyJWTError as e:
+        raise GoogleAuthError("Invalid Google ID token") from e
+
+    if claims.get("iss") not in GOOGLE_ISSUERS:
+        raise GoogleAuthError("Invalid Google ID token issuer")
+    if not claims.get("email_verified", False):
+        raise GoogleAuthError("Google account email is not verified")
+    return claims
+
+
+async def fetch_userinfo(access_token: str) -> dict:
+    """
+    Resolve an opaque Google access token through the userinfo endpoint.
+
+    Raises:
+        GoogleAuthError: If Google rejects the token or does not respond in time.
+    """
+    try:
+        async with _http_client() as client:
+            response = await client.get(
+                settings.GOOGLE_USERINFO_URL,
+                headers={"Authorization": f"Bearer {access_token}"},
+            )
+    except httpx.HTTPError as e:
+        logger.warning(f"Google userinfo request failed: {e}")
+        raise GoogleAuthError("Failed to retrieve Google user info") from e
+
+    if response.status_code != 200:
+        raise GoogleAuthError("Failed to retrieve Google user info")
+    return response.json()
+
+
+async def get_google_user_info(token: str) -> dict:
+    """
+    Return the Google profile (``email``, ``name``) for an ID or access token.
+
+    JWT-shaped tokens are treated as ID tokens and verified locally; anything
+    else is sent to the userinfo endpoint.
+    """
+    if token.count(".") == 2:
+        return await verify_id_token(token)
+    return await fetch_userinfo(token)
@@ -5,8 +5,11 @@ from phonenumber_field.serializerfields import PhoneNumberField
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from companies.models import UserToCompany
+from django.contrib.auth.models import update_last_login
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenObtainSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from companies.utils import MEMBERSHIPS_CLAIM, get_membership_claims
 
 class UserSerializer(serializers.ModelSerializer):
     """
@@ -183,29 +186,81 @@ class LoginSerializer(serializers.Serializer):
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Issue JWT pairs that carry the user's company memberships.
+
+    Besides the selected ``company_id``, tokens embed every membership as
+    compact ``{"<company_id>": "<company_type>"}`` claims, loaded with a single
+    query, so permission checks can authorize without touching the database.
+    """
     company_id = serializers.IntegerField(required=False)
 
     @classmethod
-    def get_token(cls, user):
+    def get_token(cls, user, memberships: dict | None = None, company_id: int | None = None):
+        """
+        Build a refresh token with membership claims.
+
+        Args:
+            user: The user the token is issued for.
+            memberships (dict | None): Preloaded membership claims; loaded if omitted.
+            company_id (int | None): The selected company; defaults to the first membership.
+        """
         token = super().get_token(user)
 
-        user_company = UserToCompany.objects.filter(user=user).first()
-        token["company_id"] = user_company.company.id if user_company else None
+        if memberships is None:
+            memberships = get_membership_claims(user)
+        if company_id is None and memberships:
+            company_id = int(next(iter(memberships)))
 
+        token["company_id"] = company_id
+        token[MEMBERSHIPS_CLAIM] = memberships
         return token
 
     def validate(self, attrs):
-        data = super().validate(attrs)
+        # Authenticate only; the token pair is built below from the memberships
+        # loaded once here instead of querying them again in get_token().
+        data = TokenObtainSerializer.validate(self, attrs)
         request = self.context["request"]
 
+        memberships = get_membership_claims(self.user)
         company_id = request.data.get("company_id", None)
 
         if company_id:
-            is_valid_company = UserToCompany.objects.filter(user=self.user, company_id=company_id).exists()
-            if not is_valid_company:
+            if str(company_id) not in memberships:
                 raise serializers.ValidationError({"company_id": "You are not associated with this company."})
+            company_id = int(company_id)
+        else:
+            company_id = None
+
+        refresh = self.get_token(self.user, memberships=memberships, company_id=company_id)
+
+        data["refresh"] = str(refresh)
+        data["access"] = str(refresh.access_token)
+        data["company_id"] = refresh["company_id"]
 
-        user_company = UserToCompany.objects.filter(user=self.user).first()
-        data["company_id"] = user_company.company.id if user_company else None
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
 
         return data
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh JWT pairs with the membership claims reloaded from the database.
+
+    Rotated refresh tokens would otherwise carry the memberships from login
+    for as long as the user keeps refreshing, so a user removed from the
+    selected company can no longer refresh into it.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        memberships = get_membership_claims(refresh[api_settings.USER_ID_CLAIM])
+
+        company_id = refresh.get("company_id")
+        if company_id is not None and str(company_id) not in memberships:
+            raise InvalidToken("User is not associated with the selected company.")
+
+        refresh[MEMBERSHIPS_CLAIM] = memberships
+        # Same jti and expiry, so rotation still blacklists the token sent in
+        return super().validate({**attrs, "refresh": str(refresh)})
@@ -0,0 +1,42 @@
+import pytest
+from django.core import mail
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from users.models import User
+from users.views import GoogleOAuthView, PasswordResetRequestView, RegisterView
+
+
+@pytest.mark.parametrize("view", [RegisterView, PasswordResetRequestView, GoogleOAuthView])
+def test_io_bound_views_are_async(view):
+    assert view.view_is_async
+
+
+@pytest.mark.django_db
+def test_register_sends_verification_email():
+    response = APIClient().post(
+        reverse("register"),
+        {
+            "email": "async@example.com",
+            "password": "StrongPass123!",
+            "re_password": "StrongPass123!",
+            "phone": "+380501234567",
+        },
+        format="json",
+    )
+
+    assert response.status_code == 201
+    assert not User.objects.get(email="async@example.com").is_active
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == ["async@example.com"]
+
+
+@pytest.mark.django_db
+def test_password_reset_request_sends_email():
+    User.objects.create_user(email="reset@example.com", password="StrongPass123!")
+
+    response = APIClient().post(reverse("password-reset-request"), {"email": "reset@example.com"})
+
+    assert response.status_code == 200
+    assert len(mail.outbox) == 1
+    assert "password-reset-confirm" in mail.outbox[0].body
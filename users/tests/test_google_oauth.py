@@ -0,0 +1,161 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from users.models import User
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+
+
+@pytest.fixture
+def rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def google_server(rsa_key):
+    """Local stand-in for Google's JWKS and userinfo endpoints."""
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(rsa_key.public_key()))
+    jwk.update({"kid": "test-kid", "alg": "RS256", "use": "sig"})
+    state = {"jwks_hits": 0, "userinfo_hits": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/certs":
+                state["jwks_hits"] += 1
+                body = json.dumps({"keys": [jwk]}).encode()
+                self.send_response(200)
+                self.send_header("Cache-Control", "public, max-age=300")
+            elif self.path == "/userinfo":
+                state["userinfo_hits"] += 1
+                if self.headers.get("Authorization") != "Bearer opaque-token":
+                    self.send_response(401)
+                    self.end_headers()
+                    return
+                body = json.dumps({"email": "opaque@example.com", "name": "Opaque"}).encode()
+                self.send_response(200)
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}"
+    yield state
+    server.shutdown()
+
+
+@pytest.fixture
+def google_settings(settings, google_server):
+    settings.GOOGLE_CLIENT_ID = CLIENT_ID
+    settings.GOOGLE_JWKS_URL = f"{google_server['url']}/certs"
+    settings.GOOGLE_USERINFO_URL = f"{google_server['url']}/userinfo"
+    cache.clear()
+    yield settings
+    cache.clear()
+
+
+def make_id_token(key, kid="test-kid", **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": "1234567890",
+        "email": "google@example.com",
+        "email_verified": True,
+        "name": "Google User",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, key, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.mark.django_db
+def test_id_token_login_uses_cached_jwks(google_settings, google_server, rsa_key):
+    client = APIClient()
+    url = reverse("google-auth")
+
+    for _ in range(3):
+        response = client.post(url, {"token": make_id_token(rsa_key)}, format="json")
+        assert response.status_code == 200
+        assert "access" in response.data["tokens"]
+
+    assert google_server["jwks_hits"] == 1
+    assert google_server["userinfo_hits"] == 0
+    assert User.objects.filter(email="google@example.com").exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"aud": "someone-else"},
+        {"iss": "https://evil.example.com"},
+        {"exp": int(time.time()) - 60},
+        {"email_verified": False},
+    ],
+)
+def test_invalid_id_token_is_rejected(google_settings, rsa_key, overrides):
+    client = APIClient()
+    response = client.post(
+        reverse("google-auth"), {"token": make_id_token(rsa_key, **overrides)}, format="json"
+    )
+
+    assert response.status_code == 400
+    assert not User.objects.filter(email="google@example.com").exists()
+
+
+@pytest.mark.django_db
+def test_unknown_kid_refresh_is_rate_limited(google_settings, google_server, rsa_key):
+    client = APIClient()
+    url = reverse("google-auth")
+    client.post(url, {"token": make_id_token(rsa_key)}, format="json")
+
+    for _ in range(3):
+        response = client.post(url, {"token": make_id_token(rsa_key, kid="rotated")}, format="json")
+        assert response.status_code == 400
+
+    assert google_server["jwks_hits"] == 1
+
+
+@pytest.mark.django_db
+def test_access_token_falls_back_to_userinfo(google_settings, google_server):
+    client = APIClient()
+    url = reverse("google-auth")
+
+    response = client.post(url, {"token": "opaque-token"}, format="json")
+    assert response.status_code == 200
+    assert User.objects.filter(email="opaque@example.com").exists()
+
+    response = client.post(url, {"token": "bad-token"}, format="json")
+    assert response.status_code == 400
+    assert response.data["error"] == "Failed to retrieve Google user info"
+    assert google_server["jwks_hits"] == 0
+
+
+@pytest.mark.django_db
+def test_unreachable_google_returns_error(settings):
+    settings.GOOGLE_USERINFO_URL = "http://127.0.0.1:9/userinfo"
+    settings.GOOGLE_HTTP_TIMEOUT = 0.5
+    client = APIClient()
+
+    response = client.post(reverse("google-auth"), {"token": "opaque-token"}, format="json")
+
+    assert response.status_code == 400
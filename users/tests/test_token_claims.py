@@ -0,0 +1,103 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from companies.models import CompanyProfile, CompanyType, UserToCompany
+from companies.permissions import IsCompanyMember
+from companies.views import InvestorStartupMixin
+from users.models import User
+
+
+@pytest.fixture
+def member(db):
+    user = User.objects.create_user(email="member@example.com", password="StrongPass123!")
+    startup = CompanyProfile.objects.create(company_name="Claims Startup", type=CompanyType.STARTUP)
+    enterprise = CompanyProfile.objects.create(company_name="Claims Fund", type=CompanyType.ENTERPRISE)
+    UserToCompany.objects.create(user=user, company=startup)
+    UserToCompany.objects.create(user=user, company=enterprise)
+    return user, startup, enterprise
+
+
+def login(payload):
+    return APIClient().post(reverse("token_obtain_pair"), payload, format="json")
+
+
+@pytest.mark.django_db
+def test_login_embeds_all_memberships(member):
+    user, startup, enterprise = member
+
+    response = login({"email": user.email, "password": "StrongPass123!"})
+
+    assert response.status_code == 200
+    token = AccessToken(response.data["access"])
+    assert token["company_id"] == startup.id
+    assert response.data["company_id"] == startup.id
+    assert token["companies"] == {
+        str(startup.id): CompanyType.STARTUP,
+        str(enterprise.id): CompanyType.ENTERPRISE,
+    }
+
+
+@pytest.mark.django_db
+def test_login_selects_requested_company(member):
+    user, _, enterprise = member
+
+    response = login({"email": user.email, "password": "StrongPass123!", "company_id": enterprise.id})
+
+    assert response.status_code == 200
+    assert AccessToken(response.data["access"])["company_id"] == enterprise.id
+
+
+@pytest.mark.django_db
+def test_login_rejects_foreign_company(member):
+    user, _, _ = member
+    other = CompanyProfile.objects.create(company_name="Other", type=CompanyType.STARTUP)
+
+    response = login({"email": user.email, "password": "StrongPass123!", "company_id": other.id})
+
+    assert response.status_code == 400
+    assert "company_id" in response.data
+
+
+@pytest.mark.django_db
+def test_authorization_from_claims_needs_no_queries(member, django_assert_num_queries):
+    user, startup, enterprise = member
+    access = AccessToken(login({"email": user.email, "password": "StrongPass123!"}).data["access"])
+
+    request = APIRequestFactory().get("/")
+    request.user = user
+    request.auth = access
+
+    with django_assert_num_queries(0):
+        assert IsCompanyMember().has_permission(request, None)
+        investor = InvestorStartupMixin().get_investor_company(request)
+
+    assert request.company_id == startup.id
+    assert investor.id == enterprise.id
+    assert investor.type == CompanyType.ENTERPRISE
+
+
+@pytest.mark.django_db
+def test_refresh_reloads_memberships(member):
+    user, startup, enterprise = member
+    refresh = login({"email": user.email, "password": "StrongPass123!", "company_id": enterprise.id}).data["refresh"]
+    UserToCompany.objects.filter(user=user, company=startup).delete()
+
+    response = APIClient().post(reverse("jwt-refresh"), {"refresh": refresh}, format="json")
+
+    assert response.status_code == 200
+    assert AccessToken(response.data["access"])["companies"] == {str(enterprise.id): CompanyType.ENTERPRISE}
+    assert response.data["refresh"] != refresh
+
+
+@pytest.mark.django_db
+def test_refresh_rejects_removed_member(member):
+    user, startup, _ = member
+    refresh = login({"email": user.email, "password": "StrongPass123!"}).data["refresh"]
+    UserToCompany.objects.filter(user=user, company=startup).delete()
+
+    response = APIClient().post(reverse("jwt-refresh"), {"refresh": refresh}, format="json")
+
+    assert response.status_code == 401
+    assert "access" not in response.data
@@ -1,13 +1,24 @@
 import time
 import base64
 import os
-from argon2 import PasswordHasher
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
 
 User = get_user_model()
-ph = PasswordHasher()
 TOKEN_EXPIRATION = 3600
 
+
+@lru_cache(maxsize=1)
+def password_hasher():
+    """argon2's PasswordHasher, imported on first use: only token views need it."""
+    from argon2 import PasswordHasher
+
+    return PasswordHasher()
+
+
 def generate_verification_token(user):
     """
     Generates a token for email verification.
@@ -17,7 +28,7 @@ def generate_verification_token(user):
     salt = os.urandom(16)
 
     raw_token = f"{user_id}:{timestamp}".encode()
-    hashed_token = ph.hash(raw_token + salt)
+    hashed_token = password_hasher().hash(raw_token + salt)
 
     token = base64.urlsafe_b64encode(f"{user_id}:{timestamp}:{hashed_token}:{salt.hex()}".encode()).decode()
 
@@ -41,10 +52,21 @@ def verify_token(token):
             return None
 
         raw_token = f"{user.id}:{timestamp}".encode()
-        if ph.verify(hashed_token, raw_token + salt):
+        if password_hasher().verify(hashed_token, raw_token + salt):
             return user
 
     except Exception:
         return None
 
     return None
+
+
+async def asend_mail(*args, **kwargs):
+    """
+    Async wrapper around ``send_mail``.
+
+    The SMTP exchange runs in the thread pool rather than the shared
+    thread-sensitive executor, so slow mail servers neither block the event
+    loop nor queue up behind database work.
+    """
+    return await sync_to_async(send_mail, thread_sensitive=False)(*args, **kwargs)
@@ -1,33 +1,30 @@
-from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
+import logging
+
+from adrf import generics as async_generics
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.urls import reverse
-from django.contrib.auth.tokens import default_token_generator
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework import status, generics
-from rest_framework.permissions import AllowAny
+from rest_framework.throttling import AnonRateThrottle
 from rest_framework.views import APIView
-from .utils import generate_verification_token, verify_token
-from .serializers import UserSerializer, UserCreateSerializer, LogoutSerializer
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework.exceptions import AuthenticationFailed
-from .serializers import CustomTokenObtainPairSerializer
-from companies.models import UserToCompany
-from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework.throttling import AnonRateThrottle
-from .utils import generate_verification_token, verify_token
-from .serializers import UserSerializer, PasswordResetSerializer, UserCreateSerializer
-from users.models import User
-from datetime import timedelta
-from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework import serializers
-import logging
-import requests
-
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
 
+from companies.models import UserToCompany
+from companies.utils import get_token_memberships
+from .serializers import (
+    CustomTokenObtainPairSerializer,
+    LogoutSerializer,
+    PasswordResetSerializer,
+    UserCreateSerializer,
+)
+from .utils import asend_mail, generate_verification_token, verify_token
 
 logger = logging.getLogger(__name__)
 
@@ -35,19 +32,20 @@ logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
-class RegisterView(generics.CreateAPIView):
+class RegisterView(async_generics.CreateAPIView):
     """
     View for registering a new user.
 
     This view handles the creation of a new user and sends a verification email
-    to confirm their email address.
+    to confirm their email address. It is async so the SMTP round trip does not
+    hold a worker under ASGI.
     """
 
     permission_classes = [AllowAny]
     queryset = User.objects.all()
     serializer_class = UserCreateSerializer
 
-    def perform_create(self, serializer):
+    async def perform_acreate(self, serializer):
         """
         Save the new user instance and send a verification email.
 
@@ -57,12 +55,12 @@ class RegisterView(generics.CreateAPIView):
         Returns:
             None
         """
-        user = serializer.save(is_active=False)
+        user = await sync_to_async(serializer.save)(is_active=False)
 
-        token = generate_verification_token(user)
+        token = await sync_to_async(generate_verification_token)(user)
         verification_url = f"{settings.FRONTEND_URL}/auth/verify-email/?token={token}"
 
-        send_mail(
+        await asend_mail(
             "Confirm your email",
             f"Click the link to confirm your email: {verification_url}",
             settings.DEFAULT_FROM_EMAIL,
@@ -130,7 +128,7 @@ class LogoutView(APIView):
             return Response({"message": "Successfully logged out."}, status=status.HTTP_200_OK)
         except TokenError:
             return Response({"error": "Invalid or expired refresh token."}, status=status.HTTP_400_BAD_REQUEST)
-class PasswordResetRequestView(APIView):
+class PasswordResetRequestView(AsyncAPIView):
     """
     API View to handle password reset requests.
     """
@@ -138,17 +136,17 @@ class PasswordResetRequestView(APIView):
     throttle_classes = [AnonRateThrottle]
     serializer_class = PasswordResetSerializer  
 
-    def post(self, request):
+    async def post(self, request):
         serializer = PasswordResetSerializer(data=request.data)
-        if serializer.is_valid():
+        if await sync_to_async(serializer.is_valid)():
             email = serializer.validated_data["email"]
-            user = User.objects.filter(email=email).first()
+            user = await User.objects.filter(email=email).afirst()
             if user:
-                token = generate_verification_token(user)
+                token = await sync_to_async(generate_verification_token)(user)
                 reset_url = f"{settings.FRONTEND_URL}/password-reset-confirm/?token={token}"
                 email_body = f"Click the link below to reset your password:\n{reset_url}"
                 
-                send_mail(
+                await asend_mail(
                     "Password Reset Request",
                     email_body,
                     settings.DEFAULT_FROM_EMAIL,
@@ -229,9 +227,11 @@ class CustomJWTAuthentication(JWTAuthentication):
 
         if not company_id:
             raise AuthenticationFailed("Invalid token: company_id missing.")
-        
-        if not UserToCompany.objects.filter(user=user, company_id=company_id).exists():
-            raise AuthenticationFailed("User is not associated with the selected company.")
+
+        memberships = get_token_memberships(token)
+        if memberships is None or company_id not in memberships:
+            if not UserToCompany.objects.filter(user=user, company_id=company_id).exists():
+                raise AuthenticationFailed("User is not associated with the selected company.")
 
 
         if not hasattr(request, "company_id"):
@@ -239,44 +239,44 @@ class CustomJWTAuthentication(JWTAuthentication):
             
         return (user, token)
 
-import requests
-from django.conf import settings
-from django.contrib.auth import get_user_model
-from rest_framework.response import Response
-from rest_framework.views import APIView
-from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
 
-User = get_user_model()
-
-class GoogleOAuthView(APIView):
+class GoogleOAuthView(AsyncAPIView):
     """
     Handle Google OAuth login and JWT token issuance.
+
+    Accepts either a Google ID token, verified locally against the cached
+    JWKS key set, or an access token, resolved through Google's userinfo API.
     """
 
-    def post(self, request):
+    async def post(self, request):
+        # httpx and the JWKS client are only needed by this rarely used view
+        from .google import GoogleAuthError, get_google_user_info
+
         google_token = request.data.get("token")
 
         if not google_token:
             return Response({"error": "Missing Google token"}, status=status.HTTP_400_BAD_REQUEST)
 
-        google_user_info_url = "https://www.googleapis.com/oauth2/v2/userinfo"
-        headers = {"Authorization": f"Bearer {google_token}"}
-        response = requests.get(google_user_info_url, headers=headers)
-
-        if response.status_code != 200:
-            return Response({"error": "Failed to retrieve Google user info"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            user_data = await get_google_user_info(google_token)
+        except GoogleAuthError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        user_data = response.json()
         email = user_data.get("email")
-        name = user_data.get("name")
 
         if not email:
             return Response({"error": "Google account must have an email"}, status=status.HTTP_400_BAD_REQUEST)
 
-        user, created = User.objects.get_or_create(email=email, defaults={"is_active": True, "full_name": name})
+        user, created = await User.objects.aget_or_create(
+            email=email,
+            defaults={
+                "is_active": True,
+                "first_name": user_data.get("given_name", ""),
+                "last_name": user_data.get("family_name", ""),
+            },
+        )
 
-        refresh = RefreshToken.for_user(user)
+        refresh = await sync_to_async(CustomTokenObtainPairSerializer.get_token)(user)
         tokens = {
             "refresh": str(refresh),
             "access": str(refresh.access_token),